@@ -1,39 +1,367 @@
-from flask import Flask, jsonify, request
+# Açılış profili Flask dahil tüm import'ları ölçebilmek için her şeyden önce başlar
+from startup import StartupProfiler
+startup_profiler = StartupProfiler()
+
+from flask import Flask, Response, g, jsonify, request, stream_with_context
 from flask_cors import CORS
-import hashlib
+import click
+from werkzeug.middleware.proxy_fix import ProxyFix
+import atexit
+import base64
+from collections import namedtuple
+import csv
+import hmac
+import io
 import secrets
 import string
-from datetime import datetime, timedelta
+import tempfile
+import threading
+import time
+from datetime import datetime
 import json
 import os
 
+from auth import AdminAuth
+from json_provider import FastJSONProvider, dumps as json_dumps
+from bloom import BloomFilter
+from cache import JSONResponseCache, VerdictCache
+from importer import PARSERS, KeyImporter
+from metrics import Metrics
+from ratelimit import MemoryBucketBackend, RateLimiter, SQLiteBucketBackend, parse_rule
+from store import ExpirySweeper, KeyQuery, create_store, expiry_timestamp
+
+startup_profiler.phases['imports'] = startup_profiler.elapsed()
+
 app = Flask(__name__)
+# jsonify orjson kuruluysa onu, değilse standart kütüphaneyi kullanır
+app.json = FastJSONProvider(app)
 CORS(app)  # Enable CORS for all routes
+_wsgi_app = app.wsgi_app
+
+# Uygulama durumu (depo, önbellekler, arka plan thread'leri) create_app içinde kurulur.
+# Modül yüklenirken environment ile bir kez kurulur; create_app(config) ile yeniden kurulabilir.
+key_store = None
+change_feed = None
+replica = None
+usage_accountant = None
+expiry_sweeper = None
+bloom_filter = None
+_bloom_lock = threading.Lock()
+verdict_cache = None
+license_signer = None
+license_cache = None
+rate_limiter = None
+warmup_thread = None
+_config = None
+
+BLOOM_MIN_CAPACITY = 100_000
+# Akış bağlantısı bu süreden sonra kapatılır; replika kaldığı yerden yeniden bağlanır
+REPLICATION_STREAM_SECONDS = 300
+REPLICATION_BATCH_EVENTS = 1000
+
+def _flag(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() not in ('0', 'false', 'no')
+
+def create_app(config=None):
+    """Uygulama durumunu yapılandırmaya göre kurar ve Flask uygulamasını döndürür
+
+    config anahtarları environment değişkenleriyle aynıdır (ör. {"SERIAL_STORE_BACKEND": "sqlite"});
+    verilmeyenler environment'tan okunur. Modül tek uygulama tutar: config ile yeniden çağrılınca
+    önceki depo ve arka plan thread'leri kapatılır. config verilmeden çağrılırsa kurulmuş uygulama
+    olduğu gibi döner (ör. gunicorn 'app:create_app()').
+    İsteğe bağlı alt sistemler (replikasyon, gecikmeli sayaç, ed25519) yalnızca açıksa yüklenir.
+    """
+    global TRUSTED_PROXIES, ADMIN_PASSWORD, ADMIN_TOKEN_TTL, admin_auth, STORE_BACKEND, STORE_PATH
+    global REPLICATION_TOKEN, REPLICA_OF, REPLICATION_FEED_SIZE, REPLICATION_HEARTBEAT, JOURNAL_DIR
+    global STARTUP_WARMUP, key_store, change_feed, replica, USAGE_ACCOUNTING, usage_accountant
+    global EXPIRY_SWEEP_INTERVAL, expiry_sweeper, BLOOM_FILTER_MODE, BLOOM_FP_RATE, bloom_filter
+    global VERDICT_CACHE_SIZE, VERDICT_CACHE_TTL, verdict_cache, LICENSE_ALGORITHM, LICENSE_SIGNING_KEY
+    global license_signer, license_cache, COUNT_CACHE_TTL, RATE_LIMIT_ENABLED, RATE_LIMIT_BACKEND
+    global RATE_LIMIT_RULES, rate_limiter, warmup_thread, _config
+    if _config is not None:
+        if config is None:
+            return app
+        shutdown()
+    _config = config = dict(config or {})
+
+    def setting(name, default=None):
+        value = config.get(name)
+        return value if value is not None else os.environ.get(name, default)
+
+    # Reverse proxy arkasında gerçek istemci IP'si için güvenilen proxy sayısı (X-Forwarded-For)
+    TRUSTED_PROXIES = int(setting('TRUSTED_PROXIES', '0'))
+    app.wsgi_app = ProxyFix(_wsgi_app, x_for=TRUSTED_PROXIES) if TRUSTED_PROXIES else _wsgi_app
+
+    # Admin şifresi ADMIN_PASSWORD environment variable'ından okunur ve ısınmada bir kez hash'lenir
+    ADMIN_PASSWORD = setting('ADMIN_PASSWORD', 'admin123')  # Production'da mutlaka değiştirin!
+    ADMIN_TOKEN_TTL = int(setting('ADMIN_TOKEN_TTL', '900'))
+    admin_auth = AdminAuth(ADMIN_PASSWORD, setting('ADMIN_TOKEN_SECRET'), ADMIN_TOKEN_TTL)
+
+    # Serial key deposu: "memory" (varsayılan) veya kalıcı "sqlite"
+    STORE_BACKEND = setting('SERIAL_STORE_BACKEND', 'memory')
+    STORE_PATH = setting('SERIAL_DB_PATH', 'serial_keys.db')
+    # Replikasyon: REPLICATION_TOKEN verilen bellek deposu primary olarak değişiklik akışını yayınlar;
+    # REPLICA_OF (primary'nin adresi) verilen düğüm akışı izleyen salt okunur replikadır
+    REPLICATION_TOKEN = setting('REPLICATION_TOKEN')
+    REPLICA_OF = setting('REPLICA_OF')
+    REPLICATION_FEED_SIZE = int(setting('REPLICATION_FEED_SIZE', '100000'))
+    REPLICATION_HEARTBEAT = float(setting('REPLICATION_HEARTBEAT', '1'))
+    if REPLICA_OF and (STORE_BACKEND != 'memory' or not REPLICATION_TOKEN):
+        raise ValueError("REPLICA_OF için SERIAL_STORE_BACKEND=memory ve REPLICATION_TOKEN gerekli")
+    # Bellek deposu için günlük dizini: ayarlanırsa değişiklikler günlüğe yazılır ve açılışta geri yüklenir.
+    # Replika her açılışta primary'den eşitlendiği için günlük kullanmaz.
+    JOURNAL_DIR = setting('SERIAL_JOURNAL_DIR')
+    # Isınma: "background" günlükten yüklenen kayıtlarla hemen yanıt verir, ikincil indeksleri ve
+    # Bloom filtresini arka planda kurar; "sync" her şey hazır olmadan modül yüklemesini bitirmez
+    STARTUP_WARMUP = setting('STARTUP_WARMUP', 'background')
+    journal_options = {}
+    if JOURNAL_DIR and STORE_BACKEND == 'memory' and not REPLICA_OF:
+        journal_options = {
+            "journal_dir": JOURNAL_DIR,
+            "fsync": setting('JOURNAL_FSYNC', 'interval'),
+            "flush_interval": float(setting('JOURNAL_FLUSH_INTERVAL', '0.05')),
+            "snapshot_bytes": int(setting('JOURNAL_SNAPSHOT_MB', '64')) * 1024 * 1024,
+            "defer_indexes": STARTUP_WARMUP == 'background'
+        }
+    with startup_profiler.phase('store'):
+        key_store = create_store(STORE_BACKEND, STORE_PATH, **journal_options)
+    change_feed = None
+    if REPLICATION_TOKEN and not REPLICA_OF and STORE_BACKEND == 'memory':
+        from replication import ChangeFeed
+        change_feed = key_store.feed = ChangeFeed(REPLICATION_FEED_SIZE)
+    # Replika bloom filtresi ve doğrulama önbelleği hazır olduktan sonra başlatılır
+    replica = None
+
+    # Kullanım sayacı: "sync" her sorgulamada depoya yazar, "async" artışları bellekte ayırıp
+    # USAGE_FLUSH_INTERVAL saniyede veya USAGE_FLUSH_SIZE kullanımda bir toplu yazar (yalnızca sqlite)
+    USAGE_ACCOUNTING = setting('USAGE_ACCOUNTING', 'sync')
+    usage_accountant = None
+    if USAGE_ACCOUNTING == 'async' and STORE_BACKEND == 'sqlite':
+        from usage import UsageAccountant
+        usage_accountant = UsageAccountant(key_store, float(setting('USAGE_FLUSH_INTERVAL', '1')),
+                                           int(setting('USAGE_FLUSH_SIZE', '10000')))
+
+    # Süresi dolan key'leri deaktif eden arka plan süpürücüsü (saniye, 0 ile kapatılır)
+    EXPIRY_SWEEP_INTERVAL = int(setting('EXPIRY_SWEEP_INTERVAL', '60'))
+    expiry_sweeper = None
+    # Replikada süresi dolan key'leri primary deaktif eder; olaylar akıştan gelir
+    if EXPIRY_SWEEP_INTERVAL > 0 and not REPLICA_OF:
+        expiry_sweeper = ExpirySweeper(key_store, EXPIRY_SWEEP_INTERVAL)
+        expiry_sweeper.start()
+
+    # Olmayan key sorgularını depoya gitmeden eleyen Bloom filtresi.
+    # "auto" yalnızca bellek deposunda açar: SQLite'ı paylaşan diğer worker'ların eklediği
+    # key'ler bu süreçteki filtrede olmayacağı için çok süreçli kurulumda "off" kalmalıdır.
+    BLOOM_FILTER_MODE = setting('BLOOM_FILTER', 'auto')
+    BLOOM_FP_RATE = float(setting('BLOOM_FP_RATE', '0.01'))
+    if BLOOM_FILTER_MODE == 'auto':
+        BLOOM_FILTER_MODE = 'on' if STORE_BACKEND == 'memory' else 'off'
+    bloom_filter = None
+
+    # Kullanım hakkı harcamayan sorgulamaların (consume=false) sonuç önbelleği; 0 ile kapatılır.
+    # Çok süreçli SQLite kurulumunda diğer worker'ların değişiklikleri en geç TTL sonunda görünür.
+    VERDICT_CACHE_SIZE = int(setting('VERDICT_CACHE_SIZE', '10000'))
+    VERDICT_CACHE_TTL = float(setting('VERDICT_CACHE_TTL', '5'))
+    verdict_cache = None
+    if VERDICT_CACHE_SIZE > 0 and VERDICT_CACHE_TTL > 0:
+        verdict_cache = VerdictCache(VERDICT_CACHE_SIZE, VERDICT_CACHE_TTL)
+
+    # İmzalı lisans token'ları: LICENSE_SIGNING_KEY (base64url, `flask license-keygen` ile üretilir)
+    # verilirse add-serial klasik key'in yanında istemcide doğrulanabilen bir token da döndürür
+    LICENSE_ALGORITHM = setting('LICENSE_ALGORITHM', 'hs256')
+    LICENSE_SIGNING_KEY = setting('LICENSE_SIGNING_KEY')
+    license_signer = None
+    # Doğrulanmış token'lar: tekrarlanan aktivasyonlar imzayı (ed25519'da ~200µs) yeniden doğrulamaz
+    license_cache = None
+    if LICENSE_SIGNING_KEY:
+        from license_token import LicenseSigner, load_key
+        license_signer = LicenseSigner(LICENSE_ALGORITHM, load_key(LICENSE_SIGNING_KEY))
+        if VERDICT_CACHE_SIZE > 0:
+            license_cache = VerdictCache(VERDICT_CACHE_SIZE, float(setting('LICENSE_CACHE_TTL', '3600')))
 
-# Admin şifresi (gerçek uygulamada environment variable kullanın)
-ADMIN_PASSWORD = "admin123"  # Bu şifreyi değiştirin!
+    # Okuma ağırlıklı endpoint'lerin yanıt önbelleği
+    COUNT_CACHE_TTL = float(setting('COUNT_CACHE_TTL', '1'))
+    for cache in (admin_info_response, health_response):
+        cache.ttl = COUNT_CACHE_TTL
+        cache.invalidate()
 
-# Serial key veritabanı (gerçek uygulamada gerçek veritabanı kullanın)
-serial_keys_db = []
+    # İstek metrikleri (METRICS_ENABLED=0 ile kapatılır)
+    metrics.enabled = _flag(setting('METRICS_ENABLED', '1'))
+
+    # İstek sınırlama: IP ve rota sınıfı başına token bucket ("saniyedeki istek/kapasite")
+    # Varsayılan kapalı: proxy arkasında TRUSTED_PROXIES ayarlanmadan tüm istemciler tek IP'yi paylaşır
+    RATE_LIMIT_ENABLED = _flag(setting('RATE_LIMIT_ENABLED', '0'))
+    RATE_LIMIT_BACKEND = setting('RATE_LIMIT_BACKEND', 'memory')
+    RATE_LIMIT_RULES = {
+        "check": parse_rule(setting('RATE_LIMIT_CHECK', '50/100')),
+        "batch": parse_rule(setting('RATE_LIMIT_BATCH', '2/10')),
+        "admin": parse_rule(setting('RATE_LIMIT_ADMIN', '5/20'))
+    }
+    rate_limiter = None
+    if RATE_LIMIT_ENABLED:
+        if RATE_LIMIT_BACKEND == 'sqlite':
+            bucket_backend = SQLiteBucketBackend(setting('RATE_LIMIT_DB_PATH', STORE_PATH))
+        else:
+            bucket_backend = MemoryBucketBackend(int(setting('RATE_LIMIT_MAX_BUCKETS', '100000')))
+        rate_limiter = RateLimiter(RATE_LIMIT_RULES, bucket_backend)
+
+    # Bloom filtresi ve depo indeksleri hazır olmadan da istek kabul edilir: filtre yokken
+    # sorgular doğrudan depoya gider, indeks gerektiren işlemler indeksleri bekler
+    warmup_thread = threading.Thread(target=_warm_up, name='warmup', daemon=True)
+    if STARTUP_WARMUP == 'background' and not REPLICA_OF:
+        warmup_thread.start()
+    else:
+        warmup_thread.run()
+
+    if REPLICA_OF:
+        from replication import Replica
+        replica = Replica(key_store, REPLICA_OF, REPLICATION_TOKEN, on_reset=_replica_reset,
+                          on_added=remember_serial_keys, on_changed=forget_verdicts)
+        replica.start()
+        # İlk eşitleme bitmeden boş depodan yanıt verilmez; primary'ye ulaşılamazsa yine de açılır
+        with startup_profiler.phase('replica'):
+            ready = replica.wait_ready(float(setting('REPLICA_STARTUP_TIMEOUT', '30')))
+        if not ready:
+            print(f"⚠️  Primary'den ({REPLICA_OF}) ilk eşitleme tamamlanamadı; arka planda denenmeye devam ediliyor")
+    return app
+
+def _warm_up():
+    """Admin şifresini hash'ler, Bloom filtresini kurar ve depo indekslerini bekler; açılış profiline ısınma süresini yazar"""
+    # İlk admin girişi KDF'i rate limit hakkını tutarken beklemez
+    with startup_profiler.phase('admin_hash'):
+        admin_auth.prepare()
+    if BLOOM_FILTER_MODE == 'on':
+        with startup_profiler.phase('bloom_filter'):
+            rebuild_bloom_filter()
+    key_store.wait_ready()
+    startup_profiler.warmed()
+
+def wait_warm(timeout=None):
+    """Arka plan ısınması bitene kadar bekler; bittiyse True döner (fork öncesi ve testler için)"""
+    if warmup_thread is not None and warmup_thread.ident is not None:
+        warmup_thread.join(timeout)
+        return not warmup_thread.is_alive()
+    return True
+
+def shutdown():
+    """Arka plan thread'lerini durdurur, bekleyen kullanımları ve günlüğü diske yazar"""
+    wait_warm()
+    if expiry_sweeper is not None:
+        expiry_sweeper.stop()
+        expiry_sweeper.join()
+    if replica is not None:
+        replica.stop()
+    if change_feed is not None:
+        change_feed.close()
+    # Bekleyen artışlar depo kapanmadan yazılır
+    if usage_accountant is not None:
+        usage_accountant.close()
+    if key_store is not None:
+        key_store.close()
+    if rate_limiter is not None:
+        close = getattr(rate_limiter.backend, 'close', None)
+        if close is not None:
+            close()
+
+# Normal kapanışta günlükte bekleyen kayıtlar ve kullanım artışları diske yazılır
+atexit.register(shutdown)
+
+# Toplu serial key oluşturma limitleri
+BULK_MAX_COUNT = 1_000_000
+BULK_BATCH_SIZE = 10_000
+
+# Toplu sorgulamada tek istekteki en fazla serial key sayısı
+BATCH_CHECK_MAX_KEYS = 5000
+
+# Toplu güncellemede tek istekteki en fazla serial key sayısı (filtre ile sınır yoktur)
+BULK_UPDATE_MAX_KEYS = 100_000
+BULK_UPDATE_ACTIONS = ('deactivate', 'reactivate', 'set-expiry', 'set-max-uses', 'reset-uses')
+
+# Admin listesi sayfalama ve dışa aktarma ayarları
+LIST_DEFAULT_LIMIT = 100
+LIST_MAX_LIMIT = 1000
+EXPORT_CHUNK_ROWS = 1000
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+# İçe aktarma: hata raporu bu boyuta kadar bellekte, sonrası geçici dosyada tutulur
+IMPORT_REPORT_SPOOL_BYTES = 1024 * 1024
+IMPORT_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/json": "ndjson"
+}
+
+# Okuma ağırlıklı endpoint'lerin yanıt önbelleği
+STATIC_CACHE_CONTROL = 'public, max-age=300'
 
 # Serial key formatı: XXXX-XXXX-XXXX-XXXX (16 karakter)
+SERIAL_ALPHABET = string.ascii_uppercase + string.digits
+# 36'nın katı olan en büyük bayt sınırı; üstündeki baytlar reddedilir (modulo sapması olmaz)
+_BYTE_LIMIT = 256 - 256 % len(SERIAL_ALPHABET)
+_BYTE_TABLE = bytes(ord(SERIAL_ALPHABET[b % len(SERIAL_ALPHABET)]) for b in range(256))
+_REJECTED_BYTES = bytes(range(_BYTE_LIMIT, 256))
+
+def generate_serial_keys(count):
+    """Tek bir rastgele bayt tamponundan reddetme örneklemesiyle count adet serial key oluşturur"""
+    needed = count * 16
+    chars = b''
+    while len(chars) < needed:
+        missing = needed - len(chars)
+        # Reddedilen baytlar (~%1.6) için küçük bir pay bırak
+        buffer = secrets.token_bytes(missing + missing // 32 + 16)
+        chars += buffer.translate(_BYTE_TABLE, _REJECTED_BYTES)
+    text = chars[:needed].decode('ascii')
+    return [
+        f"{text[i:i + 4]}-{text[i + 4:i + 8]}-{text[i + 8:i + 12]}-{text[i + 12:i + 16]}"
+        for i in range(0, needed, 16)
+    ]
+
 def generate_serial_key():
     """Rastgele serial key oluşturur"""
-    characters = string.ascii_uppercase + string.digits
-    # 4 grup, her grupta 4 karakter
-    groups = []
-    for _ in range(4):
-        group = ''.join(secrets.choice(characters) for _ in range(4))
-        groups.append(group)
-    return '-'.join(groups)
-
-def hash_password(password):
-    """Şifreyi hash'ler"""
-    return hashlib.sha256(password.encode()).hexdigest()
-
-def verify_password(password, hashed):
-    """Şifre doğrulaması yapar"""
-    return hash_password(password) == hashed
+    return generate_serial_keys(1)[0]
+
+def admin_auth_failure(data, authorization):
+    """Bearer token veya şifre ile admin doğrulaması yapar; başarısızsa (yanıt, durum kodu) döndürür"""
+    if authorization.startswith('Bearer '):
+        if admin_auth.verify_token(authorization[7:].strip()):
+            return None
+        return {
+            "success": False,
+            "message": "Geçersiz veya süresi dolmuş token"
+        }, 401
+    
+    if not data.get('password'):
+        return {
+            "success": False,
+            "message": "Admin şifresi gerekli"
+        }, 400
+    
+    if not admin_auth.verify_password(data['password']):
+        return {
+            "success": False,
+            "message": "Geçersiz admin şifresi"
+        }, 401
+    
+    return None
+
+def admin_auth_error(data):
+    """Flask isteği için admin doğrulaması; başarısızsa hata yanıtı döndürür"""
+    failure = admin_auth_failure(data, request.headers.get('Authorization', ''))
+    if failure:
+        payload, status_code = failure
+        return jsonify(payload), status_code
+    return None
+
+def replica_write_failure():
+    """Replikada yazma isteklerini reddeder; replikaysa (yanıt, durum kodu) döndürür"""
+    if replica is None:
+        return None
+    return {
+        "success": False,
+        "message": f"Bu düğüm salt okunur bir replika; yazma işlemleri primary'ye ({REPLICA_OF}) yapılmalı"
+    }, 403
 
 def is_valid_serial_format(serial_key):
     """Serial key formatını kontrol eder"""
@@ -49,110 +377,419 @@ def is_valid_serial_format(serial_key):
             return False
     return True
 
+def validate_expiry_date(expiry_date):
+    """Son kullanma tarihini kontrol eder; hata varsa mesajını döndürür"""
+    try:
+        if expiry_timestamp(expiry_date) <= time.time():
+            return "Son kullanma tarihi geçmiş olamaz"
+    except (ValueError, AttributeError):
+        return "Geçersiz tarih formatı. ISO format kullanın: YYYY-MM-DDTHH:MM:SS"
+    return None
+
+def rebuild_bloom_filter():
+    """Bloom filtresini depodaki tüm key'lerden yeniden oluşturur"""
+    global bloom_filter
+    with _bloom_lock:
+        new_filter = BloomFilter(max(BLOOM_MIN_CAPACITY, 2 * key_store.count()), BLOOM_FP_RATE)
+        new_filter.add_many(record.serial_key for record in key_store)
+        bloom_filter = new_filter
+
+def remember_serial_keys(serial_keys):
+    """Yeni eklenen key'leri Bloom filtresine işler; kapasite aşılırsa filtreyi büyütür"""
+    if BLOOM_FILTER_MODE != 'on':
+        return
+    # Filtre arka planda kuruluyorsa kilit kurulumun bitmesini bekletir; kurulum henüz başlamadıysa
+    # key depoda olduğu için kurulumun taramasına girer
+    with _bloom_lock:
+        if bloom_filter is None:
+            return
+        bloom_filter.add_many(serial_keys)
+        grow = bloom_filter.count > bloom_filter.capacity
+    if grow:
+        rebuild_bloom_filter()
+
+def usage_store():
+    """Kullanım sayan depo: replikada primary'ye ileten katman, async modda yazılmamış artışları da bilen sayaç"""
+    if replica is not None:
+        return replica
+    return usage_accountant if usage_accountant is not None else key_store
+
+def lookup_serial_key(formatted_key):
+    """Key'i önce Bloom filtresinde, gerekirse depoda arar"""
+    bloom = bloom_filter
+    if bloom is not None and formatted_key not in bloom:
+        return None
+    started = time.perf_counter()
+    key_info = usage_store().get(formatted_key)
+    metrics.observe_store("get", time.perf_counter() - started)
+    if key_info is None and bloom is not None:
+        bloom.record_false_positive()
+    return key_info
+
+def forget_verdicts(serial_keys):
+    """Kullanımı, aktifliği veya limiti değişen key'lerin önbellekteki doğrulama sonuçlarını siler"""
+    if verdict_cache is not None and serial_keys:
+        verdict_cache.invalidate(serial_keys)
+
+def parse_consume(value):
+    """consume sorgu parametresini çözer (varsayılan true); geçersizse None döner"""
+    if value is None:
+        return True
+    value = value.lower()
+    if value in ('true', '1', 'yes'):
+        return True
+    if value in ('false', '0', 'no'):
+        return False
+    return None
+
+def lookup_serial_keys(formatted_keys):
+    """Key'leri Bloom filtresinden geçirip kalanları tek toplu sorguda arar"""
+    bloom = bloom_filter
+    if bloom is not None:
+        formatted_keys = [key for key in formatted_keys if key in bloom]
+    started = time.perf_counter()
+    found = usage_store().get_many(formatted_keys)
+    metrics.observe_store("get_many", time.perf_counter() - started)
+    if bloom is not None:
+        for _ in range(len(formatted_keys) - len(found)):
+            bloom.record_false_positive()
+    return found
+
+# Doğrulama sonuçlarının yanıt mesajı ve durum kodu
+VALIDATION_ERRORS = {
+    "invalid_format": ("Geçersiz serial key formatı", 400),
+    "not_found": ("Serial key bulunamadı", 404),
+    "expired": ("Serial key süresi dolmuş", 400),
+    "inactive": ("Serial key deaktif", 400),
+    "exhausted": ("Serial key kullanım limiti dolmuş", 400),
+    "invalid_token": ("Geçersiz lisans token'ı", 400)
+}
+
+# Önceden kodlanmış JSON gövdesi: sabit yanıtlar her istekte yeniden kodlanmaz
+EncodedJSON = namedtuple('EncodedJSON', ['body'])
+
+def encode_payload(payload):
+    """Sabit yanıtı bir kez JSON baytlarına kodlar"""
+    return EncodedJSON(json_dumps(payload) + b"\n")
+
+def json_response(payload, status_code):
+    """(yanıt, durum kodu) çiftini Flask yanıtına çevirir; EncodedJSON gövdesi olduğu gibi gönderilir"""
+    if isinstance(payload, EncodedJSON):
+        return app.response_class(payload.body, status=status_code, mimetype=app.json.mimetype)
+    return jsonify(payload), status_code
+
+# Sorgulamanın sabit hata yanıtları
+INVALID_FORMAT_RESPONSE = (encode_payload({
+    "success": False,
+    "message": VALIDATION_ERRORS["invalid_format"][0]
+}), 400)
+VALIDATION_RESPONSES = {
+    outcome: (encode_payload({"success": False, "message": message, "is_valid": False}), status_code)
+    for outcome, (message, status_code) in VALIDATION_ERRORS.items()
+}
+
+# Replikada kullanım hakkı primary'de düşülür; primary'ye ulaşılamazsa istemci yeniden denemeli
+PRIMARY_UNAVAILABLE_RESPONSE = (encode_payload({
+    "success": False,
+    "message": "Primary sunucuya ulaşılamıyor. Lütfen daha sonra tekrar deneyin"
+}), 503)
+
+def serial_key_error(record):
+    """Sorgulama kurallarını uygular; geçersizse VALIDATION_ERRORS sonuç kodunu döndürür"""
+    if not record:
+        return "not_found"
+    
+    # Son kullanma tarihi kontrolü (yazma anında hesaplanan epoch ile tamsayı karşılaştırması).
+    # Süpürücü dolan key'leri deaktif ettiği için bu kontrol aktiflikten önce yapılır.
+    expires_at = record.expires_at
+    if expires_at is not None and expires_at <= time.time():
+        return "expired"
+    
+    # Serial key aktif mi kontrol et
+    if not record.is_active:
+        return "inactive"
+    
+    # Kullanım limiti kontrolü
+    if record.current_uses >= record.max_uses:
+        return "exhausted"
+    
+    return None
+
+def serial_key_data(record):
+    """Sorgulama yanıtındaki serial key bilgilerini doğrudan KeyRecord'dan oluşturur"""
+    return {
+        "serial_key": record.serial_key,
+        "created_at": record.created_at,
+        "description": record.description,
+        "expiry_date": record.expiry_date,
+        "max_uses": record.max_uses,
+        "current_uses": record.current_uses,
+        "remaining_uses": record.max_uses - record.current_uses
+    }
+
+def serial_key_listing(record):
+    """Admin listesindeki serial key bilgilerini doğrudan KeyRecord'dan oluşturur"""
+    return {
+        "serial_key": record.serial_key,
+        "created_at": record.created_at,
+        "description": record.description,
+        "is_active": record.is_active,
+        "expiry_date": record.expiry_date,
+        "max_uses": record.max_uses,
+        "current_uses": record.current_uses,
+        "remaining_uses": record.max_uses - record.current_uses
+    }
+
+def encode_cursor(record):
+    """Son kaydın (created_at, serial_key) değerinden sayfalama imleci üretir"""
+    raw = json.dumps([record.created_at, record.serial_key]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def decode_cursor(cursor):
+    """Sayfalama imlecini çözer; geçersizse None döner"""
+    try:
+        created_at, serial_key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError, AttributeError):
+        return None
+    if not isinstance(created_at, str) or not isinstance(serial_key, str):
+        return None
+    try:
+        datetime.fromisoformat(created_at)
+    except ValueError:
+        return None
+    return created_at, serial_key
+
+# parse_list_query'nin okuduğu filtre alanları
+LIST_FILTER_FIELDS = ('active', 'expired', 'exhausted', 'description', 'description_contains',
+                      'created_from', 'created_to', 'expiring_within_days')
+
+def parse_list_query(data):
+    """Listeleme filtrelerini okur; (KeyQuery, hata mesajı) döndürür"""
+    filters = {}
+    for field in ('active', 'expired', 'exhausted'):
+        value = data.get(field)
+        if value is not None and not isinstance(value, bool):
+            return None, f"{field} true veya false olmalı"
+        filters[field] = value
+    for field in ('description', 'description_contains', 'created_from', 'created_to'):
+        value = data.get(field)
+        if value is not None and not isinstance(value, str):
+            return None, f"{field} metin olmalı"
+        filters[field] = value or None
+    expiring_within_days = data.get('expiring_within_days')
+    if expiring_within_days is not None:
+        if not isinstance(expiring_within_days, int) or isinstance(expiring_within_days, bool) \
+                or expiring_within_days < 1:
+            return None, "expiring_within_days pozitif bir tam sayı olmalı"
+        filters['now'] = int(time.time())
+        filters['expires_before'] = filters['now'] + expiring_within_days * 86400
+    return KeyQuery(**filters), None
+
 # Ana sayfa
-@app.route('/', methods=['GET'])
-def home():
-    """Ana sayfa"""
-    return jsonify({
+def _home_payload():
+    """Ana sayfa yanıtı (statik, bir kez kodlanır)"""
+    return {
         "success": True,
         "message": "Serial Key Management API",
         "version": "1.0.0",
         "endpoints": {
+            "admin_login": "POST /api/admin/login",
             "add_serial": "POST /api/add-serial",
+            "add_serials_bulk": "POST /api/add-serials/bulk",
             "check_serial": "GET /api/check-serial/<serial_key>",
+            "check_serials": "POST /api/check-serials",
             "list_serials": "GET /api/list-serials",
             "admin_info": "GET /api/admin-info"
         }
-    })
+    }
 
-# Admin şifre ile serial key ekleme
-@app.route('/api/add-serial', methods=['POST'])
-def add_serial_key():
-    """Şifre ile korumalı serial key ekleme"""
+home_response = JSONResponseCache(_home_payload, cache_control=STATIC_CACHE_CONTROL)
+
+@app.route('/', methods=['GET'])
+def home():
+    """Ana sayfa"""
+    return home_response.response()
+
+# Admin girişi: kısa ömürlü bearer token
+@app.route('/api/admin/login', methods=['POST'])
+def admin_login():
+    """Admin şifresi ile bearer token alma"""
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                "success": False,
-                "message": "JSON verisi gerekli"
-            }), 400
+        data = request.get_json(silent=True) or {}
         
-        # Şifre kontrolü
-        password = data.get('password')
-        if not password:
+        if not data.get('password'):
             return jsonify({
                 "success": False,
                 "message": "Admin şifresi gerekli"
             }), 400
         
-        if not verify_password(password, hash_password(ADMIN_PASSWORD)):
+        if not admin_auth.verify_password(data['password']):
             return jsonify({
                 "success": False,
                 "message": "Geçersiz admin şifresi"
             }), 401
         
-        # Serial key oluşturma veya kullanıcı tarafından verilme
-        if 'serial_key' in data and data['serial_key']:
-            # Kullanıcı kendi serial key'ini veriyor
-            serial_key = data['serial_key'].upper().strip()
-            if not is_valid_serial_format(serial_key):
-                return jsonify({
-                    "success": False,
-                    "message": "Geçersiz serial key formatı. Format: XXXX-XXXX-XXXX-XXXX"
-                }), 400
-        else:
-            # Otomatik serial key oluştur
-            serial_key = generate_serial_key()
+        token, expires_at = admin_auth.issue_token()
+        return jsonify({
+            "success": True,
+            "message": "Giriş başarılı",
+            "data": {
+                "token": token,
+                "token_type": "Bearer",
+                "expires_in": admin_auth.token_ttl,
+                "expires_at": expires_at
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": f"Sunucu hatası: {str(e)}"
+        }), 500
+
+# Admin şifre ile serial key ekleme
+def add_serial_result(data, authorization):
+    """Serial key ekler; (yanıt, durum kodu) döndürür"""
+    # Replika yazma kabul etmez; değişiklikler primary'den akışla gelir
+    replica_failure = replica_write_failure()
+    if replica_failure:
+        return replica_failure
+    
+    # Admin doğrulaması (Bearer token veya şifre)
+    auth_failure = admin_auth_failure(data, authorization)
+    if auth_failure:
+        return auth_failure
+    
+    # Serial key oluşturma veya kullanıcı tarafından verilme
+    if 'serial_key' in data and data['serial_key']:
+        # Kullanıcı kendi serial key'ini veriyor
+        serial_key = data['serial_key'].upper().strip()
+        if not is_valid_serial_format(serial_key):
+            return {
+                "success": False,
+                "message": "Geçersiz serial key formatı. Format: XXXX-XXXX-XXXX-XXXX"
+            }, 400
+    else:
+        # Otomatik serial key oluştur
+        serial_key = generate_serial_key()
+    
+    # Serial key'in zaten var olup olmadığını kontrol et
+    if serial_key in key_store:
+        return {
+            "success": False,
+            "message": "Bu serial key zaten mevcut"
+        }, 400
+    
+    # Serial key bilgileri
+    key_info = {
+        "serial_key": serial_key,
+        "created_at": datetime.now().isoformat(),
+        "is_active": True,
+        "description": data.get('description', ''),
+        "expiry_date": data.get('expiry_date'),  # Opsiyonel
+        "max_uses": data.get('max_uses', 1),  # Varsayılan 1 kullanım
+        "current_uses": 0
+    }
+    
+    # Expiry date varsa kontrol et
+    if key_info['expiry_date']:
+        expiry_error = validate_expiry_date(key_info['expiry_date'])
+        if expiry_error:
+            return {
+                "success": False,
+                "message": expiry_error
+            }, 400
+    
+    # Serial key'i depoya ekle
+    if not key_store.add(key_info):
+        return {
+            "success": False,
+            "message": "Bu serial key zaten mevcut"
+        }, 400
+    remember_serial_keys([serial_key])
+    
+    response_data = {
+        "serial_key": serial_key,
+        "created_at": key_info['created_at'],
+        "description": key_info['description'],
+        "expiry_date": key_info['expiry_date'],
+        "max_uses": key_info['max_uses']
+    }
+    if license_signer is not None:
+        response_data["license_token"] = license_signer.issue(serial_key, key_info['expires_at'], key_info['max_uses'])
+    
+    return {
+        "success": True,
+        "message": "Serial key başarıyla eklendi",
+        "data": response_data
+    }, 201
+
+@app.route('/api/add-serial', methods=['POST'])
+def add_serial_key():
+    """Şifre ile korumalı serial key ekleme"""
+    try:
+        data = request.get_json(silent=True) or {}
+        payload, status_code = add_serial_result(data, request.headers.get('Authorization', ''))
+        return jsonify(payload), status_code
         
-        # Serial key'in zaten var olup olmadığını kontrol et
-        existing_key = next((key for key in serial_keys_db if key['serial_key'] == serial_key), None)
-        if existing_key:
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": f"Sunucu hatası: {str(e)}"
+        }), 500
+
+# Admin şifre ile toplu serial key oluşturma
+@app.route('/api/add-serials/bulk', methods=['POST'])
+def add_serial_keys_bulk():
+    """Şifre ile korumalı toplu serial key oluşturma (NDJSON veya CSV akışı)"""
+    try:
+        # Replika yazma kabul etmez; değişiklikler primary'den akışla gelir
+        replica_failure = replica_write_failure()
+        if replica_failure:
+            return json_response(*replica_failure)
+        
+        data = request.get_json(silent=True) or {}
+        
+        # Admin doğrulaması (Bearer token veya şifre)
+        auth_error = admin_auth_error(data)
+        if auth_error:
+            return auth_error
+        
+        count = data.get('count')
+        if not isinstance(count, int) or isinstance(count, bool) or not 1 <= count <= BULK_MAX_COUNT:
             return jsonify({
                 "success": False,
-                "message": "Bu serial key zaten mevcut"
+                "message": f"count 1 ile {BULK_MAX_COUNT} arasında bir tam sayı olmalı"
             }), 400
         
-        # Serial key bilgileri
-        key_info = {
-            "serial_key": serial_key,
-            "created_at": datetime.now().isoformat(),
-            "is_active": True,
-            "description": data.get('description', ''),
-            "expiry_date": data.get('expiry_date'),  # Opsiyonel
-            "max_uses": data.get('max_uses', 1),  # Varsayılan 1 kullanım
-            "current_uses": 0
-        }
+        output_format = data.get('format', 'ndjson')
+        if output_format not in ('ndjson', 'csv'):
+            return jsonify({
+                "success": False,
+                "message": "Geçersiz format. Desteklenen formatlar: ndjson, csv"
+            }), 400
         
-        # Expiry date varsa kontrol et
-        if key_info['expiry_date']:
-            try:
-                expiry = datetime.fromisoformat(key_info['expiry_date'].replace('Z', '+00:00'))
-                if expiry <= datetime.now():
-                    return jsonify({
-                        "success": False,
-                        "message": "Son kullanma tarihi geçmiş olamaz"
-                    }), 400
-            except ValueError:
+        max_uses = data.get('max_uses', 1)
+        if not isinstance(max_uses, int) or isinstance(max_uses, bool) or max_uses < 1:
+            return jsonify({
+                "success": False,
+                "message": "max_uses pozitif bir tam sayı olmalı"
+            }), 400
+        
+        expiry_date = data.get('expiry_date')
+        if expiry_date:
+            expiry_error = validate_expiry_date(expiry_date)
+            if expiry_error:
                 return jsonify({
                     "success": False,
-                    "message": "Geçersiz tarih formatı. ISO format kullanın: YYYY-MM-DDTHH:MM:SS"
+                    "message": expiry_error
                 }), 400
         
-        # Serial key'i veritabanına ekle
-        serial_keys_db.append(key_info)
-        
-        return jsonify({
-            "success": True,
-            "message": "Serial key başarıyla eklendi",
-            "data": {
-                "serial_key": serial_key,
-                "created_at": key_info['created_at'],
-                "description": key_info['description'],
-                "expiry_date": key_info['expiry_date'],
-                "max_uses": key_info['max_uses']
-            }
-        }), 201
+        description = data.get('description', '')
+        rows = _generate_bulk_rows(count, description, expiry_date, max_uses, output_format)
+        mimetype = 'text/csv' if output_format == 'csv' else 'application/x-ndjson'
+        return Response(stream_with_context(rows), status=201, mimetype=mimetype,
+                        headers={"X-Serial-Count": str(count)})
         
     except Exception as e:
         return jsonify({
@@ -160,80 +797,264 @@ def add_serial_key():
             "message": f"Sunucu hatası: {str(e)}"
         }), 500
 
+def _generate_bulk_rows(count, description, expiry_date, max_uses, output_format):
+    """Anahtarları partiler halinde oluşturup ekler ve satır satır döndürür"""
+    if output_format == 'csv':
+        yield "serial_key,created_at\n"
+    # Tarih tüm parti için bir kez çözülür
+    expires_at = expiry_timestamp(expiry_date) if expiry_date else None
+    remaining = count
+    while remaining:
+        created_at = datetime.now().isoformat()
+        # dict.fromkeys parti içindeki tekrarları sırayı bozmadan ayıklar
+        batch = dict.fromkeys(generate_serial_keys(min(remaining, BULK_BATCH_SIZE)))
+        inserted = key_store.add_many({
+            "serial_key": serial_key,
+            "created_at": created_at,
+            "is_active": True,
+            "description": description,
+            "expiry_date": expiry_date,
+            "max_uses": max_uses,
+            "current_uses": 0,
+            "expires_at": expires_at
+        } for serial_key in batch)
+        remember_serial_keys(key_info['serial_key'] for key_info in inserted)
+        remaining -= len(inserted)
+        if output_format == 'csv':
+            yield ''.join(f"{key_info['serial_key']},{created_at}\n" for key_info in inserted)
+        else:
+            yield b''.join(
+                json_dumps({"serial_key": key_info['serial_key'], "created_at": created_at}) + b"\n"
+                for key_info in inserted
+            )
+
 # Serial key sorgulama
+def check_serial_result(serial_key, consume=True):
+    """Serial key'i doğrular, consume ise kullanım hakkını düşürür; (yanıt, durum kodu) döndürür"""
+    if not serial_key:
+        return {
+            "success": False,
+            "message": "Serial key gerekli"
+        }, 400
+    
+    formatted_key = serial_key.upper().strip()
+    # Kullanım harcamayan sorgulamalar önce önbellekten yanıtlanır
+    cache = verdict_cache if not consume else None
+    if cache is not None:
+        cached = cache.get(formatted_key)
+        if cached is not None:
+            outcome, response = cached
+            metrics.count_validation(outcome or "valid")
+            return response
+        generation = cache.generation
+    
+    # Serial key formatını kontrol et
+    if not is_valid_serial_format(formatted_key):
+        metrics.count_validation("invalid_format")
+        return INVALID_FORMAT_RESPONSE
+    
+    # Serial key'i depoda ara ve kuralları uygula
+    key_info = lookup_serial_key(formatted_key)
+    outcome = serial_key_error(key_info)
+    
+    # Başarılı sorgulama - kullanım sayısını atomik olarak artır
+    if outcome is None and consume:
+        try:
+            key_info = usage_store().redeem(formatted_key)
+        except ConnectionError:
+            # replication.ReplicationError: primary yanıt vermedi
+            return PRIMARY_UNAVAILABLE_RESPONSE
+        forget_verdicts((formatted_key,))
+        if not key_info:
+            outcome = "exhausted"
+    
+    metrics.count_validation(outcome or "valid")
+    if outcome:
+        response = VALIDATION_RESPONSES[outcome]
+    else:
+        response = {
+            "success": True,
+            "message": "Serial key geçerli",
+            "is_valid": True,
+            "data": serial_key_data(key_info)
+        }, 200
+    
+    # Yalnızca var olan key'lerin sonucu saklanır: rastgele key denemeleri önbelleği doldurmaz.
+    # Süresi dolacak key'in sonucu son kullanma anından sonra kullanılmaz.
+    if cache is not None and key_info is not None:
+        if not outcome:
+            response = (encode_payload(response[0]), 200)
+        max_age = key_info.expires_at - time.time() if key_info.expires_at is not None else None
+        cache.put(formatted_key, (outcome, response), generation, max_age)
+    return response
+
 @app.route('/api/check-serial/<serial_key>', methods=['GET'])
 def check_serial_key(serial_key):
-    """Serial key sorgulama"""
+    """Serial key sorgulama (?consume=false ile kullanım hakkı harcanmadan doğrulama)"""
     try:
-        if not serial_key:
+        consume = parse_consume(request.args.get('consume'))
+        if consume is None:
             return jsonify({
                 "success": False,
-                "message": "Serial key gerekli"
+                "message": "consume true veya false olmalı"
             }), 400
+        return json_response(*check_serial_result(serial_key, consume))
         
-        # Serial key formatını kontrol et
-        formatted_key = serial_key.upper().strip()
-        if not is_valid_serial_format(formatted_key):
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": f"Sunucu hatası: {str(e)}"
+        }), 500
+
+# İmzalı lisans token'ı sorgulama
+def verify_license(token):
+    """İmzayı depoya gitmeden doğrular; gerçek token'ın claims'ini, sahteyse None döndürür"""
+    cache = license_cache
+    if cache is not None:
+        claims = cache.get(token)
+        if claims is not None:
+            return claims
+        generation = cache.generation
+    claims, error = license_signer.verify(token)
+    if error == "invalid":
+        return None
+    # Token'daki exp sunucuda kullanılmaz: süresi geçmiş token da imzası geçerliyse önbelleğe girer
+    if cache is not None:
+        cache.put(token, claims, generation)
+    return claims
+
+def check_license_result(token, consume=True):
+    """Lisans token'ının imzasını doğrular, ardından key'i depodaki kaydıyla denetler"""
+    if license_signer is None:
+        return {
+            "success": False,
+            "message": "Lisans token'ları etkin değil"
+        }, 404
+    
+    # Sahte token'lar depoya ulaşmaz
+    claims = verify_license(token)
+    if claims is None:
+        metrics.count_validation("invalid_token")
+        return VALIDATION_RESPONSES["invalid_token"]
+    
+    # Token'daki exp ve max yalnızca istemcideki çevrimdışı doğrulama içindir: toplu güncellemeyle
+    # değişmiş olabilirler. Son kullanma, limit ve deaktiflik depodaki kayıttan denetlenir.
+    return check_serial_result(claims['sk'], consume)
+
+@app.route('/api/check-license/<token>', methods=['GET'])
+def check_license(token):
+    """İmzalı lisans token'ı sorgulama (?consume=false ile kullanım hakkı harcanmadan doğrulama)"""
+    try:
+        consume = parse_consume(request.args.get('consume'))
+        if consume is None:
             return jsonify({
                 "success": False,
-                "message": "Geçersiz serial key formatı"
+                "message": "consume true veya false olmalı"
             }), 400
+        return json_response(*check_license_result(token, consume))
         
-        # Serial key'i veritabanında ara
-        key_info = next((key for key in serial_keys_db if key['serial_key'] == formatted_key), None)
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": f"Sunucu hatası: {str(e)}"
+        }), 500
+
+@app.cli.command('license-keygen')
+@click.option('--algorithm', type=click.Choice(['hs256', 'ed25519']), default='hs256', show_default=True)
+def license_keygen_command(algorithm):
+    """Lisans token'ları için yeni imzalama anahtarı üretir"""
+    from license_token import generate_signing_key
+    signing_key, public_key = generate_signing_key(algorithm)
+    click.echo(f"LICENSE_ALGORITHM={algorithm}")
+    click.echo(f"LICENSE_SIGNING_KEY={signing_key}")
+    if public_key:
+        click.echo(f"# İstemcilere dağıtılacak açık anahtar: {public_key}")
+
+# Toplu serial key sorgulama
+@app.route('/api/check-serials', methods=['POST'])
+def check_serial_keys():
+    """Birden fazla serial key'i tek istekte sorgular (consume: false ile kullanım harcamadan)"""
+    try:
+        data = request.get_json(silent=True)
         
-        if not key_info:
+        if not data or not isinstance(data, dict):
             return jsonify({
                 "success": False,
-                "message": "Serial key bulunamadı",
-                "is_valid": False
-            }), 404
+                "message": "JSON verisi gerekli"
+            }), 400
         
-        # Serial key aktif mi kontrol et
-        if not key_info['is_active']:
+        serial_keys = data.get('serial_keys')
+        if not isinstance(serial_keys, list) or not serial_keys:
             return jsonify({
                 "success": False,
-                "message": "Serial key deaktif",
-                "is_valid": False
+                "message": "serial_keys listesi gerekli"
             }), 400
         
-        # Son kullanma tarihi kontrolü
-        if key_info['expiry_date']:
-            try:
-                expiry = datetime.fromisoformat(key_info['expiry_date'].replace('Z', '+00:00'))
-                if expiry <= datetime.now():
-                    return jsonify({
-                        "success": False,
-                        "message": "Serial key süresi dolmuş",
-                        "is_valid": False
-                    }), 400
-            except ValueError:
-                pass  # Tarih formatı hatası varsa görmezden gel
+        if len(serial_keys) > BATCH_CHECK_MAX_KEYS:
+            return jsonify({
+                "success": False,
+                "message": f"Tek istekte en fazla {BATCH_CHECK_MAX_KEYS} serial key sorgulanabilir"
+            }), 400
         
-        # Kullanım limiti kontrolü
-        if key_info['current_uses'] >= key_info['max_uses']:
+        consume = data.get('consume', True)
+        if not isinstance(consume, bool):
             return jsonify({
                 "success": False,
-                "message": "Serial key kullanım limiti dolmuş",
-                "is_valid": False
+                "message": "consume true veya false olmalı"
             }), 400
         
-        # Başarılı sorgulama - kullanım sayısını artır
-        key_info['current_uses'] += 1
+        formatted_keys = [key.upper().strip() if isinstance(key, str) else '' for key in serial_keys]
+        found = lookup_serial_keys({key for key in formatted_keys if is_valid_serial_format(key)})
+        
+        # Kurallardan geçen anahtarlar tek seferde redeem edilir
+        outcomes = []
+        to_redeem = []
+        for formatted_key in formatted_keys:
+            if not is_valid_serial_format(formatted_key):
+                outcomes.append("invalid_format")
+                continue
+            outcome = serial_key_error(found.get(formatted_key))
+            outcomes.append(outcome)
+            if outcome is None and consume:
+                to_redeem.append(formatted_key)
+        redeemed = None
+        if consume:
+            try:
+                redeemed = iter(usage_store().redeem_many(to_redeem))
+            except ConnectionError:
+                return json_response(*PRIMARY_UNAVAILABLE_RESPONSE)
+            forget_verdicts(to_redeem)
+        
+        results = []
+        valid_count = 0
+        for formatted_key, outcome in zip(formatted_keys, outcomes):
+            key_info = found.get(formatted_key)
+            if outcome is None and consume:
+                key_info = next(redeemed)
+                if not key_info:
+                    outcome = "exhausted"
+            metrics.count_validation(outcome or "valid")
+            if outcome:
+                results.append({
+                    "serial_key": formatted_key,
+                    "is_valid": False,
+                    "message": VALIDATION_ERRORS[outcome][0]
+                })
+                continue
+            valid_count += 1
+            results.append({
+                "serial_key": formatted_key,
+                "is_valid": True,
+                "message": "Serial key geçerli",
+                "data": serial_key_data(key_info)
+            })
         
         return jsonify({
             "success": True,
-            "message": "Serial key geçerli",
-            "is_valid": True,
-            "data": {
-                "serial_key": formatted_key,
-                "created_at": key_info['created_at'],
-                "description": key_info['description'],
-                "expiry_date": key_info['expiry_date'],
-                "max_uses": key_info['max_uses'],
-                "current_uses": key_info['current_uses'],
-                "remaining_uses": key_info['max_uses'] - key_info['current_uses']
-            }
+            "message": f"{len(results)} serial key sorgulandı",
+            "consume": consume,
+            "valid_count": valid_count,
+            "results": results
         }), 200
         
     except Exception as e:
@@ -243,60 +1064,229 @@ def check_serial_key(serial_key):
         }), 500
 
 # Admin şifre ile serial key listesi
+# Dışa aktarma sonucu: satır üreteci ve içerik türü
+ExportStream = namedtuple('ExportStream', ['rows', 'mimetype'])
+
+def list_serials_result(data, authorization):
+    """Sayfalı serial key listesi; (yanıt, durum kodu) döndürür, dışa aktarmada yanıt ExportStream olur"""
+    # Admin doğrulaması (Bearer token veya şifre)
+    auth_failure = admin_auth_failure(data, authorization)
+    if auth_failure:
+        return auth_failure
+    
+    query, error = parse_list_query(data)
+    if error:
+        return {
+            "success": False,
+            "message": error
+        }, 400
+    
+    order = data.get('order', 'asc')
+    if order not in ('asc', 'desc'):
+        return {
+            "success": False,
+            "message": "order asc veya desc olmalı"
+        }, 400
+    descending = order == 'desc'
+    
+    after = None
+    if data.get('cursor'):
+        after = decode_cursor(data['cursor'])
+        if after is None:
+            return {
+                "success": False,
+                "message": "Geçersiz cursor"
+            }, 400
+    
+    # Dışa aktarma: tüm eşleşen kayıtlar sabit bellekle akış halinde döner
+    output_format = data.get('format')
+    if output_format:
+        if output_format not in ('ndjson', 'csv'):
+            return {
+                "success": False,
+                "message": "Geçersiz format. Desteklenen formatlar: ndjson, csv"
+            }, 400
+        rows = _export_rows(key_store.scan(query, after, descending), output_format)
+        mimetype = 'text/csv' if output_format == 'csv' else 'application/x-ndjson'
+        return ExportStream(rows, mimetype), 200
+    
+    limit = data.get('limit', LIST_DEFAULT_LIMIT)
+    if not isinstance(limit, int) or isinstance(limit, bool) or not 1 <= limit <= LIST_MAX_LIMIT:
+        return {
+            "success": False,
+            "message": f"limit 1 ile {LIST_MAX_LIMIT} arasında bir tam sayı olmalı"
+        }, 400
+    
+    # Serial key'leri listele (şifreleri gizle)
+    keys = key_store.page(query, after, limit, descending)
+    safe_keys = [serial_key_listing(key) for key in keys]
+    next_cursor = None
+    if len(keys) == limit:
+        next_cursor = encode_cursor(keys[-1])
+    
+    return {
+        "success": True,
+        "message": f"{len(safe_keys)} serial key bulundu",
+        "data": safe_keys,
+        "count": len(safe_keys),
+        "total": key_store.count(),
+        "next_cursor": next_cursor
+    }, 200
+
 @app.route('/api/list-serials', methods=['POST'])
 def list_serial_keys():
-    """Admin şifre ile serial key listesi"""
+    """Admin şifre ile sayfalı ve filtrelenebilir serial key listesi (format ile akış halinde dışa aktarma)"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
+        payload, status_code = list_serials_result(data, request.headers.get('Authorization', ''))
+        if isinstance(payload, ExportStream):
+            return Response(stream_with_context(payload.rows), mimetype=payload.mimetype)
+        return jsonify(payload), status_code
         
-        if not data or not data.get('password'):
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": f"Sunucu hatası: {str(e)}"
+        }), 500
+
+LIST_EXPORT_FIELDS = ["serial_key", "created_at", "description", "is_active",
+                      "expiry_date", "max_uses", "current_uses", "remaining_uses"]
+
+def _export_rows(keys, output_format):
+    """Kayıtları tek tek NDJSON veya CSV satırına çevirir"""
+    if output_format == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(LIST_EXPORT_FIELDS)
+        for key in keys:
+            listing = serial_key_listing(key)
+            writer.writerow([listing[field] for field in LIST_EXPORT_FIELDS])
+            if buffer.tell() >= EXPORT_CHUNK_BYTES:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    else:
+        chunk = []
+        for key in keys:
+            chunk.append(json_dumps(serial_key_listing(key)))
+            if len(chunk) >= EXPORT_CHUNK_ROWS:
+                yield b'\n'.join(chunk) + b'\n'
+                chunk = []
+        if chunk:
+            yield b'\n'.join(chunk) + b'\n'
+
+# CSV/NDJSON dosyasından toplu içe aktarma
+def import_serials(lines, input_format, report):
+    """Satırları parti halinde içe aktarır, hatalı satırları report'a NDJSON yazar; özeti döndürür"""
+    importer = KeyImporter(key_store, is_valid_serial_format, on_inserted=remember_serial_keys)
+    for errors in importer.run(PARSERS[input_format](lines)):
+        for error in errors:
+            report.write(json_dumps(error) + b"\n")
+    return importer.summary()
+
+def _report_chunks(report):
+    """Geçici rapor dosyasını parça parça okur ve kapatır"""
+    with report:
+        chunk = report.read(EXPORT_CHUNK_BYTES)
+        while chunk:
+            yield chunk
+            chunk = report.read(EXPORT_CHUNK_BYTES)
+
+@app.route('/api/import-serials', methods=['POST'])
+def import_serial_keys():
+    """Bearer token ile CSV veya NDJSON gövdesinden toplu serial key içe aktarma"""
+    try:
+        # Replika yazma kabul etmez; değişiklikler primary'den akışla gelir
+        replica_failure = replica_write_failure()
+        if replica_failure:
+            return json_response(*replica_failure)
+
+        # Gövde dosyanın kendisi olduğundan yalnızca Bearer token kabul edilir
+        authorization = request.headers.get('Authorization', '')
+        if not authorization.startswith('Bearer '):
             return jsonify({
                 "success": False,
-                "message": "Admin şifresi gerekli"
-            }), 400
-        
-        if not verify_password(data['password'], hash_password(ADMIN_PASSWORD)):
+                "message": "Authorization: Bearer <token> başlığı gerekli"
+            }), 401
+        auth_error = admin_auth_error({})
+        if auth_error:
+            return auth_error
+
+        input_format = request.args.get('format') or IMPORT_FORMATS.get(request.mimetype)
+        if input_format not in PARSERS:
             return jsonify({
                 "success": False,
-                "message": "Geçersiz admin şifresi"
-            }), 401
-        
-        # Serial key'leri listele (şifreleri gizle)
-        safe_keys = []
-        for key in serial_keys_db:
-            safe_key = {
-                "serial_key": key['serial_key'],
-                "created_at": key['created_at'],
-                "description": key['description'],
-                "is_active": key['is_active'],
-                "expiry_date": key['expiry_date'],
-                "max_uses": key['max_uses'],
-                "current_uses": key['current_uses'],
-                "remaining_uses": key['max_uses'] - key['current_uses']
-            }
-            safe_keys.append(safe_key)
-        
-        return jsonify({
+                "message": "Geçersiz format. Desteklenen formatlar: ndjson, csv"
+            }), 400
+
+        # Gövde akış halinde okunur; rapor, gövde tamamen okunduktan sonra gönderilir
+        lines = io.TextIOWrapper(request.stream, encoding='utf-8-sig', errors='replace', newline='')
+        report = tempfile.SpooledTemporaryFile(IMPORT_REPORT_SPOOL_BYTES)
+        summary = import_serials(lines, input_format, report)
+        report.write(json_dumps({
             "success": True,
-            "message": f"{len(safe_keys)} serial key bulundu",
-            "data": safe_keys,
-            "count": len(safe_keys)
-        }), 200
-        
+            "message": f"{summary['imported']} serial key içe aktarıldı",
+            "summary": summary
+        }) + b"\n")
+        report.seek(0)
+        return Response(_report_chunks(report), mimetype='application/x-ndjson',
+                        headers={"X-Imported-Count": str(summary['imported'])})
+
     except Exception as e:
         return jsonify({
             "success": False,
             "message": f"Sunucu hatası: {str(e)}"
         }), 500
 
+@app.cli.command('import-serials')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'input_format', type=click.Choice(sorted(PARSERS)),
+              help="Dosya formatı (varsayılan: uzantıdan, .csv dışındakiler ndjson)")
+@click.option('--errors', 'errors_path', type=click.Path(dir_okay=False),
+              help="Hatalı satırların yazılacağı NDJSON dosyası (varsayılan: standart çıktı)")
+def import_serials_command(path, input_format, errors_path):
+    """CSV veya NDJSON dosyasından serial key içe aktarır.
+
+    Bellek deposu günlükle kullanılıyorsa sunucu çalışırken aynı günlük dizinine
+    içe aktarmayın; bunun yerine /api/import-serials endpoint'ini kullanın.
+    """
+    if STORE_BACKEND == 'memory' and not JOURNAL_DIR:
+        raise click.ClickException("Bellek deposu kalıcı değil; SERIAL_STORE_BACKEND=sqlite "
+                                   "veya SERIAL_JOURNAL_DIR ayarlayın")
+    input_format = input_format or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+    started = time.perf_counter()
+    with open(path, encoding='utf-8-sig', errors='replace', newline='') as lines, \
+            click.open_file(errors_path or '-', 'wb') as report:
+        summary = import_serials(lines, input_format, report)
+    click.echo(f"{summary['rows']} satır, {summary['imported']} içe aktarıldı, "
+               f"{summary['duplicates']} tekrar, {summary['existing']} zaten mevcut, "
+               f"{summary['invalid']} geçersiz ({time.perf_counter() - started:.1f}s)", err=True)
+
+@app.cli.command('export-serials')
+@click.argument('path', type=click.Path(dir_okay=False))
+@click.option('--format', 'output_format', type=click.Choice(sorted(PARSERS)),
+              help="Dosya formatı (varsayılan: uzantıdan, .csv dışındakiler ndjson)")
+def export_serials_command(path, output_format):
+    """Tüm serial key'leri içe aktarmayla uyumlu CSV veya NDJSON dosyasına yazar"""
+    output_format = output_format or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+    with click.open_file(path, 'wb') as output:
+        for chunk in _export_rows(key_store.scan(KeyQuery()), output_format):
+            output.write(chunk.encode() if isinstance(chunk, str) else chunk)
+
 # Admin bilgileri
-@app.route('/api/admin-info', methods=['GET'])
-def admin_info():
-    """Admin bilgileri ve API kullanımı"""
-    return jsonify({
+def _admin_info_payload():
+    """Admin bilgileri yanıtı (depo sürümü değişince yeniden kodlanır)"""
+    return {
         "success": True,
         "message": "Serial Key Management API",
         "admin_instructions": {
+            "authentication": "Admin endpoint'leri 'Authorization: Bearer <token>' başlığı veya body'de password ile çağrılır",
+            "admin_login": {
+                "method": "POST",
+                "endpoint": "/api/admin/login",
+                "body": {"password": "admin123"}
+            },
             "add_serial": {
                 "method": "POST",
                 "endpoint": "/api/add-serial",
@@ -309,58 +1299,371 @@ def admin_info():
                     "max_uses": 5
                 }
             },
+            "add_serials_bulk": {
+                "method": "POST",
+                "endpoint": "/api/add-serials/bulk",
+                "required_fields": ["password", "count"],
+                "optional_fields": ["description", "expiry_date", "max_uses", "format"],
+                "example": {
+                    "password": "admin123",
+                    "count": 1000,
+                    "description": "2024 ürün partisi",
+                    "format": "ndjson"
+                }
+            },
             "check_serial": {
                 "method": "GET",
                 "endpoint": "/api/check-serial/<serial_key>",
                 "example": "/api/check-serial/ABCD-1234-EFGH-5678"
             },
+            "check_license": {
+                "method": "GET",
+                "endpoint": "/api/check-license/<license_token>",
+                "description": "LICENSE_SIGNING_KEY ayarlıysa add-serial yanıtındaki license_token ile sorgulama",
+                "optional_query": ["consume"]
+            },
+            "check_serials": {
+                "method": "POST",
+                "endpoint": "/api/check-serials",
+                "required_fields": ["serial_keys"],
+                "optional_fields": ["consume"],
+                "example": {
+                    "serial_keys": ["ABCD-1234-EFGH-5678", "WXYZ-9876-IJKL-5432"],
+                    "consume": False
+                }
+            },
             "list_serials": {
                 "method": "POST",
                 "endpoint": "/api/list-serials",
-                "body": {"password": "admin123"}
+                "body": {"password": "admin123"},
+                "optional_fields": ["limit", "cursor", "order", "active", "expired", "exhausted",
+                                    "description", "description_contains", "created_from", "created_to",
+                                    "expiring_within_days", "format"]
+            },
+            "import_serials": {
+                "method": "POST",
+                "endpoint": "/api/import-serials?format=csv",
+                "authentication": "Authorization: Bearer <token>",
+                "body": "CSV veya NDJSON dosyası (list-serials dışa aktarma alanları; yalnızca serial_key zorunlu)",
+                "response": "Hatalı satırlar ve son satırda özet (NDJSON)"
+            },
+            "bulk_update": {
+                "method": "POST",
+                "endpoint": "/api/serials/bulk-update",
+                "required_fields": ["password", "action", "serial_keys veya filter"],
+                "actions": list(BULK_UPDATE_ACTIONS),
+                "optional_fields": ["value", "stream"],
+                "filter_fields": ["description", "description_contains", "created_from", "created_to",
+                                  "active", "expired", "exhausted", "expiring_within_days"],
+                "example": {
+                    "password": "admin123",
+                    "action": "deactivate",
+                    "filter": {"description": "2024 ürün partisi"}
+                }
             }
         },
         "serial_format": "XXXX-XXXX-XXXX-XXXX (16 karakter, büyük harf ve rakam)",
-        "current_serial_count": len(serial_keys_db)
-    })
+        "license_tokens": {
+            "algorithm": license_signer.algorithm,
+            "public_key": license_signer.public_key()
+        } if license_signer is not None else None,
+        "current_serial_count": key_store.count()
+    }
+
+admin_info_response = JSONResponseCache(_admin_info_payload, version=lambda: key_store.version)
+
+@app.route('/api/admin-info', methods=['GET'])
+def admin_info():
+    """Admin bilgileri ve API kullanımı"""
+    return admin_info_response.response()
+
+# Toplu güncelleme (admin)
+def bulk_update_changes(action, value):
+    """İşlemi depoda güncellenecek alanlara çevirir; (alanlar, hata mesajı) döndürür"""
+    if action == 'deactivate':
+        return {"is_active": False}, None
+    if action == 'reactivate':
+        return {"is_active": True}, None
+    if action == 'reset-uses':
+        return {"current_uses": 0}, None
+    if action == 'set-expiry':
+        # null son kullanma tarihini kaldırır
+        if value is not None:
+            error = validate_expiry_date(value) if isinstance(value, str) else "value ISO tarih veya null olmalı"
+            if error:
+                return None, error
+        return {"expiry_date": value}, None
+    if action == 'set-max-uses':
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            return None, "value pozitif bir tam sayı olmalı"
+        return {"max_uses": value}, None
+    return None, f"Geçersiz action. Desteklenenler: {', '.join(BULK_UPDATE_ACTIONS)}"
+
+def parse_bulk_selector(data):
+    """Anahtar listesini veya filtreyi okur; (anahtarlar, KeyQuery, hata mesajı) döndürür"""
+    serial_keys = data.get('serial_keys')
+    filters = data.get('filter')
+    if (serial_keys is None) == (filters is None):
+        return None, None, "serial_keys veya filter alanlarından biri gerekli"
+    if serial_keys is not None:
+        if not isinstance(serial_keys, list) or not serial_keys \
+                or not all(isinstance(key, str) for key in serial_keys):
+            return None, None, "serial_keys metin listesi olmalı"
+        if len(serial_keys) > BULK_UPDATE_MAX_KEYS:
+            return None, None, f"Tek istekte en fazla {BULK_UPDATE_MAX_KEYS} serial key güncellenebilir"
+        return [key.upper().strip() for key in serial_keys], None, None
+    if not isinstance(filters, dict):
+        return None, None, "filter bir nesne olmalı"
+    # Yanlış yazılmış bir alan sessizce atlanırsa filtre boşalır ve tüm depo güncellenir
+    unknown = sorted(set(filters) - set(LIST_FILTER_FIELDS))
+    if unknown:
+        return None, None, (f"Bilinmeyen filtre alanı: {', '.join(unknown)}. "
+                            f"Desteklenen alanlar: {', '.join(LIST_FILTER_FIELDS)}")
+    query, error = parse_list_query(filters)
+    if error:
+        return None, None, error
+    # Tüm depoyu yanlışlıkla değiştirmemek için boş filtre kabul edilmez
+    if query.is_empty():
+        return None, None, "filter en az bir kriter içermeli"
+    return None, query, None
+
+def _bulk_update_rows(updated, summary):
+    """Değişen key'leri ve son satırda özeti NDJSON olarak üretir"""
+    for start in range(0, len(updated), EXPORT_CHUNK_ROWS):
+        yield b''.join(json_dumps({"serial_key": serial_key}) + b'\n'
+                       for serial_key in updated[start:start + EXPORT_CHUNK_ROWS])
+    yield json_dumps(summary) + b'\n'
+
+def bulk_update_result(data, authorization):
+    """Seçilen key'lere tek küme işlemi uygular; (yanıt, durum kodu) döndürür, stream ise yanıt ExportStream olur"""
+    # Replika yazma kabul etmez; değişiklikler primary'den akışla gelir
+    replica_failure = replica_write_failure()
+    if replica_failure:
+        return replica_failure
+    
+    # Admin doğrulaması (Bearer token veya şifre)
+    auth_failure = admin_auth_failure(data, authorization)
+    if auth_failure:
+        return auth_failure
+    
+    action = data.get('action')
+    changes, error = bulk_update_changes(action, data.get('value'))
+    if not error:
+        serial_keys, query, error = parse_bulk_selector(data)
+    if error:
+        return {
+            "success": False,
+            "message": error
+        }, 400
+    
+    stream = data.get('stream', False)
+    if not isinstance(stream, bool):
+        return {
+            "success": False,
+            "message": "stream true veya false olmalı"
+        }, 400
+    
+    # Sıfırlamadan önce bellekte bekleyen kullanım artışları yazılır, yoksa sıfırın üstüne eklenirdi
+    if usage_accountant is not None and action == 'reset-uses':
+        usage_accountant.flush()
+    matched, updated = key_store.update_many(changes, serial_keys, query)
+    forget_verdicts(updated)
+    if usage_accountant is not None:
+        for serial_key in updated:
+            usage_accountant.refresh(serial_key)
+    
+    summary = {
+        "success": True,
+        "message": f"{len(updated)} serial key güncellendi",
+        "action": action,
+        "matched": matched,
+        "updated": len(updated)
+    }
+    if action == 'set-expiry':
+        # Süpürücünün deaktif ettiği key elle deaktif edilenden ayırt edilemez; süre uzatılınca aktif olmaz
+        inactive = sum(not record.is_active for record in key_store.get_many(updated).values())
+        summary["inactive"] = inactive
+        if inactive:
+            summary["message"] += f"; {inactive} key deaktif kaldı, kullanılabilmesi için reactivate gerekli"
+    if serial_keys is not None:
+        summary["not_found"] = len(set(serial_keys)) - matched
+    if stream:
+        return ExportStream(_bulk_update_rows(updated, summary), 'application/x-ndjson'), 200
+    return summary, 200
+
+@app.route('/api/serials/bulk-update', methods=['POST'])
+def bulk_update_serial_keys():
+    """Key listesi veya filtreyle toplu deaktif etme, yeniden aktif etme, süre/limit güncelleme ve kullanım sıfırlama"""
+    try:
+        data = request.get_json(silent=True) or {}
+        payload, status_code = bulk_update_result(data, request.headers.get('Authorization', ''))
+        if isinstance(payload, ExportStream):
+            return Response(payload.rows, mimetype=payload.mimetype)
+        return jsonify(payload), status_code
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": f"Sunucu hatası: {str(e)}"
+        }), 500
 
 # Serial key deaktif etme (admin)
+def deactivate_serial_result(serial_key, data, authorization):
+    """Serial key'i deaktif eder; (yanıt, durum kodu) döndürür"""
+    # Replika yazma kabul etmez; değişiklikler primary'den akışla gelir
+    replica_failure = replica_write_failure()
+    if replica_failure:
+        return replica_failure
+    
+    # Admin doğrulaması (Bearer token veya şifre)
+    auth_failure = admin_auth_failure(data, authorization)
+    if auth_failure:
+        return auth_failure
+    
+    formatted_key = serial_key.upper().strip()
+    key_info = key_store.deactivate(formatted_key)
+    forget_verdicts((formatted_key,))
+    if usage_accountant is not None:
+        usage_accountant.refresh(formatted_key)
+    
+    if not key_info:
+        return {
+            "success": False,
+            "message": "Serial key bulunamadı"
+        }, 404
+    
+    return {
+        "success": True,
+        "message": "Serial key deaktif edildi",
+        "data": {
+            "serial_key": formatted_key,
+            "is_active": False
+        }
+    }, 200
+
 @app.route('/api/deactivate-serial/<serial_key>', methods=['POST'])
 def deactivate_serial_key(serial_key):
     """Admin şifre ile serial key deaktif etme"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
+        payload, status_code = deactivate_serial_result(serial_key, data, request.headers.get('Authorization', ''))
+        return jsonify(payload), status_code
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": f"Sunucu hatası: {str(e)}"
+        }), 500
+
+# Replikasyon (primary)
+def replication_auth_failure(authorization):
+    """Replikasyon endpoint'lerinde paylaşılan token'ı denetler; başarısızsa (yanıt, durum kodu) döndürür"""
+    if change_feed is None:
+        return {
+            "success": False,
+            "message": "Replikasyon etkin değil"
+        }, 404
+    token = authorization[7:].strip() if authorization.startswith('Bearer ') else ''
+    if not hmac.compare_digest(token.encode(), REPLICATION_TOKEN.encode()):
+        return {
+            "success": False,
+            "message": "Geçersiz replikasyon token'ı"
+        }, 401
+    return None
+
+def _snapshot_rows(feed_id, seq, records):
+    """Anlık görüntü başlığını ve kayıtları NDJSON olarak üretir"""
+    yield json_dumps({"feed_id": feed_id, "seq": seq, "count": len(records)}) + b'\n'
+    for start in range(0, len(records), EXPORT_CHUNK_ROWS):
+        yield b''.join(json_dumps(record.to_dict()) + b'\n' for record in records[start:start + EXPORT_CHUNK_ROWS])
+
+@app.route('/api/replication/snapshot', methods=['GET'])
+def replication_snapshot():
+    """Replikanın ilk eşitlemesi: tüm kayıtlar ve o anın akış sıra numarası (NDJSON)"""
+    try:
+        auth_failure = replication_auth_failure(request.headers.get('Authorization', ''))
+        if auth_failure:
+            return jsonify(auth_failure[0]), auth_failure[1]
+        seq, records = key_store.feed_snapshot()
+        return Response(_snapshot_rows(change_feed.feed_id, seq, records), mimetype='application/x-ndjson')
         
-        if not data or not data.get('password'):
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": f"Sunucu hatası: {str(e)}"
+        }), 500
+
+def _feed_stream(feed, after):
+    """after'dan sonraki olayları geldikçe, boşta kalınca heartbeat satırlarını üretir"""
+    from replication import encode_event
+    deadline = time.monotonic() + REPLICATION_STREAM_SECONDS
+    while not feed.closed and time.monotonic() < deadline:
+        events = feed.read(after, REPLICATION_BATCH_EVENTS, REPLICATION_HEARTBEAT)
+        if events is None:
+            # Okuyucu halkanın gerisinde kaldı: yeniden bağlanınca 410 alıp anlık görüntüden eşitlenir
+            return
+        if events:
+            after = events[-1][0]
+            yield b''.join(json_dumps(encode_event(event)) + b'\n' for event in events)
+        else:
+            yield json_dumps({"heartbeat": True, "seq": feed.seq, "ts": time.time()}) + b'\n'
+
+@app.route('/api/replication/feed', methods=['GET'])
+def replication_feed():
+    """Sıra numaralı değişiklik akışı (?feed_id=...&after=<seq>, NDJSON, uzun süreli bağlantı)"""
+    try:
+        auth_failure = replication_auth_failure(request.headers.get('Authorization', ''))
+        if auth_failure:
+            return jsonify(auth_failure[0]), auth_failure[1]
+        after = request.args.get('after', type=int)
+        if after is None:
             return jsonify({
                 "success": False,
-                "message": "Admin şifresi gerekli"
+                "message": "after sıra numarası gerekli"
             }), 400
-        
-        if not verify_password(data['password'], hash_password(ADMIN_PASSWORD)):
+        feed = change_feed
+        if request.args.get('feed_id') != feed.feed_id or not feed.available(after):
             return jsonify({
                 "success": False,
-                "message": "Geçersiz admin şifresi"
-            }), 401
-        
-        formatted_key = serial_key.upper().strip()
-        key_info = next((key for key in serial_keys_db if key['serial_key'] == formatted_key), None)
+                "message": "Akış konumu artık tutulmuyor; anlık görüntüden yeniden eşitleyin",
+                "feed_id": feed.feed_id
+            }), 410
+        return Response(_feed_stream(feed, after), mimetype='application/x-ndjson')
         
-        if not key_info:
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": f"Sunucu hatası: {str(e)}"
+        }), 500
+
+@app.route('/api/replication/redeem', methods=['POST'])
+def replication_redeem():
+    """Replikalardan iletilen kullanımlar: kurallar primary'nin güncel kaydıyla yeniden denetlenir"""
+    try:
+        auth_failure = replication_auth_failure(request.headers.get('Authorization', ''))
+        if auth_failure:
+            return jsonify(auth_failure[0]), auth_failure[1]
+        data = request.get_json(silent=True) or {}
+        serial_keys = data.get('serial_keys')
+        if not isinstance(serial_keys, list) or not all(isinstance(key, str) for key in serial_keys) \
+                or len(serial_keys) > BATCH_CHECK_MAX_KEYS:
             return jsonify({
                 "success": False,
-                "message": "Serial key bulunamadı"
-            }), 404
-        
-        key_info['is_active'] = False
-        
+                "message": f"serial_keys en fazla {BATCH_CHECK_MAX_KEYS} elemanlı metin listesi olmalı"
+            }), 400
+        found = lookup_serial_keys(set(serial_keys))
+        eligible = [serial_key_error(found.get(key)) is None for key in serial_keys]
+        to_redeem = [key for key, ok in zip(serial_keys, eligible) if ok]
+        # Sonuçlar sırayla eşlenir: aynı key listede birden fazla geçebilir
+        redeemed = iter(usage_store().redeem_many(to_redeem))
+        forget_verdicts(to_redeem)
+        results = []
+        for ok in eligible:
+            record = next(redeemed) if ok else None
+            results.append(record.to_dict() if record else None)
         return jsonify({
             "success": True,
-            "message": "Serial key deaktif edildi",
-            "data": {
-                "serial_key": formatted_key,
-                "is_active": False
-            }
+            "results": results
         }), 200
         
     except Exception as e:
@@ -370,14 +1673,145 @@ def deactivate_serial_key(serial_key):
         }), 500
 
 # Health check
+def _health_payload():
+    """Sağlık kontrolü yanıtı (kısa TTL ile önbelleklenir)"""
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "serial_keys_count": key_store.count(),
+        "bloom_filter": bloom_filter.stats() if bloom_filter is not None else None,
+        "verdict_cache": verdict_cache.stats() if verdict_cache is not None else None,
+        "usage_accounting": usage_accountant.stats() if usage_accountant is not None else None,
+        "replication": replication_stats(),
+        "startup": startup_profiler.stats()
+    }
+
+def replication_stats():
+    if replica is not None:
+        return dict(replica.stats(), role="replica")
+    if change_feed is not None:
+        return dict(change_feed.stats(), role="primary")
+    return None
+
+health_response = JSONResponseCache(_health_payload, version=lambda: key_store.version)
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Sağlık kontrolü"""
-    return jsonify({
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "serial_keys_count": len(serial_keys_db)
+    return health_response.response()
+
+def _replica_reset():
+    """Replika anlık görüntüden yeniden eşitlenince süreç içi türetilmiş durumu yeniler"""
+    if BLOOM_FILTER_MODE == 'on':
+        rebuild_bloom_filter()
+    if verdict_cache is not None:
+        verdict_cache.clear()
+
+# İstek metrikleri (METRICS_ENABLED=0 ile kapatılır)
+metrics = Metrics()
+metrics.register('keys', "Depodaki serial key sayısı", lambda: key_store.count())
+metrics.register('active_keys', "Aktif serial key sayısı", lambda: key_store.count_active())
+metrics.register('bloom_false_positive_rate', "Bloom filtresinin gözlenen yanlış pozitif oranı",
+                 lambda: bloom_filter.stats()['observed_fp_rate'] if bloom_filter is not None else None)
+metrics.register('bloom_estimated_false_positive_rate', "Bloom filtresinin tahmini yanlış pozitif oranı",
+                 lambda: bloom_filter.estimated_fp_rate() if bloom_filter is not None else None)
+metrics.register('verdict_cache_entries', "Doğrulama sonuç önbelleğindeki kayıt sayısı",
+                 lambda: verdict_cache.stats()['entries'] if verdict_cache is not None else None)
+metrics.register('verdict_cache_hit_ratio', "Doğrulama sonuç önbelleğinin isabet oranı",
+                 lambda: verdict_cache.hit_ratio() if verdict_cache is not None else None)
+metrics.register('verdict_cache_hits_total', "Doğrulama sonuç önbelleği isabet sayısı",
+                 lambda: verdict_cache.hits if verdict_cache is not None else None, 'counter')
+metrics.register('verdict_cache_misses_total', "Doğrulama sonuç önbelleği ıska sayısı",
+                 lambda: verdict_cache.misses if verdict_cache is not None else None, 'counter')
+metrics.register('verdict_cache_evictions_total', "Kapasite nedeniyle önbellekten çıkarılan sonuç sayısı",
+                 lambda: verdict_cache.evictions if verdict_cache is not None else None, 'counter')
+metrics.register('verdict_cache_invalidations_total', "Key değiştiği için önbellekten silinen sonuç sayısı",
+                 lambda: verdict_cache.invalidations if verdict_cache is not None else None, 'counter')
+metrics.register('usage_pending', "Depoya yazılmayı bekleyen kullanım sayısı",
+                 lambda: usage_accountant.pending() if usage_accountant is not None else None)
+metrics.register('usage_redemptions_total', "Bellekte ayrılan kullanım sayısı",
+                 lambda: usage_accountant.redemptions if usage_accountant is not None else None, 'counter')
+metrics.register('usage_flushes_total', "Kullanım artışlarının toplu yazım sayısı",
+                 lambda: usage_accountant.flushes if usage_accountant is not None else None, 'counter')
+metrics.register('usage_rows_written_total', "Toplu yazımlarda güncellenen satır sayısı",
+                 lambda: usage_accountant.rows_written if usage_accountant is not None else None, 'counter')
+metrics.register('replication_feed_seq', "Primary değişiklik akışının son sıra numarası",
+                 lambda: change_feed.seq if change_feed is not None else None, 'counter')
+metrics.register('replication_applied_seq', "Replikanın uyguladığı son sıra numarası",
+                 lambda: replica.applied_seq if replica is not None else None)
+metrics.register('replication_lag_events', "Replikanın primary'nin gerisinde kaldığı olay sayısı",
+                 lambda: replica.stats()['lag_events'] if replica is not None else None)
+metrics.register('replication_lag_seconds', "Son uygulanan olayın primary'de oluşmasından bu yana geçen süre",
+                 lambda: replica.lag_seconds if replica is not None else None)
+metrics.register('rate_limited_total', "Sınırlama nedeniyle reddedilen istek sayısı",
+                 lambda: rate_limiter.limited if rate_limiter is not None else None, 'counter')
+metrics.register('startup_import_seconds', "Uygulama modülünün yüklenme süresi (Flask dahil)",
+                 lambda: startup_profiler.import_seconds)
+metrics.register('startup_first_request_seconds', "Açılıştan ilk yanıtın hazırlanmasına kadar geçen süre",
+                 lambda: startup_profiler.first_request_seconds)
+metrics.register('startup_warmup_seconds', "Açılıştan arka plan ısınmasının (indeksler, Bloom) bitişine kadar geçen süre",
+                 lambda: startup_profiler.warmup_seconds)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.get('request_started')
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        method, status_code = request.method, response.status_code
+        if response.is_streamed:
+            # Akış halindeki gövde (dışa aktarma, içe aktarma raporu, replikasyon akışı) bu noktada
+            # henüz üretilmedi: süre sunucu yanıtı kapattığında, gövde gönderildikten sonra ölçülür
+            response.call_on_close(lambda: metrics.observe_request(route, method, status_code,
+                                                                   time.perf_counter() - started))
+        else:
+            metrics.observe_request(route, method, status_code, time.perf_counter() - started)
+    if startup_profiler.first_request_seconds is None:
+        startup_profiler.first_request(time.perf_counter() - started if started is not None else None)
+    return response
+
+# Sınırlanan endpoint'ler ve rota sınıfları (kurallar create_app'te okunur)
+RATE_LIMITED_ENDPOINTS = {
+    "check_serial_key": "check",
+    "check_license": "check",
+    "check_serial_keys": "batch",
+    "admin_login": "admin",
+    "add_serial_key": "admin",
+    "add_serial_keys_bulk": "admin",
+    "list_serial_keys": "admin",
+    "import_serial_keys": "admin",
+    "bulk_update_serial_keys": "admin",
+    "deactivate_serial_key": "admin"
+}
+
+# Replikada yazma endpoint'leri kapalıdır; kullanım hakkı düşürme primary'ye iletilir
+@app.before_request
+def enforce_rate_limit():
+    """Sınırı aşan istemcilere 429 ve Retry-After döndürür"""
+    if rate_limiter is None or request.method == 'OPTIONS':
+        return None
+    route_class = RATE_LIMITED_ENDPOINTS.get(request.endpoint)
+    if route_class is None:
+        return None
+    allowed, retry_after = rate_limiter.check(route_class, request.remote_addr or 'unknown')
+    if allowed:
+        return None
+    response = jsonify({
+        "success": False,
+        "message": "Çok fazla istek. Lütfen daha sonra tekrar deneyin"
     })
+    response.status_code = 429
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+# Prometheus metrikleri
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus metin formatında metrikler"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
 
 # Error handlers
 @app.errorhandler(404)
@@ -394,11 +1828,17 @@ def internal_error(error):
         "message": "Sunucu hatası"
     }), 500
 
+create_app()
+startup_profiler.imported()
+
 if __name__ == '__main__':
-    print("🔑 Serial Key Management API başlatılıyor...")
-    print(f"🔐 Admin şifresi: {ADMIN_PASSWORD}")
-    print("📝 Bu şifreyi güvenli bir yerde saklayın!")
-    print("🌐 API: http://localhost:5000")
-    print("📖 Dokümantasyon: http://localhost:5000/api/admin-info")
+    # Geliştirme sunucusu; production için server.py kullanın
+    host, _, port = os.environ.get('BIND', '0.0.0.0:5000').rpartition(':')
+    debug = os.environ.get('DEBUG', '0').lower() not in ('0', 'false', 'no', '')
+    print("🔑 Serial Key Management API başlatılıyor (geliştirme sunucusu)...")
+    if not os.environ.get('ADMIN_PASSWORD'):
+        print("⚠️  ADMIN_PASSWORD ayarlanmadı, varsayılan şifre kullanılıyor!")
+    print(f"🌐 API: http://{host}:{port}")
+    print(f"📖 Dokümantasyon: http://{host}:{port}/api/admin-info")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(debug=debug, host=host, port=int(port))
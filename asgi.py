@@ -0,0 +1,503 @@
+"""
+ASGI giriş noktası.
+
+Doğrulama trafiğinin büyük kısmını oluşturan uzun ömürlü bağlantılar için
+check-serial, check-license, add-serial, list-serials, deactivate-serial ve
+health rotalarını Flask uygulamasıyla aynı depo ve iş mantığı üzerinden async
+olarak sunar.
+Bellek içi depoda nokta işlemleri doğrudan olay döngüsünde çalışır; SQLite
+sorguları, listeleme ve dışa aktarma thread havuzuna aktarılır.
+
+uvicorn kuruluysa onunla, değilse keep-alive destekli yerleşik asyncio
+HTTP/1.1 sunucusuyla çalışır:
+
+    python asgi.py --host 0.0.0.0 --port 8000
+    uvicorn asgi:application --port 8000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote
+
+import app as serial_app
+import json_provider
+
+logger = logging.getLogger(__name__)
+
+ASGI_THREADS = int(os.environ.get('ASGI_THREADS', '32'))
+ASGI_KEEPALIVE_TIMEOUT = float(os.environ.get('ASGI_KEEPALIVE_TIMEOUT', '75'))
+MAX_BODY_BYTES = 1024 * 1024
+MAX_HEADER_BYTES = 64 * 1024
+
+executor = ThreadPoolExecutor(max_workers=ASGI_THREADS, thread_name_prefix='asgi')
+
+CORS_HEADERS = [(b'access-control-allow-origin', b'*')]
+PREFLIGHT_HEADERS = CORS_HEADERS + [
+    (b'access-control-allow-methods', b'GET, POST, OPTIONS'),
+    (b'access-control-allow-headers', b'Authorization, Content-Type')
+]
+
+NOT_FOUND = {"success": False, "message": "Endpoint bulunamadı"}
+METHOD_NOT_ALLOWED = {"success": False, "message": "Bu metot desteklenmiyor"}
+BODY_TOO_LARGE = {"success": False, "message": "İstek gövdesi çok büyük"}
+INVALID_CONSUME = {"success": False, "message": "consume true veya false olmalı"}
+RATE_LIMITED = {"success": False, "message": "Çok fazla istek. Lütfen daha sonra tekrar deneyin"}
+
+
+def blocking_store(writes=False):
+    """Depo çağrıları olay döngüsünü bekletebilir mi: SQLite ve kullanımı primary'ye HTTP ile ileten replika.
+
+    writes: çağrı depoyu değiştirir; fsync=always günlüğünde diske yazılmayı bekler.
+    """
+    if serial_app.STORE_BACKEND != 'memory' or serial_app.replica is not None:
+        return True
+    # Değişiklikler ertelenmiş indekslerin kurulmasını da bekler
+    return writes and (serial_app.key_store.blocking_writes or warming())
+
+
+def warming():
+    """Bellek deposunun ikincil indeksleri arka planda kuruluyor mu"""
+    return not serial_app.key_store.wait_ready(0)
+
+
+def blocking_rate_limit():
+    """Bellek içi sınırlayıcıda işlemler mikro saniye sürer; SQLite thread havuzunda çalışır"""
+    return serial_app.RATE_LIMIT_BACKEND == 'sqlite'
+
+
+async def offload(blocking, func, *args):
+    """blocking ise fonksiyonu thread havuzunda, değilse doğrudan çalıştırır"""
+    if not blocking:
+        return func(*args)
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+
+def encode(payload):
+    """Yanıt gövdesini üretir; önceden kodlanmış (EncodedJSON) gövdeler olduğu gibi döner"""
+    if isinstance(payload, serial_app.EncodedJSON):
+        return payload.body
+    return json_provider.dumps(payload) + b"\n"
+
+
+async def send_body(send, status_code, body, content_type=b'application/json', headers=()):
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [(b'content-type', content_type), (b'content-length', str(len(body)).encode()),
+                    *CORS_HEADERS, *headers]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def read_json(receive):
+    """İstek gövdesini JSON olarak okur; geçersiz veya boşsa {} döner, sınır aşılırsa None"""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            return None
+        chunks.append(chunk)
+        if not message.get('more_body'):
+            break
+    try:
+        data = json.loads(b''.join(chunks)) if chunks else {}
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def client_address(scope, headers):
+    """TRUSTED_PROXIES ayarına göre (ProxyFix ile aynı kural) istemci IP'si"""
+    if serial_app.TRUSTED_PROXIES:
+        forwarded = [value.strip() for value in headers.get(b'x-forwarded-for', b'').decode('latin-1').split(',')]
+        if len(forwarded) >= serial_app.TRUSTED_PROXIES and forwarded[-serial_app.TRUSTED_PROXIES]:
+            return forwarded[-serial_app.TRUSTED_PROXIES]
+    client = scope.get('client')
+    return client[0] if client else 'unknown'
+
+
+def etag_matches(etag, if_none_match):
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.decode('latin-1').split(',')]
+    return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
+
+
+def query_consume(scope):
+    """consume sorgu parametresi; geçersizse None"""
+    values = parse_qs(scope.get('query_string', b'').decode('latin-1')).get('consume')
+    return serial_app.parse_consume(values[0] if values else None)
+
+
+async def check_serial(scope, receive, send, headers, serial_key):
+    consume = query_consume(scope)
+    if consume is None:
+        await send_body(send, 400, encode(INVALID_CONSUME))
+        return 400
+    payload, status_code = await offload(blocking_store(consume), serial_app.check_serial_result, serial_key, consume)
+    await send_body(send, status_code, encode(payload))
+    return status_code
+
+
+async def check_license(scope, receive, send, headers, token):
+    consume = query_consume(scope)
+    if consume is None:
+        await send_body(send, 400, encode(INVALID_CONSUME))
+        return 400
+    payload, status_code = await offload(blocking_store(consume), serial_app.check_license_result, token, consume)
+    await send_body(send, status_code, encode(payload))
+    return status_code
+
+
+async def add_serial(scope, receive, send, headers):
+    data = await read_json(receive)
+    if data is None:
+        await send_body(send, 413, encode(BODY_TOO_LARGE))
+        return 413
+    authorization = headers.get(b'authorization', b'').decode('latin-1')
+    payload, status_code = await offload(blocking_store(True), serial_app.add_serial_result, data, authorization)
+    await send_body(send, status_code, encode(payload))
+    return status_code
+
+
+async def list_serials(scope, receive, send, headers):
+    data = await read_json(receive)
+    if data is None:
+        await send_body(send, 413, encode(BODY_TOO_LARGE))
+        return 413
+    authorization = headers.get(b'authorization', b'').decode('latin-1')
+    # Listeleme bellek içi depoda da tam tarama yapabilir; her zaman thread havuzunda çalışır
+    payload, status_code = await offload(True, serial_app.list_serials_result, data, authorization)
+    if not isinstance(payload, serial_app.ExportStream):
+        await send_body(send, status_code, encode(payload))
+        return status_code
+
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b'content-type', payload.mimetype.encode()), *CORS_HEADERS]
+    })
+    rows = payload.rows
+    while True:
+        chunk = await offload(True, next, rows, None)
+        if chunk is None:
+            break
+        body = chunk if isinstance(chunk, bytes) else chunk.encode()
+        await send({"type": "http.response.body", "body": body, "more_body": True})
+    await send({"type": "http.response.body", "body": b''})
+    return 200
+
+
+async def deactivate_serial(scope, receive, send, headers, serial_key):
+    data = await read_json(receive)
+    if data is None:
+        await send_body(send, 413, encode(BODY_TOO_LARGE))
+        return 413
+    authorization = headers.get(b'authorization', b'').decode('latin-1')
+    payload, status_code = await offload(blocking_store(True), serial_app.deactivate_serial_result,
+                                         serial_key, data, authorization)
+    await send_body(send, status_code, encode(payload))
+    return status_code
+
+
+async def health(scope, receive, send, headers):
+    # Aktif key sayımı indeksler kurulana kadar bekler
+    body, etag = await offload(blocking_store() or warming(), serial_app.health_response.get)
+    cache_headers = [(b'etag', etag.encode()), (b'cache-control', serial_app.health_response.cache_control.encode())]
+    if etag_matches(etag, headers.get(b'if-none-match')):
+        await send({"type": "http.response.start", "status": 304, "headers": [*CORS_HEADERS, *cache_headers]})
+        await send({"type": "http.response.body", "body": b''})
+        return 304
+    await send_body(send, 200, body, headers=cache_headers)
+    return 200
+
+
+# (yöntem, yol deseni, metrik etiketi, sınırlama sınıfı, işleyici) — etiketler Flask rotalarıyla aynıdır
+ROUTES = [
+    ('GET', re.compile(r'/api/check-serial/([^/]+)'), '/api/check-serial/<serial_key>', 'check', check_serial),
+    ('GET', re.compile(r'/api/check-license/([^/]+)'), '/api/check-license/<token>', 'check', check_license),
+    ('POST', re.compile(r'/api/add-serial'), '/api/add-serial', 'admin', add_serial),
+    ('POST', re.compile(r'/api/list-serials'), '/api/list-serials', 'admin', list_serials),
+    ('POST', re.compile(r'/api/deactivate-serial/([^/]+)'), '/api/deactivate-serial/<serial_key>', 'admin',
+     deactivate_serial),
+    ('GET', re.compile(r'/health'), '/health', None, health)
+]
+
+
+def resolve(method, path):
+    """Yola uyan rotayı bulur; (rota, argümanlar, metot uyuyor mu) döndürür"""
+    for route in ROUTES:
+        match = route[1].fullmatch(path)
+        if match:
+            return route, match.groups(), route[0] == method
+    return None, (), False
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({"type": "lifespan.startup.complete"})
+        elif message['type'] == 'lifespan.shutdown':
+            if serial_app.expiry_sweeper is not None:
+                serial_app.expiry_sweeper.stop()
+            executor.shutdown(wait=False)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    """ASGI 3 uygulaması"""
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    started = time.perf_counter()
+    method = scope['method']
+    route, args, method_allowed = resolve(method, scope['path'])
+    label = route[2] if route else 'unmatched'
+    headers = dict(scope['headers'])
+    response_started = False
+
+    async def tracked_send(message):
+        nonlocal response_started
+        if message['type'] == 'http.response.start':
+            response_started = True
+        await send(message)
+
+    try:
+        if route is None:
+            status_code = 404
+            await send_body(send, status_code, encode(NOT_FOUND))
+        elif method == 'OPTIONS':
+            status_code = 200
+            await send({"type": "http.response.start", "status": 200, "headers": PREFLIGHT_HEADERS})
+            await send({"type": "http.response.body", "body": b''})
+        elif not method_allowed:
+            status_code = 405
+            await send_body(send, status_code, encode(METHOD_NOT_ALLOWED), headers=[(b'allow', route[0].encode())])
+        else:
+            limiter = serial_app.rate_limiter
+            allowed, retry_after = True, 0
+            if limiter is not None and route[3] is not None:
+                allowed, retry_after = await offload(blocking_rate_limit(), limiter.check, route[3],
+                                                     client_address(scope, headers))
+            if allowed:
+                status_code = await route[4](scope, receive, tracked_send, headers, *args)
+            else:
+                status_code = 429
+                await send_body(send, status_code, encode(RATE_LIMITED),
+                                headers=[(b'retry-after', str(retry_after).encode())])
+    except Exception as e:
+        status_code = 500
+        if response_started:
+            # Başlık gönderildikten sonra hata yanıtı yazılamaz; bağlantı sunucu tarafından kapatılır
+            serial_app.metrics.observe_request(label, method, status_code, time.perf_counter() - started)
+            raise
+        await send_body(send, status_code, encode({
+            "success": False,
+            "message": f"Sunucu hatası: {str(e)}"
+        }))
+    serial_app.metrics.observe_request(label, method, status_code, time.perf_counter() - started)
+    if serial_app.startup_profiler.first_request_seconds is None:
+        serial_app.startup_profiler.first_request(time.perf_counter() - started)
+
+
+# Yerleşik HTTP/1.1 sunucusu (uvicorn kurulu değilse)
+STATUS_PHRASES = {200: b'OK', 201: b'Created', 304: b'Not Modified', 400: b'Bad Request', 401: b'Unauthorized',
+                  404: b'Not Found', 405: b'Method Not Allowed', 413: b'Payload Too Large',
+                  429: b'Too Many Requests', 500: b'Internal Server Error', 501: b'Not Implemented',
+                  503: b'Service Unavailable'}
+
+
+async def _respond_error(writer, status_code):
+    writer.write(b'HTTP/1.1 %d %s\r\ncontent-length: 0\r\nconnection: close\r\n\r\n'
+                 % (status_code, STATUS_PHRASES[status_code]))
+    await writer.drain()
+
+
+# Açık bağlantılar (writer -> istek işleniyor mu); kapanışta boştakiler hemen kapatılır
+_connections = {}
+_draining = False
+
+
+async def _handle_connection(reader, writer, asgi_app):
+    """Tek bağlantı üzerindeki ardışık (keep-alive) istekleri sırayla işler"""
+    sock = writer.get_extra_info('socket')
+    if sock is not None:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    client = writer.get_extra_info('peername')
+    server = writer.get_extra_info('sockname')
+    _connections[writer] = False
+    try:
+        while not _draining:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), ASGI_KEEPALIVE_TIMEOUT)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                return
+            except asyncio.LimitOverrunError:
+                await _respond_error(writer, 400)
+                return
+
+            lines = head[:-4].split(b'\r\n')
+            try:
+                method, target, version = lines[0].split(b' ')
+                headers = [(name.strip().lower(), value.strip())
+                           for name, _, value in (line.partition(b':') for line in lines[1:])]
+            except ValueError:
+                await _respond_error(writer, 400)
+                return
+            header_map = dict(headers)
+            if b'chunked' in header_map.get(b'transfer-encoding', b'').lower():
+                await _respond_error(writer, 501)
+                return
+            try:
+                content_length = int(header_map.get(b'content-length', b'0'))
+            except ValueError:
+                content_length = -1
+            if content_length < 0:
+                await _respond_error(writer, 400)
+                return
+            if content_length > MAX_BODY_BYTES:
+                # Gövde belleğe okunmadan reddedilir
+                await _respond_error(writer, 413)
+                return
+            try:
+                body = await reader.readexactly(content_length)
+            except asyncio.IncompleteReadError:
+                await _respond_error(writer, 400)
+                return
+
+            _connections[writer] = True
+            http_version = version[5:].decode()
+            connection = header_map.get(b'connection', b'').lower()
+            keep_alive = connection != b'close' if http_version == '1.1' else connection == b'keep-alive'
+            keep_alive = keep_alive and not _draining
+            path, _, query = target.partition(b'?')
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": http_version,
+                "method": method.decode(),
+                "scheme": "http",
+                "path": unquote(path.decode('latin-1')),
+                "raw_path": path,
+                "query_string": query,
+                "root_path": "",
+                "headers": headers,
+                "client": client[:2] if client else None,
+                "server": server[:2] if server else None
+            }
+
+            request_sent = False
+            response = {"chunked": False}
+
+            async def receive():
+                nonlocal request_sent
+                if not request_sent:
+                    request_sent = True
+                    return {"type": "http.request", "body": body, "more_body": False}
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status_code = message['status']
+                    out = [b'HTTP/1.1 %d %s\r\n' % (status_code, STATUS_PHRASES.get(status_code, b''))]
+                    names = set()
+                    for name, value in message.get('headers', []):
+                        names.add(name.lower())
+                        out.append(b'%s: %s\r\n' % (name, value))
+                    if b'content-length' not in names and status_code != 304:
+                        response['chunked'] = True
+                        out.append(b'transfer-encoding: chunked\r\n')
+                    out.append(b'connection: keep-alive\r\n\r\n' if keep_alive else b'connection: close\r\n\r\n')
+                    response['head'] = b''.join(out)
+                elif message['type'] == 'http.response.body':
+                    data = message.get('body', b'')
+                    head = response.pop('head', b'')
+                    if response['chunked']:
+                        if data:
+                            data = b'%x\r\n%s\r\n' % (len(data), data)
+                        if not message.get('more_body'):
+                            data += b'0\r\n\r\n'
+                    writer.write(head + data)
+                    await writer.drain()
+
+            try:
+                await asgi_app(scope, receive, send)
+            except Exception:
+                # Yanıt yarıda kaldı; eksik gövde istemciye bağlantının kapanmasıyla bildirilir
+                logger.exception("Yanıt gönderilirken hata oluştu; bağlantı kapatılıyor")
+                return
+            _connections[writer] = False
+            if not keep_alive:
+                return
+    finally:
+        _connections.pop(writer, None)
+        writer.close()
+
+
+async def serve_builtin(asgi_app, host=None, port=None, ready=None, sock=None, stop=None, drain_timeout=30):
+    """Yerleşik sunucuyu başlatır; ready verilirse dinlenen portu iletir.
+
+    stop (asyncio.Event) tetiklenince yeni bağlantı kabulü durur, boştaki
+    bağlantılar kapatılır ve süren istekler drain_timeout saniyeye kadar beklenir.
+    """
+    global _draining
+    server = await asyncio.start_server(lambda reader, writer: _handle_connection(reader, writer, asgi_app),
+                                        host, port, sock=sock, limit=MAX_HEADER_BYTES, backlog=1024)
+    if ready is not None:
+        ready(server.sockets[0].getsockname()[1])
+    if stop is None:
+        async with server:
+            await server.serve_forever()
+        return
+
+    await stop.wait()
+    server.close()
+    _draining = True
+    deadline = time.monotonic() + drain_timeout
+    while _connections and time.monotonic() < deadline:
+        for writer, busy in list(_connections.items()):
+            if not busy:
+                writer.close()
+        await asyncio.sleep(0.05)
+
+
+def serve(host='127.0.0.1', port=8000):
+    """uvicorn varsa onunla, yoksa yerleşik sunucuyla çalışır"""
+    try:
+        import uvicorn
+    except ImportError:
+        uvicorn = None
+    if uvicorn is not None:
+        uvicorn.run(application, host=host, port=port, timeout_keep_alive=int(ASGI_KEEPALIVE_TIMEOUT),
+                    access_log=False)
+        return
+    print(f"🌐 ASGI (yerleşik sunucu): http://{host}:{port}")
+    try:
+        asyncio.run(serve_builtin(application, host, port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serial Key API ASGI sunucusu")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+    serve(args.host, args.port)
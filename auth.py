@@ -0,0 +1,96 @@
+"""
+Admin kimlik doğrulaması.
+
+Admin şifresi açılışı yavaşlatmamak için PBKDF2 ile bir kez, uygulamanın arka
+plan ısınmasında (ısınma bitmeden gelirse ilk giriş denemesinde) hash'lenir.
+Giriş sonrası verilen HMAC imzalı kısa ömürlü bearer token'lar, şifreyi her
+istekte göndermeden ve KDF maliyeti ödemeden doğrulanır. Tüm karşılaştırmalar sabit zamanlıdır.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+
+PBKDF2_ITERATIONS = 200_000
+
+
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+class AdminAuth:
+    """Admin şifresi ve token doğrulayıcısı"""
+
+    def __init__(self, password, token_secret=None, token_ttl=900, iterations=PBKDF2_ITERATIONS):
+        self.token_ttl = token_ttl
+        self._iterations = iterations
+        self._salt = secrets.token_bytes(16)
+        # KDF ~100 ms sürer: soğuk açılışta değil, prepare() veya ilk doğrulamada hesaplanır
+        self._password = password
+        self._password_hash = None
+        self._hash_lock = threading.Lock()
+        # Token anahtarı verilmezse süreç başına rastgele üretilir (worker'lar arası paylaşılmaz)
+        self._token_key = token_secret.encode() if token_secret else secrets.token_bytes(32)
+        # Doğrulanmış şifrenin anahtarlı parmak izi: tekrar eden doğru şifreler KDF'e girmez
+        self._fingerprint_key = secrets.token_bytes(32)
+        self._verified_fingerprint = None
+
+    def _kdf(self, password):
+        return hashlib.pbkdf2_hmac('sha256', password.encode(), self._salt, self._iterations)
+
+    def prepare(self):
+        """Şifre hash'ini önceden hesaplar (arka plan ısınması); ilk giriş KDF'i beklemez"""
+        self._stored_hash()
+
+    def _stored_hash(self):
+        if self._password_hash is None:
+            with self._hash_lock:
+                if self._password_hash is None:
+                    self._password_hash = self._kdf(self._password)
+                    self._password = None
+        return self._password_hash
+
+    def verify_password(self, password):
+        """Şifreyi sabit zamanlı karşılaştırmayla doğrular"""
+        if not isinstance(password, str):
+            return False
+        fingerprint = hmac.new(self._fingerprint_key, password.encode(), hashlib.sha256).digest()
+        cached = self._verified_fingerprint
+        if cached is not None and hmac.compare_digest(fingerprint, cached):
+            return True
+        # Yanlış şifreler her seferinde KDF maliyetini öder
+        if hmac.compare_digest(self._kdf(password), self._stored_hash()):
+            self._verified_fingerprint = fingerprint
+            return True
+        return False
+
+    def _sign(self, payload):
+        return hmac.new(self._token_key, payload.encode(), hashlib.sha256).digest()
+
+    def issue_token(self, now=None):
+        """Yeni bir admin token'ı üretir; (token, bitiş epoch saniyesi) döndürür"""
+        expires_at = int(now if now is not None else time.time()) + self.token_ttl
+        payload = _b64encode(json.dumps({"sub": "admin", "exp": expires_at}).encode())
+        return f"{payload}.{_b64encode(self._sign(payload))}", expires_at
+
+    def verify_token(self, token, now=None):
+        """Token imzasını ve süresini doğrular"""
+        try:
+            payload, signature = token.split('.')
+            if not hmac.compare_digest(_b64decode(signature), self._sign(payload)):
+                return False
+            claims = json.loads(_b64decode(payload))
+        except (ValueError, TypeError, AttributeError):
+            return False
+        expires_at = claims.get('exp') if isinstance(claims, dict) else None
+        if not isinstance(expires_at, int):
+            return False
+        return expires_at > (now if now is not None else time.time())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+WSGI ve ASGI sunum modlarının karşılaştırması.
+
+Her mod ayrı bir süreçte başlatılır (WSGI: werkzeug threaded sunucu, ASGI:
+asgi.py — uvicorn varsa uvicorn, yoksa yerleşik sunucu). İstemci asyncio ile
+verilen sayıda keep-alive bağlantı açar ve her bağlantıdan ardışık
+/api/check-serial istekleri gönderir; eşzamanlılık seviyesi başına throughput
+ve p50/p95/p99 gecikmeleri raporlanır. werkzeug her yanıttan sonra bağlantıyı
+kapattığı için WSGI modunda istemci her istekte yeniden bağlanır; bu sayı da
+raporlanır.
+
+Kullanım:
+    python benchmarks/bench_asgi.py --connections 1,16,64,256 --requests 20000
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def serve(mode, port, keys_file):
+    """Alt süreç: key'leri yükler ve seçilen modda sunucuyu başlatır"""
+    import logging
+    from datetime import datetime
+
+    import app as serial_app
+    with open(keys_file) as f:
+        keys = f.read().split()
+    created_at = datetime.now().isoformat()
+    serial_app.key_store.add_many({
+        "serial_key": serial_key,
+        "created_at": created_at,
+        "is_active": True,
+        "description": "benchmark",
+        "expiry_date": None,
+        "max_uses": 10 ** 9,
+        "current_uses": 0
+    } for serial_key in keys)
+    if serial_app.bloom_filter is not None:
+        serial_app.rebuild_bloom_filter()
+
+    if mode == 'wsgi':
+        from werkzeug.serving import make_server
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        server = make_server('127.0.0.1', port, serial_app.app, threaded=True)
+        server.serve_forever()
+    else:
+        import asgi
+        asgi.serve('127.0.0.1', port)
+
+
+def start_server(mode, keys_file, backend):
+    port = free_port()
+    env = dict(os.environ, SERIAL_STORE_BACKEND=backend, EXPIRY_SWEEP_INTERVAL='0', RATE_LIMIT_ENABLED='0',
+               SERIAL_DB_PATH=os.path.join(tempfile.mkdtemp(), 'bench.db'))
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--serve', mode,
+                                '--port', str(port), '--keys-file', keys_file],
+                               env=env, stdout=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return process, port
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{mode} sunucusu başlatılamadı")
+
+
+async def connection_worker(port, paths, samples, reconnects):
+    """Aynı bağlantıdan ardışık istek gönderir; sunucu bağlantıyı kapatırsa yeniden bağlanır"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        for path in paths:
+            started = time.perf_counter()
+            writer.write(b'GET %s HTTP/1.1\r\nHost: localhost\r\n\r\n' % path.encode())
+            await writer.drain()
+            head = (await reader.readuntil(b'\r\n\r\n')).lower()
+            length = 0
+            for line in head.split(b'\r\n'):
+                if line.startswith(b'content-length:'):
+                    length = int(line.split(b':', 1)[1])
+            await reader.readexactly(length)
+            if b'connection: close' in head:
+                writer.close()
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                reconnects.append(1)
+            samples.append((time.perf_counter() - started) * 1e6)
+    finally:
+        writer.close()
+
+
+async def load(port, keys, connections, total):
+    per_connection = max(1, total // connections)
+    samples = []
+    reconnects = []
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        connection_worker(port, [f'/api/check-serial/{keys[(c * per_connection + i) % len(keys)]}'
+                                 for i in range(per_connection)], samples, reconnects)
+        for c in range(connections)
+    ])
+    return sorted(samples), time.perf_counter() - started, len(reconnects)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=['memory', 'sqlite'], default='memory')
+    parser.add_argument('--keys', type=int, default=10_000)
+    parser.add_argument('--requests', type=int, default=10_000, help="eşzamanlılık seviyesi başına istek")
+    parser.add_argument('--connections', default='1,16,64,256')
+    parser.add_argument('--serve', choices=['wsgi', 'asgi'], help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--keys-file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port, args.keys_file)
+        return
+
+    os.environ['EXPIRY_SWEEP_INTERVAL'] = '0'
+    from app import generate_serial_keys
+    keys = generate_serial_keys(args.keys)
+    keys_file = os.path.join(tempfile.mkdtemp(), 'keys.txt')
+    with open(keys_file, 'w') as f:
+        f.write('\n'.join(keys))
+
+    levels = [int(level) for level in args.connections.split(',')]
+    print(f"backend={args.backend} keys={args.keys} requests={args.requests}")
+    for mode in ('wsgi', 'asgi'):
+        process, port = start_server(mode, keys_file, args.backend)
+        try:
+            asyncio.run(load(port, keys, 4, 400))  # ısınma
+            for connections in levels:
+                samples, elapsed, reconnects = asyncio.run(load(port, keys, connections, args.requests))
+                print(f"{mode} bağlantı={connections:<4} throughput={len(samples) / elapsed:>8.0f}/s "
+                      f"p50={percentile(samples, 0.50):>8.0f}µs p95={percentile(samples, 0.95):>8.0f}µs "
+                      f"p99={percentile(samples, 0.99):>8.0f}µs yeniden bağlanma={reconnects}")
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
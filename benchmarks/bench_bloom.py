@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Bloom filtresinin olmayan key taşkınına etkisi.
+
+Depoyu N key ile doldurur, ardından rastgele (büyük olasılıkla olmayan) key'lerle
+/api/check-serial isteklerini filtre açıkken ve kapalıyken çalıştırır; istek
+başına gecikmenin p50/p95/p99 değerlerini raporlar.
+
+Kullanım:
+    python benchmarks/bench_bloom.py --backend sqlite --keys 200000 --requests 20000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure(client, keys):
+    samples = []
+    for serial_key in keys:
+        started = time.perf_counter()
+        client.get(f'/api/check-serial/{serial_key}')
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+
+def report(label, samples):
+    print(f"{label:<14} p50={percentile(samples, 0.50):>8.1f}µs p95={percentile(samples, 0.95):>8.1f}µs "
+          f"p99={percentile(samples, 0.99):>8.1f}µs throughput={len(samples) / (sum(samples) / 1e6):>8.0f}/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=['memory', 'sqlite'], default='sqlite')
+    parser.add_argument('--keys', type=int, default=100_000)
+    parser.add_argument('--requests', type=int, default=10_000)
+    args = parser.parse_args()
+
+    os.environ['SERIAL_STORE_BACKEND'] = args.backend
+    os.environ['SERIAL_DB_PATH'] = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ['BLOOM_FILTER'] = 'on'
+    os.environ['EXPIRY_SWEEP_INTERVAL'] = '0'
+    os.environ['RATE_LIMIT_ENABLED'] = '0'
+    import app as serial_app
+
+    created_at = datetime.now().isoformat()
+    for start in range(0, args.keys, 10_000):
+        serial_app.key_store.add_many({
+            "serial_key": serial_key,
+            "created_at": created_at,
+            "is_active": True,
+            "description": "benchmark",
+            "expiry_date": None,
+            "max_uses": 1,
+            "current_uses": 0
+        } for serial_key in serial_app.generate_serial_keys(min(10_000, args.keys - start)))
+    serial_app.rebuild_bloom_filter()
+
+    client = serial_app.app.test_client()
+    flood = serial_app.generate_serial_keys(args.requests)
+    measure(client, flood[:200])  # ısınma
+
+    print(f"backend={args.backend} keys={serial_app.key_store.count()} requests={args.requests}")
+    report("bloom açık", measure(client, flood))
+    stats = serial_app.bloom_filter.stats()
+    serial_app.bloom_filter = None
+    report("bloom kapalı", measure(client, flood))
+    print(f"filtre: {stats['size_bytes']} bayt, k={stats['hash_count']}, "
+          f"gözlenen FP oranı={stats['observed_fp_rate']}, tahmini FP oranı={stats['estimated_fp_rate']}")
+
+
+if __name__ == '__main__':
+    main()
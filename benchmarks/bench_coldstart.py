@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Soğuk açılış: süreç başlatıldıktan ilk check-serial yanıtına kadar geçen süre.
+
+Her key sayısı için günlüklü bellek deposu hazırlanır; ardından server.py
+(--no-preload, tek worker) STARTUP_WARMUP=sync ve background ile tekrar tekrar
+başlatılıp kapatılır. İlk başarılı check-serial yanıtının süreç başlangıcından
+itibaren duvar saati süresi, uygulamanın /health'te raporladığı açılış profili
+(import, ilk istek, ısınma) ile birlikte yazdırılır.
+
+Kullanım:
+    python benchmarks/bench_coldstart.py --sizes 0,100000,1000000 --runs 3
+"""
+
+import argparse
+import http.client
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from bench_journal import fill  # noqa: E402
+from bench_redeem import make_key  # noqa: E402
+from store import create_store  # noqa: E402
+
+
+def prepare(journal_dir, count):
+    """count key'lik anlık görüntü yazar (sorgulanacak key için en az bir key)"""
+    store = create_store('memory', journal_dir=journal_dir)
+    fill(store, max(1, count), 0.1)
+    store.snapshot()
+    store.close()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def get(port, path):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        conn.request('GET', path)
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        conn.close()
+
+
+def cold_start(journal_dir, warmup, serial_key):
+    """Sunucuyu başlatır; (ilk yanıt saniyesi, açılış profili) döndürür"""
+    port = free_port()
+    env = dict(os.environ, SERIAL_JOURNAL_DIR=journal_dir, STARTUP_WARMUP=warmup)
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT_DIR, 'server.py'), '--bind', f'127.0.0.1:{port}',
+                                '--workers', '1', '--no-preload'], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            try:
+                status, _ = get(port, f'/api/check-serial/{serial_key}?consume=false')
+                if status == 200:
+                    break
+            except OSError:
+                pass
+            if process.poll() is not None:
+                raise RuntimeError("Sunucu açılırken kapandı")
+            time.sleep(0.005)
+        first_response = time.perf_counter() - started
+        # Isınma bitene kadar bekler: sonraki tur aynı günlüğü açacak
+        while True:
+            _, body = get(port, '/health')
+            profile = json.loads(body)['startup']
+            if profile['warm']:
+                return first_response, profile
+            time.sleep(0.1)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def ms(value):
+    return f"{value * 1000:7.0f}" if value is not None else "      -"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='0,100000', help="virgülle ayrılmış key sayıları")
+    parser.add_argument('--runs', type=int, default=3, help="her mod için açılış sayısı")
+    parser.add_argument('--modes', default='sync,background', help="STARTUP_WARMUP değerleri")
+    args = parser.parse_args()
+
+    os.environ.setdefault('ADMIN_PASSWORD', 'admin123')
+    os.environ.setdefault('EXPIRY_SWEEP_INTERVAL', '0')
+    os.environ.setdefault('RATE_LIMIT_ENABLED', '0')
+    print("key sayısı  mod          ilk yanıt    import  ilk istek   ısınma  (ms, en iyi tur)")
+    for count in (int(size) for size in args.sizes.split(',')):
+        root = tempfile.mkdtemp()
+        try:
+            journal_dir = os.path.join(root, 'journal')
+            prepare(journal_dir, count)
+            for warmup in args.modes.split(','):
+                runs = [cold_start(journal_dir, warmup, make_key(0)) for _ in range(args.runs)]
+                first_response, profile = min(runs, key=lambda run: run[0])
+                print(f"{count:<11} {warmup:<12} {ms(first_response)}   {ms(profile['import_seconds'])}   "
+                      f"{ms(profile['first_request_seconds'])}  {ms(profile['warmup_seconds'])}")
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
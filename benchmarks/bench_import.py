@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+CSV/NDJSON toplu içe aktarma ve dışa aktarma süresi.
+
+Önce list-serials dışa aktarma biçiminde, oluşturma zamanları karışık sırada
+bir CSV dosyası üretilir (süreye dahil değildir). Ardından:
+
+- CSV -> SQLite deposu: içe aktarma süresi ve tepe RSS artışı (sabit bellek)
+- CSV -> bellek deposu: içe aktarma süresi
+- bellek deposu -> NDJSON ve CSV: dışa aktarma süresi
+- NDJSON -> boş bellek deposu: dışa aktarılan dosyanın geri yüklenmesi
+
+Kullanım:
+    python benchmarks/bench_import.py --keys 1000000
+"""
+
+import argparse
+import csv
+import os
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('EXPIRY_SWEEP_INTERVAL', '0')
+os.environ.setdefault('RATE_LIMIT_ENABLED', '0')
+os.environ.setdefault('METRICS_ENABLED', '0')
+
+import app as serial_app  # noqa: E402
+from bench_redeem import make_key  # noqa: E402
+from importer import PARSERS, KeyImporter  # noqa: E402
+from store import KeyQuery, MemoryKeyStore, SQLiteKeyStore  # noqa: E402
+
+
+def peak_rss_bytes():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def write_source(path, count):
+    """Eski sistemden taşınmış gibi oluşturma zamanları karışık sırada olan kaynak dosya"""
+    now = datetime.now()
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(serial_app.LIST_EXPORT_FIELDS)
+        for index in range(count):
+            created_at = (now - timedelta(seconds=index * 7919 % count)).isoformat()
+            writer.writerow([make_key(index), created_at, "benchmark", True, "", 5, index % 5, 5 - index % 5])
+
+
+def import_file(store, path, input_format):
+    started = time.perf_counter()
+    importer = KeyImporter(store, serial_app.is_valid_serial_format)
+    with open(path, encoding='utf-8-sig', newline='') as lines:
+        errors = sum(len(chunk) for chunk in importer.run(PARSERS[input_format](lines)))
+    summary = importer.summary()
+    assert errors == 0 and summary['imported'] == summary['rows'], summary
+    return time.perf_counter() - started
+
+
+def export_file(store, path, output_format):
+    started = time.perf_counter()
+    with open(path, 'wb') as output:
+        for chunk in serial_app._export_rows(store.scan(KeyQuery()), output_format):
+            output.write(chunk.encode() if isinstance(chunk, str) else chunk)
+    return time.perf_counter() - started
+
+
+def report(name, count, elapsed, extra=""):
+    print(f"{name:<30} {elapsed:>6.2f}s  {count / elapsed:>10,.0f} satır/s{extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--keys', type=int, default=1_000_000, help="key sayısı")
+    args = parser.parse_args()
+    count = args.keys
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'kaynak.csv')
+        write_source(source, count)
+        print(f"key={count}  kaynak={os.path.getsize(source) / 1e6:.0f} MB")
+
+        rss_before = peak_rss_bytes()
+        sqlite_store = SQLiteKeyStore(os.path.join(directory, 'serial_keys.db'))
+        elapsed = import_file(sqlite_store, source, 'csv')
+        report("içe aktarma: CSV -> SQLite", count, elapsed,
+               f"  tepe RSS artışı={(peak_rss_bytes() - rss_before) / 1e6:.0f} MB")
+        del sqlite_store
+
+        store = MemoryKeyStore()
+        report("içe aktarma: CSV -> bellek", count, import_file(store, source, 'csv'))
+        exported = os.path.join(directory, 'disa.ndjson')
+        report("dışa aktarma: bellek -> NDJSON", count, export_file(store, exported, 'ndjson'))
+        report("dışa aktarma: bellek -> CSV", count, export_file(store, os.path.join(directory, 'disa.csv'), 'csv'))
+        del store
+
+        report("geri yükleme: NDJSON -> bellek", count, import_file(MemoryKeyStore(), exported, 'ndjson'))
+
+
+if __name__ == '__main__':
+    main()
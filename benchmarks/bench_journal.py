@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Günlüklü bellek deposunun açılış süresi ve yazma maliyeti.
+
+Her key sayısı için depo günlükle doldurulur ve key'lerin bir kısmı redeem
+edilir; ardından üç açılış senaryosu ölçülür: yalnızca günlükten, anlık
+görüntü alındıktan sonra ve anlık görüntü + günlük kuyruğundan. Ayrıca her
+fsync politikasında eşzamanlı redeem throughput'u raporlanır.
+
+Kullanım:
+    python benchmarks/bench_journal.py --sizes 100000,1000000 --threads 8
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_redeem import make_key  # noqa: E402
+from store import create_store  # noqa: E402
+
+CREATED_AT = '2024-01-01T00:00:00'
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def fill(store, count, redeem_ratio):
+    """Depoyu count key ile doldurur ve bir kısmını redeem eder"""
+    chunk = 50_000
+    for start in range(0, count, chunk):
+        store.add_many({
+            "serial_key": make_key(i),
+            "created_at": CREATED_AT,
+            "is_active": True,
+            "description": "benchmark",
+            "expiry_date": None,
+            "max_uses": 5,
+            "current_uses": 0
+        } for i in range(start, min(count, start + chunk)))
+    for i in range(0, count, max(1, int(1 / redeem_ratio))):
+        store.redeem(make_key(i))
+
+
+def timed_open(directory):
+    started = time.perf_counter()
+    store = create_store('memory', journal_dir=directory, fsync='never')
+    return store, time.perf_counter() - started
+
+
+def bench_startup(count, redeem_ratio):
+    directory = tempfile.mkdtemp()
+    try:
+        store = create_store('memory', journal_dir=directory, fsync='never', snapshot_bytes=1 << 62)
+        started = time.perf_counter()
+        fill(store, count, redeem_ratio)
+        store.close()
+        fill_seconds = time.perf_counter() - started
+        journal_bytes = directory_size(directory)
+
+        store, journal_seconds = timed_open(directory)
+        started = time.perf_counter()
+        store.snapshot()
+        snapshot_seconds = time.perf_counter() - started
+        store.close()
+        snapshot_bytes = directory_size(directory)
+        _, snapshot_open_seconds = timed_open(directory)
+
+        # Anlık görüntüden sonra %1'lik günlük kuyruğu
+        store, _ = timed_open(directory)
+        for i in range(0, count, 100):
+            store.redeem(make_key(i))
+        store.close()
+        store, tail_seconds = timed_open(directory)
+        assert store.count() == count
+        store.close()
+    finally:
+        shutil.rmtree(directory)
+
+    print(f"key={count:<9} doldurma={fill_seconds:>6.2f}s günlük={journal_bytes / 1e6:>7.1f}MB "
+          f"anlık görüntü={snapshot_bytes / 1e6:>7.1f}MB ({snapshot_bytes / count:.0f} B/key)")
+    print(f"    açılış: yalnız günlük={journal_seconds:>6.2f}s anlık görüntü={snapshot_open_seconds:>6.2f}s "
+          f"anlık görüntü+kuyruk={tail_seconds:>6.2f}s  anlık görüntü yazma={snapshot_seconds:.2f}s")
+
+
+def bench_fsync(policy, threads, attempts):
+    """Eşzamanlı redeem throughput'u; policy=None günlüksüz depodur"""
+    directory = tempfile.mkdtemp()
+    try:
+        if policy is None:
+            store = create_store('memory')
+        else:
+            store = create_store('memory', journal_dir=directory, fsync=policy)
+        keys = [make_key(i) for i in range(threads * attempts)]
+        store.add_many({
+            "serial_key": serial_key,
+            "created_at": CREATED_AT,
+            "is_active": True,
+            "description": "benchmark",
+            "expiry_date": None,
+            "max_uses": 1,
+            "current_uses": 0
+        } for serial_key in keys)
+
+        def worker(offset):
+            for serial_key in keys[offset::threads]:
+                store.redeem(serial_key)
+
+        workers = [threading.Thread(target=worker, args=(offset,)) for offset in range(threads)]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        store.close()
+    finally:
+        shutil.rmtree(directory)
+    print(f"fsync={policy or 'günlük yok':<11} thread={threads} redeem={len(keys) / elapsed:>9.0f}/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='100000,1000000', help="virgülle ayrılmış key sayıları")
+    parser.add_argument('--redeem-ratio', type=float, default=0.1, help="redeem edilen key oranı")
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--attempts', type=int, default=2000, help="fsync testinde thread başına redeem")
+    args = parser.parse_args()
+
+    for count in (int(size) for size in args.sizes.split(',')):
+        bench_startup(count, args.redeem_ratio)
+    for policy in (None, 'never', 'interval', 'always'):
+        bench_fsync(policy, args.threads, args.attempts)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+JSON yanıt kodlamasının yanıt başına CPU maliyeti.
+
+Flask'ın varsayılan JSON sağlayıcısı (standart kütüphane, girintisiz) ile
+json_provider (orjson kuruluysa orjson) karşılaştırılır:
+
+- kodlama: check-serial, 100 kayıtlık list-serials sayfası ve 1000 key'lik
+  toplu sorgu yanıtlarının yalnızca kodlanması
+- hata yanıtı: jsonify ile her seferinde kodlama ve önceden kodlanmış şablon
+- uçtan uca: test_client ile check-serial (geçerli / bulunamadı) ve
+  list-serials isteklerinin CPU süresi
+
+Kullanım:
+    python benchmarks/bench_json.py --requests 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('EXPIRY_SWEEP_INTERVAL', '0')
+os.environ.setdefault('RATE_LIMIT_ENABLED', '0')
+os.environ.setdefault('METRICS_ENABLED', '0')
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+import app as serial_app  # noqa: E402
+import json_provider  # noqa: E402
+from bench_redeem import make_key  # noqa: E402
+
+
+def cpu_per_call(count, func):
+    """func'ın çağrı başına CPU süresini mikrosaniye olarak döndürür"""
+    started = time.process_time()
+    for _ in range(count):
+        func()
+    return (time.process_time() - started) / count * 1e6
+
+
+def report(name, baseline, fast):
+    print(f"{name:<34} varsayılan={baseline:>8.1f}µs  hızlı={fast:>8.1f}µs  "
+          f"kazanç={baseline - fast:>7.1f}µs ({baseline / fast:.1f}x)")
+
+
+def seed(count):
+    created_at = datetime.now().isoformat()
+    serial_app.key_store.add_many({
+        "serial_key": make_key(i),
+        "created_at": created_at,
+        "is_active": True,
+        "description": "benchmark açıklaması",
+        "expiry_date": None,
+        "max_uses": 10 ** 9,
+        "current_uses": 0
+    } for i in range(count))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=5000, help="ölçüm başına tekrar")
+    args = parser.parse_args()
+    count = args.requests
+
+    app = serial_app.app
+    seed(1000)
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = app.json
+    records = serial_app.key_store.page(serial_app.KeyQuery(), limit=1000)
+    print(f"kodlayıcı={json_provider.ENCODER_NAME}")
+
+    check_payload = {"success": True, "message": "Serial key geçerli", "is_valid": True,
+                     "data": serial_app.serial_key_data(records[0])}
+    list_payload = {"success": True, "data": [serial_app.serial_key_listing(record) for record in records[:100]],
+                    "next_cursor": "x", "total": 1000}
+    batch_payload = {"success": True, "results": [
+        {"serial_key": record.serial_key, "is_valid": True, "message": "Serial key geçerli",
+         "data": serial_app.serial_key_data(record)} for record in records]}
+    with app.app_context():
+        for name, payload, repeat in (("kodlama: check-serial", check_payload, count),
+                                      ("kodlama: list-serials (100)", list_payload, max(1, count // 20)),
+                                      ("kodlama: check-serials (1000)", batch_payload, max(1, count // 100))):
+            report(name, cpu_per_call(repeat, lambda: default_provider.response(payload)),
+                   cpu_per_call(repeat, lambda: fast_provider.response(payload)))
+
+        error_payload = {"success": False, "message": "Serial key bulunamadı", "is_valid": False}
+        template = serial_app.VALIDATION_RESPONSES["not_found"]
+        report("hata yanıtı: jsonify / şablon", cpu_per_call(count, lambda: default_provider.response(error_payload)),
+               cpu_per_call(count, lambda: serial_app.json_response(*template)))
+
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {serial_app.admin_auth.issue_token()[0]}"}
+    hit = f"/api/check-serial/{records[0].serial_key}"
+    miss = "/api/check-serial/ZZZZ-ZZZZ-ZZZZ-ZZZZ"
+    cases = (("uçtan uca: check-serial geçerli", lambda: client.get(hit), count),
+             ("uçtan uca: check-serial bulunamadı", lambda: client.get(miss), count),
+             ("uçtan uca: list-serials (100)",
+              lambda: client.post('/api/list-serials', json={"limit": 100}, headers=headers), max(1, count // 10)))
+    for name, request, repeat in cases:
+        app.json = default_provider
+        original = serial_app.VALIDATION_RESPONSES
+        # Varsayılan ölçümde hata yanıtları da her seferinde kodlanır
+        serial_app.VALIDATION_RESPONSES = {
+            outcome: ({"success": False, "message": message, "is_valid": False}, status_code)
+            for outcome, (message, status_code) in serial_app.VALIDATION_ERRORS.items()
+        }
+        baseline = cpu_per_call(repeat, request)
+        serial_app.VALIDATION_RESPONSES = original
+        app.json = fast_provider
+        report(name, baseline, cpu_per_call(repeat, request))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Bellek deposunun key başına bellek kullanımı.
+
+tracemalloc ile ölçülür: yalnızca kayıtlar (KeyRecord ve karşılaştırma için
+eski sözlük biçimi) ve indeksleriyle birlikte tam MemoryKeyStore. Ayrıca
+depo dolduktan sonraki RSS artışı raporlanır.
+
+Kullanım:
+    python benchmarks/bench_memory.py --sizes 100000,1000000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_redeem import make_key  # noqa: E402
+from record import KeyRecord, created_timestamp  # noqa: E402
+from store import MemoryKeyStore  # noqa: E402
+
+STARTED = datetime(2024, 1, 1)
+
+
+def created_at(index):
+    return (STARTED + timedelta(microseconds=index * 1000)).isoformat()
+
+
+def make_dict(serial_key, index):
+    """Uygulamanın eklediği biçimde kayıt: her key'in kendi oluşturma zamanı metni vardır"""
+    return {
+        "serial_key": serial_key,
+        "created_at": created_at(index),
+        "is_active": True,
+        "description": "benchmark",
+        "expiry_date": None,
+        "max_uses": 1,
+        "current_uses": 0,
+        "expires_at": None
+    }
+
+
+def fill(keys):
+    store = MemoryKeyStore()
+    store.add_many(make_dict(make_key(index), index) for index in range(len(keys)))
+    return store
+
+
+def resident_bytes():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def measure(build):
+    """build() çağrısının canlı tuttuğu belleği (bayt) ve sonucunu döndürür"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='100000,1000000', help="virgülle ayrılmış key sayıları")
+    args = parser.parse_args()
+
+    for count in (int(size) for size in args.sizes.split(',')):
+        # Serial key metinleri iki kayıt biçiminde de ortaktır ve ölçüme girmez
+        keys = [make_key(index) for index in range(count)]
+
+        def as_dicts():
+            return [make_dict(serial_key, index) for index, serial_key in enumerate(keys)]
+
+        def as_records():
+            return [KeyRecord(serial_key, created_timestamp(created_at(index)), True, "benchmark", None, 1, 0, None)
+                    for index, serial_key in enumerate(keys)]
+
+        dict_bytes, dicts = measure(as_dicts)
+        del dicts
+        record_bytes, records = measure(as_records)
+        del records
+
+        rss_before = resident_bytes()
+        store_bytes, store = measure(lambda: fill(keys))
+        rss_growth = resident_bytes() - rss_before
+        print(f"key={count:<9} sözlük={dict_bytes / count:>5.0f} B/key  KeyRecord={record_bytes / count:>5.0f} B/key  "
+              f"depo (kayıt+key+indeks)={store_bytes / count:>5.0f} B/key  RSS artışı={rss_growth / count:>5.0f} B/key")
+        del store, keys
+
+
+if __name__ == '__main__':
+    main()
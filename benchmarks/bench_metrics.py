@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Metrik toplamanın istek başına maliyeti.
+
+/api/check-serial (bulunan ve bulunmayan key) isteklerini metrikler açıkken
+ve kapalıyken çalıştırır, istek başına ek maliyeti ve /metrics çıktısının
+üretim süresini raporlar.
+
+Kullanım:
+    python benchmarks/bench_metrics.py --requests 2000 --rounds 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2_000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ['EXPIRY_SWEEP_INTERVAL'] = '0'
+    os.environ['RATE_LIMIT_ENABLED'] = '0'
+    import app as serial_app
+
+    client = serial_app.app.test_client()
+    client.post('/api/add-serial', json={
+        "password": serial_app.ADMIN_PASSWORD,
+        "serial_key": "AAAA-BBBB-CCCC-DDDD",
+        "max_uses": 10 ** 9
+    })
+
+    def run(path):
+        started = time.perf_counter()
+        for _ in range(args.requests):
+            client.get(path)
+        return (time.perf_counter() - started) / args.requests * 1e6
+
+    for label, path in (("bulunan", '/api/check-serial/AAAA-BBBB-CCCC-DDDD'),
+                        ("bulunmayan", '/api/check-serial/ZZZZ-BBBB-CCCC-DDDD')):
+        run(path)  # ısınma
+        # Açık/kapalı turlar dönüşümlü çalıştırılır, gürültüyü azaltmak için en iyi tur alınır
+        enabled, disabled = [], []
+        for _ in range(args.rounds):
+            serial_app.metrics.enabled = True
+            enabled.append(run(path))
+            serial_app.metrics.enabled = False
+            disabled.append(run(path))
+        serial_app.metrics.enabled = True
+        enabled, disabled = min(enabled), min(disabled)
+        print(f"{label:<12} açık={enabled:>8.2f}µs kapalı={disabled:>8.2f}µs ek maliyet={enabled - disabled:>6.2f}µs/istek")
+
+    started = time.perf_counter()
+    body = client.get('/metrics').data
+    print(f"/metrics      {(time.perf_counter() - started) * 1e3:.2f}ms, {len(body)} bayt")
+
+
+if __name__ == '__main__':
+    main()
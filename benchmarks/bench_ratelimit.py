@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+İstek sınırlayıcının istek başına maliyeti.
+
+Önce RateLimiter.check çağrısının tek başına maliyetini (bellek ve SQLite
+motorları, çok sayıda istemci IP'si ile) ölçer, ardından /api/check-serial
+isteklerini sınırlayıcı açıkken ve kapalıyken karşılaştırır.
+
+Kullanım:
+    python benchmarks/bench_ratelimit.py --calls 100000 --clients 10000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ratelimit import MemoryBucketBackend, RateLimiter, SQLiteBucketBackend  # noqa: E402
+
+
+def bench_check(label, backend, calls, clients):
+    limiter = RateLimiter({"check": (1e9, 1e9)}, backend)
+    addresses = [f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}" for i in range(clients)]
+    started = time.perf_counter()
+    for i in range(calls):
+        limiter.check("check", addresses[i % clients])
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed / calls * 1e6:>8.2f}µs/çağrı")
+
+
+def bench_requests(requests):
+    os.environ['EXPIRY_SWEEP_INTERVAL'] = '0'
+    os.environ['RATE_LIMIT_CHECK'] = '1000000000/1000000000'
+    import app as serial_app
+
+    client = serial_app.app.test_client()
+    limiter = serial_app.rate_limiter
+
+    def run():
+        started = time.perf_counter()
+        for _ in range(requests):
+            client.get('/api/check-serial/AAAA-BBBB-CCCC-DDDD')
+        return (time.perf_counter() - started) / requests * 1e6
+
+    run()  # ısınma
+    with_limiter = run()
+    serial_app.rate_limiter = None
+    without_limiter = run()
+    serial_app.rate_limiter = limiter
+    print(f"{'istek (sınırlayıcı açık)':<28} {with_limiter:>8.2f}µs/istek")
+    print(f"{'istek (sınırlayıcı kapalı)':<28} {without_limiter:>8.2f}µs/istek")
+    print(f"{'ek maliyet':<28} {with_limiter - without_limiter:>8.2f}µs/istek")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=100_000)
+    parser.add_argument('--clients', type=int, default=10_000)
+    parser.add_argument('--requests', type=int, default=5_000)
+    args = parser.parse_args()
+
+    bench_check("bellek", MemoryBucketBackend(), args.calls, args.clients)
+    bench_check("bellek (LRU taşmalı)", MemoryBucketBackend(max_buckets=args.clients // 2), args.calls, args.clients)
+    sqlite_calls = max(1, args.calls // 10)
+    bench_check("sqlite", SQLiteBucketBackend(os.path.join(tempfile.mkdtemp(), 'bench.db')),
+                sqlite_calls, args.clients)
+    bench_requests(args.requests)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Eşzamanlı kullanım sayacı stres testi.
+
+N thread'i tek bir serial key'e ve çok sayıda serial key'e yönlendirir,
+saniyedeki redeem sayısını ve limit aşımını (overshoot) raporlar.
+Overshoot her zaman 0 olmalıdır.
+
+Kullanım:
+    python benchmarks/bench_redeem.py --threads 16 --attempts 2000 --backend sqlite
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from store import create_store  # noqa: E402
+
+
+def make_key(index):
+    """Sıra numarasından geçerli formatta serial key üretir"""
+    digits = f"{index:016d}"
+    return '-'.join(digits[i:i + 4] for i in range(0, 16, 4))
+
+
+def seed(store, key_count, max_uses):
+    keys = [make_key(i) for i in range(key_count)]
+    for serial_key in keys:
+        store.add({
+            "serial_key": serial_key,
+            "created_at": datetime.now().isoformat(),
+            "is_active": True,
+            "description": "benchmark",
+            "expiry_date": None,
+            "max_uses": max_uses,
+            "current_uses": 0
+        })
+    return keys
+
+
+def run(store, keys, threads, attempts):
+    """Her thread `attempts` kez redeem dener; anahtar başına başarıları sayar"""
+    successes = [dict() for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(worker_id):
+        counts = successes[worker_id]
+        key_count = len(keys)
+        barrier.wait()
+        for i in range(attempts):
+            serial_key = keys[(worker_id + i) % key_count]
+            if store.redeem(serial_key) is not None:
+                counts[serial_key] = counts.get(serial_key, 0) + 1
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    totals = {}
+    for counts in successes:
+        for serial_key, count in counts.items():
+            totals[serial_key] = totals.get(serial_key, 0) + count
+    return totals, elapsed
+
+
+def scenario(name, backend, key_count, max_uses, threads, attempts):
+    tmpdir = tempfile.mkdtemp()
+    store = create_store(backend, os.path.join(tmpdir, 'bench.db'))
+    keys = seed(store, key_count, max_uses)
+    totals, elapsed = run(store, keys, threads, attempts)
+
+    overshoot = 0
+    for serial_key in keys:
+        stored = store.get(serial_key)['current_uses']
+        redeemed = totals.get(serial_key, 0)
+        # Limitin üzerindeki başarılar ve depoya yansımayan/kaybolan artışlar
+        overshoot += max(0, redeemed - max_uses) + abs(stored - redeemed)
+
+    total_attempts = threads * attempts
+    print(f"{name:<10} backend={backend:<6} threads={threads:<3} keys={key_count:<6} "
+          f"attempts={total_attempts:<8} redeemed={sum(totals.values()):<8} "
+          f"throughput={total_attempts / elapsed:>10.0f}/s overshoot={overshoot}")
+    return overshoot
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--attempts', type=int, default=2000, help="thread başına redeem denemesi")
+    parser.add_argument('--keys', type=int, default=1000, help="çok anahtarlı senaryodaki anahtar sayısı")
+    parser.add_argument('--max-uses', type=int, default=100)
+    parser.add_argument('--backend', choices=['memory', 'sqlite', 'all'], default='all')
+    args = parser.parse_args()
+
+    backends = ['memory', 'sqlite'] if args.backend == 'all' else [args.backend]
+    overshoot = 0
+    for backend in backends:
+        overshoot += scenario("tek-anahtar", backend, 1, args.max_uses, args.threads, args.attempts)
+        overshoot += scenario("çok-anahtar", backend, args.keys, args.max_uses, args.threads, args.attempts)
+
+    if overshoot:
+        print(f"❌ Limit aşımı tespit edildi: {overshoot}")
+        sys.exit(1)
+    print("✅ Limit aşımı yok")
+
+
+if __name__ == '__main__':
+    main()
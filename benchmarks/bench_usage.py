@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Senkron ve gecikmeli (USAGE_ACCOUNTING=async) kullanım sayacının karşılaştırması.
+
+SQLite deposunda N thread, log-düzgün dağılımla seçilen key'leri redeem eder.
+Senkron modda her başarılı redeem bir UPDATE transaction'ıdır; async modda
+artışlar key başına birleştirilip toplu yazılır. Her mod için saniyedeki
+redeem, depoya yapılan yazma transaction'ı ve satır güncellemesi sayısı ile
+kazanılan yazma oranı raporlanır. Sonunda depodaki toplam kullanımın
+ayrılan kullanımla eşit olduğu (kayıp ve limit aşımı olmadığı) denetlenir.
+
+Kullanım:
+    python benchmarks/bench_usage.py --keys 10000 --threads 8 --seconds 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_redeem import make_key  # noqa: E402
+from store import SQLiteKeyStore  # noqa: E402
+from usage import UsageAccountant  # noqa: E402
+
+
+class CountingStore(SQLiteKeyStore):
+    """Yazma transaction'larını ve güncellenen satırları sayan SQLite deposu"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.transactions = 0
+        self.rows = 0
+        self._count_lock = threading.Lock()
+
+    def _counted(self, rows):
+        with self._count_lock:
+            self.transactions += 1
+            self.rows += rows
+
+    def redeem(self, serial_key):
+        record = super().redeem(serial_key)
+        self._counted(1 if record is not None else 0)
+        return record
+
+    def add_uses_many(self, counts):
+        super().add_uses_many(counts)
+        self._counted(len(counts))
+
+
+def seed(store, count, max_uses):
+    created_at = datetime.now().isoformat()
+    store.add_many({
+        "serial_key": make_key(i),
+        "created_at": created_at,
+        "is_active": True,
+        "description": "benchmark",
+        "expiry_date": None,
+        "max_uses": max_uses,
+        "current_uses": 0
+    } for i in range(count))
+
+
+def run(redeemer, keys, threads, seconds):
+    """Süre boyunca redeem eder; (başarılı redeem sayısı, geçen süre) döndürür"""
+    deadline = time.perf_counter() + seconds
+    counts = [0] * threads
+
+    def worker(index):
+        rng = random.Random(index)
+        redeemed = 0
+        while time.perf_counter() < deadline:
+            for _ in range(100):
+                if redeemer.redeem(keys[int(len(keys) ** rng.random()) - 1]) is not None:
+                    redeemed += 1
+        counts[index] = redeemed
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sum(counts), time.perf_counter() - started
+
+
+def total_uses(store):
+    return store._connection().execute("SELECT SUM(current_uses) FROM serial_keys").fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--keys', type=int, default=10_000, help="depodaki key sayısı")
+    parser.add_argument('--max-uses', type=int, default=1000, help="key başına kullanım limiti")
+    parser.add_argument('--threads', type=int, default=8, help="eşzamanlı thread sayısı")
+    parser.add_argument('--seconds', type=float, default=5, help="mod başına ölçüm süresi")
+    parser.add_argument('--flush-interval', type=float, default=1.0, help="async toplu yazma aralığı (sn)")
+    parser.add_argument('--flush-size', type=int, default=10_000, help="async toplu yazma boyutu")
+    args = parser.parse_args()
+    keys = [make_key(i) for i in range(args.keys)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in ('sync', 'async'):
+            store = CountingStore(os.path.join(directory, f'{mode}.db'))
+            seed(store, args.keys, args.max_uses)
+            redeemer = store
+            if mode == 'async':
+                redeemer = UsageAccountant(store, args.flush_interval, args.flush_size)
+            redeemed, elapsed = run(redeemer, keys, args.threads, args.seconds)
+            if mode == 'async':
+                # Kapanıştaki son yazım da sayılır; çökmede kaybolabilecek en fazla bu kadardır
+                unflushed = redeemer.pending()
+                redeemer.close()
+            stored = total_uses(store)
+            assert stored == redeemed, (stored, redeemed)
+            saved = 1 - store.rows / redeemed if redeemed else 0
+            extra = f"  kapanışta bekleyen={unflushed}" if mode == 'async' else ""
+            print(f"{mode:<6} redeem/s={redeemed / elapsed:>9,.0f}  "
+                  f"yazma transaction/s={store.transactions / elapsed:>8,.0f}  "
+                  f"satır güncellemesi/s={store.rows / elapsed:>9,.0f}  kazanılan yazma=%{saved * 100:.1f}{extra}")
+            store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Kullanım harcamayan sorgulamada (consume=false) sonuç önbelleğinin etkisi.
+
+Aynı key'lerin tekrar tekrar doğrulandığı (ör. uygulama açılışı) senaryoda
+check_serial_result'ın çağrı başına CPU süresi önbellek kapalı ve açıkken
+ölçülür. Zipf benzeri dağılımda farklı önbellek boyutları için isabet oranı
+ve çıkarma sayısı raporlanır.
+
+Kullanım:
+    python benchmarks/bench_verdict.py --keys 100000 --requests 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('EXPIRY_SWEEP_INTERVAL', '0')
+os.environ.setdefault('RATE_LIMIT_ENABLED', '0')
+os.environ.setdefault('METRICS_ENABLED', '0')
+
+import app as serial_app  # noqa: E402
+from bench_redeem import make_key  # noqa: E402
+from cache import VerdictCache  # noqa: E402
+
+
+def seed(count):
+    created_at = datetime.now().isoformat()
+    inserted = serial_app.key_store.add_many({
+        "serial_key": make_key(i),
+        "created_at": created_at,
+        "is_active": True,
+        "description": "benchmark",
+        "expiry_date": "2099-01-01T00:00:00",
+        "max_uses": 10 ** 9,
+        "current_uses": 0
+    } for i in range(count))
+    serial_app.remember_serial_keys(record.serial_key for record in inserted)
+
+
+def cpu_per_call(keys):
+    started = time.process_time()
+    for serial_key in keys:
+        serial_app.check_serial_result(serial_key, False)
+    return (time.process_time() - started) / len(keys) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--keys', type=int, default=100_000, help="depodaki key sayısı")
+    parser.add_argument('--requests', type=int, default=200_000, help="sorgu sayısı")
+    parser.add_argument('--sizes', default='1000,10000,100000', help="virgülle ayrılmış önbellek boyutları")
+    args = parser.parse_args()
+
+    seed(args.keys)
+    rng = random.Random(1)
+    # Log-düzgün dağılım: az sayıda key sorguların çoğunu alır, kuyruk tüm depoya yayılır
+    requests = [make_key(int(args.keys ** rng.random()) - 1) for _ in range(args.requests)]
+    hot = requests[:1000] * (args.requests // 1000)
+
+    serial_app.verdict_cache = None
+    print(f"tekrarlanan 1000 key: önbelleksiz={cpu_per_call(hot):.1f}µs", end="  ")
+    serial_app.verdict_cache = VerdictCache(10_000, 60)
+    cpu_per_call(hot)
+    print(f"önbellekli={cpu_per_call(hot):.1f}µs")
+
+    for size in (int(size) for size in args.sizes.split(',')):
+        cache = serial_app.verdict_cache = VerdictCache(size, 60)
+        elapsed = cpu_per_call(requests)
+        print(f"boyut={size:<7} isabet oranı={cache.hit_ratio():.3f}  çıkarma={cache.evictions:<7} "
+              f"ortalama={elapsed:.1f}µs")
+
+
+if __name__ == '__main__':
+    main()
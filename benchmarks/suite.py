@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Serial Key API benchmark paketi.
+
+Uygulamayı süreç içinde (app.test_client()) ve yerelde başlatılan bir WSGI
+sunucusu üzerinden çalıştırır. Her senaryo için saniyedeki işlem sayısı ve
+p50/p95/p99 gecikmeleri raporlanır; sonuçlar JSON olarak kaydedilir ve
+önceki bir sonuç dosyasıyla karşılaştırılabilir.
+
+Kullanım:
+    python benchmarks/suite.py
+    python benchmarks/suite.py --sizes 1000,100000,1000000 --backend sqlite
+    python benchmarks/suite.py --compare benchmarks/results/onceki.json --fail-on-regression
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import platform
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+
+def summarize(samples, elapsed=None):
+    """Mikrosaniye örneklerinden throughput ve yüzdelikleri hesaplar"""
+    ordered = sorted(samples)
+    count = len(ordered)
+
+    def percentile(fraction):
+        return round(ordered[min(count - 1, int(count * fraction))], 2)
+
+    total = elapsed if elapsed is not None else sum(ordered) / 1e6
+    return {
+        "count": count,
+        "throughput": round(count / total, 1) if total else None,
+        "p50_us": percentile(0.50),
+        "p95_us": percentile(0.95),
+        "p99_us": percentile(0.99)
+    }
+
+
+def timed(count, operation):
+    """operation(i) çağrılarını tek tek zamanlar"""
+    samples = []
+    started = time.perf_counter()
+    for i in range(count):
+        call_started = time.perf_counter()
+        operation(i)
+        samples.append((time.perf_counter() - call_started) * 1e6)
+    return summarize(samples, time.perf_counter() - started)
+
+
+def make_records(serial_app, count, max_uses=1):
+    created_at = datetime.now().isoformat()
+    for start in range(0, count, 10_000):
+        yield [{
+            "serial_key": serial_key,
+            "created_at": created_at,
+            "is_active": True,
+            "description": f"benchmark {start // 10_000}",
+            "expiry_date": None,
+            "max_uses": max_uses,
+            "current_uses": 0
+        } for serial_key in serial_app.generate_serial_keys(min(10_000, count - start))]
+
+
+def reset_store(serial_app, args, size, max_uses=1):
+    """Uygulamanın deposunu size adet key ile yeniden doldurur; key listesini döndürür"""
+    from store import create_store
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    serial_app.key_store = create_store(args.backend, path)
+    keys = []
+    for batch in make_records(serial_app, size, max_uses):
+        keys.extend(key_info['serial_key'] for key_info in serial_app.key_store.add_many(batch))
+    if serial_app.bloom_filter is not None:
+        serial_app.rebuild_bloom_filter()
+    return keys
+
+
+def admin_headers(client):
+    response = client.post('/api/admin/login', json={"password": os.environ['ADMIN_PASSWORD']})
+    return {"Authorization": f"Bearer {response.get_json()['data']['token']}"}
+
+
+def bench_keygen(serial_app, args):
+    results = {}
+    count = args.requests * 10
+    started = time.perf_counter()
+    serial_app.generate_serial_keys(count)
+    elapsed = time.perf_counter() - started
+    results['keygen.batch'] = {"count": count, "throughput": round(count / elapsed, 1)}
+    results['keygen.single'] = timed(args.requests, lambda i: serial_app.generate_serial_key())
+    return results
+
+
+def bench_check(serial_app, client, args):
+    results = {}
+    keys = reset_store(serial_app, args, args.keys, max_uses=10 ** 9)
+    misses = serial_app.generate_serial_keys(args.requests)
+    hit_count = len(keys)
+    for _ in range(100):
+        client.get(f'/api/check-serial/{keys[0]}')  # ısınma
+    results['check.hit'] = timed(args.requests, lambda i: client.get(f'/api/check-serial/{keys[i % hit_count]}'))
+    results['check.miss'] = timed(args.requests, lambda i: client.get(f'/api/check-serial/{misses[i]}'))
+    batch = [keys[i % hit_count] for i in range(1000)]
+    results['check.batch1000'] = timed(max(1, args.requests // 100), lambda i: client.post(
+        '/api/check-serials', json={"serial_keys": batch, "consume": False}))
+
+    # Metrik toplamanın istek başına maliyeti
+    serial_app.metrics.enabled = False
+    results['check.hit.no_metrics'] = timed(args.requests, lambda i: client.get(f'/api/check-serial/{keys[i % hit_count]}'))
+    serial_app.metrics.enabled = True
+    return results
+
+
+def bench_add(serial_app, client, args):
+    reset_store(serial_app, args, 0)
+    headers = admin_headers(client)
+    return {'add.single': timed(args.requests, lambda i: client.post('/api/add-serial', headers=headers, json={}))}
+
+
+def bench_list(serial_app, client, args):
+    results = {}
+    headers = admin_headers(client)
+    for size in args.sizes:
+        reset_store(serial_app, args, size)
+        pages = max(1, min(200, args.requests // 10))
+        results[f'list.page100.{size}'] = timed(pages, lambda i: client.post(
+            '/api/list-serials', headers=headers, json={"limit": 100}))
+        results[f'list.filtered.{size}'] = timed(pages, lambda i: client.post(
+            '/api/list-serials', headers=headers, json={"limit": 100, "description_contains": "benchmark 0"}))
+
+        started = time.perf_counter()
+        response = client.post('/api/list-serials', headers=headers, json={"format": "ndjson"}, buffered=False)
+        rows = sum(chunk.count(b'\n') for chunk in response.response)
+        elapsed = time.perf_counter() - started
+        results[f'list.export.{size}'] = {"count": rows, "throughput": round(rows / elapsed, 1)}
+    return results
+
+
+def bench_redeem(args):
+    from bench_redeem import run, seed
+    from store import create_store
+    results = {}
+    for name, key_count in (('redeem.one_key', 1), ('redeem.many_keys', 1000)):
+        store = create_store(args.backend, os.path.join(tempfile.mkdtemp(), 'bench.db'))
+        max_uses = args.threads * args.requests // 4
+        keys = seed(store, key_count, max_uses)
+        totals, elapsed = run(store, keys, args.threads, args.requests)
+        overshoot = sum(max(0, redeemed - max_uses) for redeemed in totals.values())
+        attempts = args.threads * args.requests
+        results[name] = {"count": attempts, "throughput": round(attempts / elapsed, 1), "overshoot": overshoot}
+    return results
+
+
+def bench_server(serial_app, args):
+    """Yerel threaded WSGI sunucusu üzerinden eşzamanlı check-serial (werkzeug her istekte bağlantıyı kapatır)"""
+    from werkzeug.serving import make_server
+
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    keys = reset_store(serial_app, args, args.keys, max_uses=10 ** 9)
+    server = make_server('127.0.0.1', 0, serial_app.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_port
+    results = {}
+    try:
+        for name, paths in (('server.check.hit', [f'/api/check-serial/{key}' for key in keys]),
+                            ('server.check.miss', [f'/api/check-serial/{key}'
+                                                   for key in serial_app.generate_serial_keys(args.requests)])):
+            samples = [[] for _ in range(args.threads)]
+            per_thread = max(1, args.requests // args.threads)
+
+            def worker(worker_id):
+                conn = http.client.HTTPConnection('127.0.0.1', port)
+                for i in range(per_thread):
+                    started = time.perf_counter()
+                    conn.request('GET', paths[(worker_id * per_thread + i) % len(paths)])
+                    conn.getresponse().read()
+                    samples[worker_id].append((time.perf_counter() - started) * 1e6)
+                conn.close()
+
+            started = time.perf_counter()
+            workers = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+            for worker_thread in workers:
+                worker_thread.start()
+            for worker_thread in workers:
+                worker_thread.join()
+            results[name] = summarize([s for part in samples for s in part], time.perf_counter() - started)
+    finally:
+        server.shutdown()
+    return results
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _start_node(port, env):
+    """server.py'yi ayrı süreçte başlatır ve /health yanıt verene kadar bekler"""
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT_DIR, 'server.py'), '--bind', f'127.0.0.1:{port}',
+                                '--workers', '1'], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/health')
+            conn.getresponse().read()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"127.0.0.1:{port} başlatılamadı")
+
+
+def _http(port, method, path, body=None):
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    conn.request(method, path, json.dumps(body) if body is not None else None, {"Content-Type": "application/json"})
+    response = conn.getresponse()
+    data = response.read()
+    conn.close()
+    return response.status, data
+
+
+def bench_replication(args):
+    """Yerel primary ve replika süreçleri: eklenen key'in replikada görünme gecikmesi ve iletilen kullanım"""
+    password = os.environ['ADMIN_PASSWORD']
+    env = dict(os.environ, SERIAL_STORE_BACKEND='memory', REPLICATION_TOKEN=secrets.token_hex(16))
+    primary_port, replica_port = _free_port(), _free_port()
+    primary = _start_node(primary_port, env)
+    replica = None
+    results = {}
+    try:
+        replica = _start_node(replica_port, dict(env, REPLICA_OF=f'http://127.0.0.1:{primary_port}'))
+        count = max(1, args.requests // 10)
+        _, data = _http(primary_port, 'POST', '/api/add-serials/bulk',
+                        {"password": password, "count": args.keys, "max_uses": 10 ** 9, "format": "ndjson"})
+        hot_keys = [json.loads(line)['serial_key'] for line in data.splitlines()[:1000]]
+        stop = threading.Event()
+
+        def load(worker_id):
+            # Primary'de sürekli kullanım: akışa saniyede binlerce redeem olayı yazılır
+            conn = http.client.HTTPConnection('127.0.0.1', primary_port)
+            i = worker_id
+            while not stop.is_set():
+                conn.request('GET', f'/api/check-serial/{hot_keys[i % len(hot_keys)]}')
+                conn.getresponse().read()
+                i += args.threads
+
+        def visibility():
+            samples = []
+            for _ in range(count):
+                _, data = _http(primary_port, 'POST', '/api/add-serial', {"password": password})
+                serial_key = json.loads(data)['data']['serial_key']
+                started = time.perf_counter()
+                while _http(replica_port, 'GET', f'/api/check-serial/{serial_key}?consume=false')[0] != 200:
+                    pass
+                samples.append((time.perf_counter() - started) * 1e6)
+            return summarize(samples)
+
+        results['replication.visibility.idle'] = visibility()
+        loaders = [threading.Thread(target=load, args=(i,)) for i in range(max(1, args.threads - 1))]
+        for thread in loaders:
+            thread.start()
+        try:
+            results['replication.visibility.loaded'] = visibility()
+            _, data = _http(replica_port, 'GET', '/metrics')
+            lag = [line for line in data.decode().splitlines() if line.startswith('serial_api_replication_lag_events')]
+        finally:
+            stop.set()
+            for thread in loaders:
+                thread.join()
+        if lag:
+            results['replication.visibility.loaded']['lag_events'] = float(lag[0].split()[-1])
+        for name, port in (('replication.redeem.primary', primary_port), ('replication.redeem.forwarded', replica_port)):
+            results[name] = timed(count, lambda i: _http(port, 'GET', f'/api/check-serial/{hot_keys[i % len(hot_keys)]}'))
+    finally:
+        for process in (replica, primary):
+            if process is not None:
+                process.terminate()
+                process.wait(30)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, meta, previous_path, threshold):
+    """Önceki sonuçlarla karşılaştırır; gerileme sayısını döndürür"""
+    with open(previous_path) as f:
+        previous_report = json.load(f)
+    previous = previous_report['results']
+    regressions = 0
+    print(f"\nKarşılaştırma: {previous_path} @ {previous_report['meta'].get('commit')} (eşik %{threshold * 100:.0f})")
+    for field in ('backend', 'requests', 'keys', 'threads'):
+        if previous_report['meta'].get(field) != meta[field]:
+            print(f"  ⚠️  {field} farklı: {previous_report['meta'].get(field)} → {meta[field]}")
+    for name, result in current.items():
+        before = previous.get(name)
+        if not before:
+            continue
+        changes = []
+        if result.get('throughput') and before.get('throughput'):
+            change = result['throughput'] / before['throughput'] - 1
+            changes.append(f"throughput {change:+.1%}")
+            if change < -threshold:
+                regressions += 1
+                changes[-1] += " ❌"
+        if result.get('p99_us') and before.get('p99_us'):
+            change = result['p99_us'] / before['p99_us'] - 1
+            changes.append(f"p99 {change:+.1%}")
+            if change > threshold:
+                regressions += 1
+                changes[-1] += " ❌"
+        print(f"  {name:<28} {', '.join(changes)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=['memory', 'sqlite'], default='memory')
+    parser.add_argument('--requests', type=int, default=2_000, help="senaryo başına istek sayısı")
+    parser.add_argument('--keys', type=int, default=10_000, help="check-serial senaryolarındaki key sayısı")
+    parser.add_argument('--sizes', default='1000,100000', help="list-serials senaryolarındaki depo boyutları")
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--only', help="virgülle ayrılmış senaryo grupları: keygen,check,add,list,redeem,server,replication")
+    parser.add_argument('--output', help="sonuç dosyası (varsayılan benchmarks/results/<zaman>-<commit>.json)")
+    parser.add_argument('--compare', help="karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument('--threshold', type=float, default=0.10, help="gerileme eşiği (0.10 = %%10)")
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+    args.sizes = [int(size) for size in args.sizes.split(',') if size]
+
+    os.environ['SERIAL_STORE_BACKEND'] = args.backend
+    os.environ['SERIAL_DB_PATH'] = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ['EXPIRY_SWEEP_INTERVAL'] = '0'
+    os.environ['RATE_LIMIT_ENABLED'] = '0'
+    os.environ.setdefault('ADMIN_PASSWORD', 'admin123')
+    import app as serial_app
+
+    client = serial_app.app.test_client()
+    groups = {
+        'keygen': lambda: bench_keygen(serial_app, args),
+        'check': lambda: bench_check(serial_app, client, args),
+        'add': lambda: bench_add(serial_app, client, args),
+        'list': lambda: bench_list(serial_app, client, args),
+        'redeem': lambda: bench_redeem(args),
+        'server': lambda: bench_server(serial_app, args),
+        'replication': lambda: bench_replication(args)
+    }
+    selected = args.only.split(',') if args.only else list(groups)
+
+    results = {}
+    for group in selected:
+        group_results = groups[group]()
+        for name, result in group_results.items():
+            details = ' '.join(f"{key}={value}" for key, value in result.items())
+            print(f"{name:<28} {details}")
+        results.update(group_results)
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "commit": commit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "requests": args.requests,
+            "keys": args.keys,
+            "sizes": args.sizes,
+            "threads": args.threads
+        },
+        "results": results
+    }
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'nogit'}.json")
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📁 Sonuçlar kaydedildi: {output}")
+
+    if args.compare:
+        regressions = compare(results, report['meta'], args.compare, args.threshold)
+        if regressions and args.fail_on_regression:
+            print(f"❌ {regressions} gerileme tespit edildi")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
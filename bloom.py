@@ -0,0 +1,92 @@
+"""
+Negatif sorgular için Bloom filtresi.
+
+Filtre "kesinlikle yok" cevabını depoya gitmeden verir; "olabilir" cevabında
+depo yine sorgulanır. Yanlış pozitif oranı kapasite ve hedef orana göre
+boyutlandırılır, gözlenen oran istatistiklerde raporlanır.
+"""
+
+import hashlib
+import math
+import threading
+
+
+class BloomFilter:
+    """Bit dizisi üzerinde çift hash'leme kullanan Bloom filtresi"""
+
+    def __init__(self, capacity, fp_rate=0.01):
+        self.capacity = max(1, capacity)
+        self.fp_rate = fp_rate
+        self.size = max(8, int(math.ceil(-self.capacity * math.log(fp_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, int(round(self.size / self.capacity * math.log(2))))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+        # Gözlenen oran: filtre "olabilir" dedi, depo "yok" dedi
+        self.negatives = 0
+        self.maybes = 0
+        self.false_positives = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        size = self.size
+        return [(first + i * second) % size for i in range(self.hash_count)]
+
+    def add(self, key):
+        bits = self._bits
+        with self._lock:
+            for position in self._positions(key):
+                bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def add_many(self, keys):
+        """Anahtarları tek kilitle ekler (açılıştaki yeniden kurulum için, add'in döngü içi hali)"""
+        bits = self._bits
+        size = self.size
+        steps = range(self.hash_count)
+        blake2b = hashlib.blake2b
+        from_bytes = int.from_bytes
+        added = 0
+        with self._lock:
+            for key in keys:
+                digest = blake2b(key.encode(), digest_size=16).digest()
+                first = from_bytes(digest[:8], 'little')
+                second = from_bytes(digest[8:], 'little') | 1
+                for i in steps:
+                    position = (first + i * second) % size
+                    bits[position >> 3] |= 1 << (position & 7)
+                added += 1
+            self.count += added
+
+    def __contains__(self, key):
+        bits = self._bits
+        for position in self._positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                self.negatives += 1
+                return False
+        self.maybes += 1
+        return True
+
+    def record_false_positive(self):
+        """Filtrenin "olabilir" dediği ama depoda bulunmayan anahtarı kaydeder"""
+        self.false_positives += 1
+
+    def estimated_fp_rate(self):
+        """Mevcut doluluğa göre teorik yanlış pozitif oranı"""
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+    def stats(self):
+        absent = self.negatives + self.false_positives
+        return {
+            "capacity": self.capacity,
+            "keys": self.count,
+            "size_bytes": len(self._bits),
+            "hash_count": self.hash_count,
+            "target_fp_rate": self.fp_rate,
+            "estimated_fp_rate": round(self.estimated_fp_rate(), 6),
+            "observed_fp_rate": round(self.false_positives / absent, 6) if absent else 0.0,
+            "negatives": self.negatives,
+            "false_positives": self.false_positives
+        }
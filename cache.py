@@ -0,0 +1,134 @@
+"""
+Okuma ağırlıklı endpoint'ler için yanıt önbelleği.
+
+JSON gövdesi bir kez kodlanıp ETag ile birlikte saklanır. Statik yanıtlar hiç
+yeniden üretilmez; sayı içeren yanıtlar TTL dolduğunda veya depo sürümü
+değiştiğinde yeniden üretilir. If-None-Match eşleşirse gövdesiz 304 döner.
+
+VerdictCache, kullanım hakkı harcamayan sorgulamaların sonuçlarını serial key
+başına kısa süreliğine saklar.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response, json, request
+
+
+class JSONResponseCache:
+    """Önceden kodlanmış JSON yanıtı ve ETag'i"""
+
+    def __init__(self, builder, ttl=None, version=None, cache_control='no-cache'):
+        self.builder = builder
+        self.ttl = ttl
+        self.version = version
+        self.cache_control = cache_control
+        self._entry = None
+
+    def _is_fresh(self, entry):
+        _, _, built_at, built_version = entry
+        if self.ttl is not None and time.monotonic() - built_at >= self.ttl:
+            return False
+        if self.version is not None and self.version() != built_version:
+            return False
+        return True
+
+    def get(self):
+        """Geçerli (gövde, etag) çiftini döndürür, gerekirse yeniden üretir"""
+        entry = self._entry
+        if entry is None or not self._is_fresh(entry):
+            # Sürüm, gövde üretilmeden önce okunur: arada gelen değişiklik bir sonraki istekte yakalanır
+            built_version = self.version() if self.version is not None else None
+            body = (json.dumps(self.builder()) + "\n").encode()
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()
+            entry = (body, etag, time.monotonic(), built_version)
+            self._entry = entry
+        return entry[0], entry[1]
+
+    def invalidate(self):
+        self._entry = None
+
+    def response(self):
+        """İsteğin If-None-Match başlığına göre 200 veya 304 yanıtı üretir"""
+        body, etag = self.get()
+        headers = {"ETag": etag, "Cache-Control": self.cache_control}
+        if request.if_none_match.contains(etag.strip('"')):
+            return Response(status=304, headers=headers)
+        return Response(body, mimetype='application/json', headers=headers)
+
+
+class VerdictCache:
+    """Serial key doğrulama sonuçları için boyut sınırlı LRU/TTL önbelleği"""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Her geçersizlemede artar: hesaplama sırasında geçersizlenen sonuç saklanmaz
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """Süresi dolmamış sonucu döndürür, yoksa None"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, deadline = entry
+                if deadline > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value, generation, max_age=None):
+        """Sonucu saklar; generation okunduktan sonra geçersizleme olduysa veya max_age dolmuşsa saklamaz"""
+        ttl = self.ttl if max_age is None else min(self.ttl, max_age)
+        if ttl <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, keys):
+        """Verilen key'lerin sonuçlarını siler"""
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio(),
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
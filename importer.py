@@ -0,0 +1,229 @@
+"""
+Serial key'lerin CSV/NDJSON dosyalarından toplu içe aktarımı.
+
+Girdi satır satır okunur. Satırlar parti (chunk) halinde doğrulanır, parti
+içindeki tekrarlar ve depoda zaten bulunan key'ler tek geçişte ayıklanır ve
+her parti tek bir add_many çağrısıyla eklenir; bellek kullanımı parti
+boyutuyla sınırlıdır. Farklı partilerde tekrarlanan key'ler, önceki parti
+eklendiği için "zaten mevcut" olarak raporlanır.
+
+Alanlar list-serials dışa aktarmasıyla aynıdır (remaining_uses yok sayılır);
+dışa aktarılan dosya olduğu gibi geri yüklenebilir.
+"""
+
+import csv
+import gc
+import json
+from datetime import datetime
+
+from record import KeyRecord, created_timestamp
+from store import expiry_timestamp
+
+IMPORT_CHUNK_SIZE = 10_000
+
+_TRUE = {'true', '1', 'yes', 'evet'}
+_FALSE = {'false', '0', 'no', 'hayır'}
+
+
+def parse_csv(lines):
+    """CSV satırlarından (satır numarası, alanlar, hata) üretir; ilk satır başlıktır"""
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    if 'serial_key' not in header:
+        yield 1, None, "CSV başlığında serial_key sütunu yok"
+        return
+    # DictReader'dan hızlı: eksik sütunlar varsayılan değeri alır, fazlalar yok sayılır
+    for row in reader:
+        if row:
+            yield reader.line_num, dict(zip(header, row)), None
+
+
+def parse_ndjson(lines):
+    """NDJSON satırlarından (satır numarası, alanlar, hata) üretir; boş satırlar atlanır"""
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, None, "Geçersiz JSON"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Her satır bir JSON nesnesi olmalı"
+            continue
+        yield line_number, row, None
+
+
+PARSERS = {"csv": parse_csv, "ndjson": parse_ndjson}
+
+
+def _int_field(value, default, minimum):
+    """CSV metni veya JSON sayısını tam sayıya çevirir; geçersizse ValueError"""
+    if value is None or value == '':
+        return default
+    if isinstance(value, str):
+        value = int(value.strip())
+    if not isinstance(value, int) or isinstance(value, bool) or value < minimum:
+        raise ValueError
+    return value
+
+
+def _bool_field(value, default):
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError
+
+
+class KeyImporter:
+    """Satırları doğrulayıp parti halinde depoya ekler ve sayaçları tutar"""
+
+    def __init__(self, store, is_valid_key, chunk_size=IMPORT_CHUNK_SIZE, on_inserted=None, now=None):
+        self.store = store
+        self.is_valid_key = is_valid_key
+        self.chunk_size = chunk_size
+        self.on_inserted = on_inserted
+        self.now = now
+        self.rows = 0
+        self.imported = 0
+        self.duplicates = 0
+        self.existing = 0
+        self.invalid = 0
+        # Aynı son kullanma tarihi metni bir kez çözülür
+        self._expiry_cache = {}
+        self._last_created_at = None
+        self._last_created = None
+
+    def summary(self):
+        return {
+            "rows": self.rows,
+            "imported": self.imported,
+            "duplicates": self.duplicates,
+            "existing": self.existing,
+            "invalid": self.invalid
+        }
+
+    def run(self, parsed):
+        """parse_csv/parse_ndjson çıktısını işler; her parti için hata listesini üretir"""
+        chunk = []
+        for item in parsed:
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                yield self._commit(chunk)
+                chunk = []
+        if chunk:
+            yield self._commit(chunk)
+
+    def _expiry(self, expiry_date, now):
+        cached = self._expiry_cache.get(expiry_date)
+        if cached is None:
+            try:
+                expires_at = expiry_timestamp(expiry_date)
+                cached = (expires_at, None if expires_at > now else "Son kullanma tarihi geçmiş olamaz")
+            except (ValueError, TypeError, AttributeError):
+                cached = (None, "Geçersiz tarih formatı. ISO format kullanın: YYYY-MM-DDTHH:MM:SS")
+            self._expiry_cache[expiry_date] = cached
+        return cached
+
+    def _validate(self, row, default_created, now):
+        """Satırı KeyRecord'a çevirir; (kayıt, hata) döndürür"""
+        serial_key = row.get('serial_key')
+        if isinstance(serial_key, str):
+            serial_key = serial_key.upper().strip()
+        if not isinstance(serial_key, str) or not self.is_valid_key(serial_key):
+            return None, "Geçersiz serial key formatı"
+        try:
+            max_uses = _int_field(row.get('max_uses'), 1, 1)
+        except ValueError:
+            return None, "max_uses pozitif bir tam sayı olmalı"
+        try:
+            current_uses = _int_field(row.get('current_uses'), 0, 0)
+        except ValueError:
+            return None, "current_uses negatif olmayan bir tam sayı olmalı"
+        if current_uses > max_uses:
+            return None, "current_uses max_uses değerini aşamaz"
+        try:
+            is_active = _bool_field(row.get('is_active'), True)
+        except ValueError:
+            return None, "is_active true veya false olmalı"
+        description = row.get('description') or ''
+        if not isinstance(description, str):
+            return None, "description metin olmalı"
+        expiry_date = row.get('expiry_date') or None
+        expires_at = None
+        if expiry_date is not None:
+            expires_at, error = self._expiry(expiry_date, now)
+            if error:
+                return None, error
+        created = default_created
+        created_at = row.get('created_at')
+        if created_at:
+            # Dışa aktarılan dosyalarda ardışık satırlar çoğunlukla aynı oluşturma zamanını paylaşır
+            if created_at != self._last_created_at:
+                try:
+                    self._last_created = created_timestamp(created_at)
+                except (ValueError, TypeError):
+                    return None, "Geçersiz created_at"
+                self._last_created_at = created_at
+            created = self._last_created
+        return KeyRecord(serial_key, created, is_active, description, expiry_date, max_uses, current_uses,
+                         expires_at), None
+
+    def _commit(self, chunk):
+        """Partiyi doğrular, tekrarları ayıklar ve ekler; hatalı satırları döndürür"""
+        # Milyonlarca uzun ömürlü kayıt oluşturulurken çöp toplayıcının tekrar tekrar taraması önlenir
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._insert(chunk)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _insert(self, chunk):
+        now = self.now if self.now is not None else datetime.now().timestamp()
+        default_created = created_timestamp(datetime.now().isoformat())
+        errors = []
+        records = {}
+        lines = {}
+        for line_number, row, error in chunk:
+            self.rows += 1
+            if error is None:
+                record, error = self._validate(row, default_created, now)
+            if error is not None:
+                self.invalid += 1
+                serial_key = row.get('serial_key') if row else None
+                errors.append({"line": line_number, "serial_key": serial_key, "error": error})
+            elif record.serial_key in records:
+                self.duplicates += 1
+                errors.append({"line": line_number, "serial_key": record.serial_key,
+                               "error": "Serial key dosyada tekrarlanıyor"})
+            else:
+                records[record.serial_key] = record
+                lines[record.serial_key] = line_number
+
+        existing = self.store.existing_keys(records)
+        if existing:
+            for serial_key in existing:
+                del records[serial_key]
+        inserted = self.store.add_many(records.values()) if records else []
+        # Kontrol ile ekleme arasında başka bir istemcinin eklediği key'ler de mevcut sayılır
+        if len(inserted) != len(records):
+            existing = set(existing) | (records.keys() - {record.serial_key for record in inserted})
+        for serial_key in existing:
+            self.existing += 1
+            errors.append({"line": lines[serial_key], "serial_key": serial_key, "error": "Bu serial key zaten mevcut"})
+        self.imported += len(inserted)
+        if inserted and self.on_inserted is not None:
+            self.on_inserted(record.serial_key for record in inserted)
+        errors.sort(key=lambda error: error['line'])
+        return errors
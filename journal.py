@@ -0,0 +1,428 @@
+"""
+Bellek içi depo için önden yazmalı (write-ahead) günlük ve anlık görüntüler.
+
+Her değişiklik (ekleme, kullanım, deaktif etme, toplu güncelleme) CRC'li ikili bir kayıt olarak
+günlük segmentine eklenir. Kayıtlar arka plan thread'inde toplu yazılır; fsync
+politikası:
+
+    always    değişiklik, diske fsync edilene kadar dönmez (eşzamanlı
+              yazarlar tek fsync'i paylaşır: group commit)
+    interval  flush_interval saniyede bir yazılır ve fsync edilir (varsayılan)
+    never     flush_interval saniyede bir işletim sistemine yazılır, fsync yok
+
+Segment snapshot_bytes boyutunu aşınca depo kilitleri altında yeni segmente
+geçilir ve o ana kadarki durum sıkıştırılmış ikili anlık görüntü olarak
+yazılır; eski segmentler silinir. Açılışta son anlık görüntü ve sonrasındaki
+segmentler yeniden oynatılır. Anlık görüntü sütun tabanlıdır: sayısal alanlar
+ve zaman damgaları int64 dizileri, metin alanları JSON listeleri olarak
+saklanır; böylece milyonlarca kayıt kayıt başına ayrıştırma yapılmadan
+yüklenir.
+"""
+
+import json
+import logging
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+
+from record import KeyRecord
+
+logger = logging.getLogger(__name__)
+
+OP_ADD = 1
+OP_REDEEM = 2
+OP_DEACTIVATE = 3
+# Toplu güncellemede kaydın değişmiş hâli tam olarak yazılır
+OP_UPDATE = 4
+
+FSYNC_POLICIES = ('always', 'interval', 'never')
+
+# (bayraklar, oluşturma, max_uses, current_uses, expires_at, anahtar/son kullanma/açıklama uzunlukları)
+RECORD_HEADER = struct.Struct('<BqqqqHHI')
+FLAG_ACTIVE = 1
+FLAG_EXPIRY_DATE = 2
+FLAG_EXPIRES_AT = 4
+# Alanlar ikili şemaya uymuyorsa (ör. tam sayı olmayan max_uses) kayıt JSON olarak saklanır
+FLAG_JSON = 8
+
+# Günlük çerçevesi: (veri uzunluğu, crc32) + işlem kodu ve veri
+FRAME_HEADER = struct.Struct('<II')
+LENGTH = struct.Struct('<I')
+
+SNAPSHOT_MAGIC = b'SKSNAP03'
+# (segment, bölüm sayısı); her bölüm 8 baytlık uzunlukla başlar
+SNAPSHOT_HEADER = struct.Struct('<QI')
+SECTION_LENGTH = struct.Struct('<Q')
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+def _is_int64(value):
+    return isinstance(value, int) and not isinstance(value, bool) and INT64_MIN <= value <= INT64_MAX
+
+
+def _fits_columns(record):
+    """Kaydın alanlarının ikili şemaya sığıp sığmadığını döndürür"""
+    expires_at = record.expires_at
+    expiry_date = record.expiry_date
+    return (isinstance(record.serial_key, str) and isinstance(record.description, str)
+            and (expiry_date is None or isinstance(expiry_date, str))
+            and (expires_at is None or _is_int64(expires_at))
+            and _is_int64(record.max_uses) and _is_int64(record.current_uses))
+
+
+def _int64_column(values):
+    column = array('q', values)
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column.tobytes()
+
+
+def _read_int64_column(data):
+    column = array('q')
+    column.frombytes(data)
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column
+
+
+def encode_snapshot(records):
+    """Kayıtları anlık görüntü bölümlerine (sütunlara) çevirir"""
+    regular = []
+    irregular = []
+    for record in records:
+        (regular if _fits_columns(record) else irregular).append(record)
+    return [
+        bytes((FLAG_ACTIVE if record.is_active else 0)
+              | (FLAG_EXPIRES_AT if record.expires_at is not None else 0) for record in regular),
+        _int64_column([record.created for record in regular]),
+        _int64_column([record.max_uses for record in regular]),
+        _int64_column([record.current_uses for record in regular]),
+        _int64_column([record.expires_at or 0 for record in regular]),
+        json.dumps([record.serial_key for record in regular]).encode(),
+        json.dumps([record.expiry_date for record in regular]).encode(),
+        json.dumps([record.description for record in regular]).encode(),
+        json.dumps([record.to_dict() for record in irregular]).encode()
+    ]
+
+
+def decode_snapshot(sections):
+    """encode_snapshot bölümlerinden kayıt listesini üretir"""
+    flags, created, max_uses, current_uses, expires_at, serial_keys, expiry_dates, descriptions, irregular = sections
+    records = [
+        KeyRecord(serial_key, created_at, bool(flag & FLAG_ACTIVE), description, expiry_date, limit, uses,
+                  expires if flag & FLAG_EXPIRES_AT else None)
+        for serial_key, created_at, flag, description, expiry_date, limit, uses, expires in zip(
+            json.loads(serial_keys), _read_int64_column(created), flags, json.loads(descriptions),
+            json.loads(expiry_dates), _read_int64_column(max_uses), _read_int64_column(current_uses),
+            _read_int64_column(expires_at))
+    ]
+    records.extend(KeyRecord.from_dict(key_info) for key_info in json.loads(irregular))
+    return records
+
+
+def encode_record(record):
+    """Serial key kaydını günlük için ikili biçime çevirir"""
+    if _fits_columns(record):
+        expiry_date = record.expiry_date
+        expires_at = record.expires_at
+        flags = FLAG_ACTIVE if record.is_active else 0
+        if expiry_date is not None:
+            flags |= FLAG_EXPIRY_DATE
+        if expires_at is not None:
+            flags |= FLAG_EXPIRES_AT
+        key_bytes = record.serial_key.encode()
+        expiry_bytes = (expiry_date or '').encode()
+        description_bytes = record.description.encode()
+        try:
+            return RECORD_HEADER.pack(flags, record.created, record.max_uses, record.current_uses, expires_at or 0,
+                                      len(key_bytes), len(expiry_bytes), len(description_bytes)) \
+                + key_bytes + expiry_bytes + description_bytes
+        except struct.error:
+            pass
+    return bytes([FLAG_JSON]) + json.dumps(record.to_dict()).encode()
+
+
+def decode_record(buffer, offset=0, length=None):
+    """encode_record çıktısını kayda çevirir"""
+    if buffer[offset] & FLAG_JSON:
+        end = len(buffer) if length is None else offset + length
+        return KeyRecord.from_dict(json.loads(bytes(buffer[offset + 1:end])))
+    flags, created, max_uses, current_uses, expires_at, key_length, expiry_length, description_length = \
+        RECORD_HEADER.unpack_from(buffer, offset)
+    position = offset + RECORD_HEADER.size
+    serial_key = str(buffer[position:position + key_length], 'utf-8')
+    position += key_length
+    expiry_date = str(buffer[position:position + expiry_length], 'utf-8') if flags & FLAG_EXPIRY_DATE else None
+    position += expiry_length
+    description = str(buffer[position:position + description_length], 'utf-8')
+    return KeyRecord(serial_key, created, bool(flags & FLAG_ACTIVE), description, expiry_date, max_uses,
+                     current_uses, expires_at if flags & FLAG_EXPIRES_AT else None)
+
+
+class Journal:
+    """Segmentli, group commit destekli değişiklik günlüğü"""
+
+    def __init__(self, directory, fsync='interval', flush_interval=0.05, snapshot_bytes=64 * 1024 * 1024):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Bilinmeyen fsync politikası: {fsync}")
+        self.directory = directory
+        self.fsync = fsync
+        self.flush_interval = flush_interval
+        self.snapshot_bytes = snapshot_bytes
+        # Segment büyüyünce çağrılır (depo anlık görüntü alır)
+        self.snapshot_handler = None
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._flushed = threading.Condition(self._lock)
+        self._io_lock = threading.Lock()
+        self._buffer = []
+        self._seq = 0
+        self._flushed_seq = 0
+        self._segment = None
+        self._segment_bytes = 0
+        self._file = None
+        self._thread = None
+        self._pid = None
+        self._closing = False
+        self._snapshotting = False
+        self.snapshots = 0
+
+    def _path(self, kind, segment):
+        extension = 'bin' if kind == 'snapshot' else 'log'
+        return os.path.join(self.directory, f'{kind}-{segment:08d}.{extension}')
+
+    def _list(self, kind):
+        segments = []
+        for name in os.listdir(self.directory):
+            prefix, _, rest = name.partition('-')
+            number, _, extension = rest.partition('.')
+            if prefix == kind and number.isdigit() and extension in ('bin', 'log'):
+                segments.append(int(number))
+        return sorted(segments)
+
+    def _read_snapshot(self, segment):
+        """Anlık görüntüyü okur; bozuksa None döner"""
+        with open(self._path('snapshot', segment), 'rb') as f:
+            data = f.read()
+        header_end = len(SNAPSHOT_MAGIC) + SNAPSHOT_HEADER.size
+        if len(data) < header_end + LENGTH.size or not data.startswith(SNAPSHOT_MAGIC):
+            return None
+        view = memoryview(data)
+        if zlib.crc32(view[len(SNAPSHOT_MAGIC):-LENGTH.size]) != LENGTH.unpack_from(data, len(data) - LENGTH.size)[0]:
+            return None
+        _, count = SNAPSHOT_HEADER.unpack_from(data, len(SNAPSHOT_MAGIC))
+        sections = []
+        position = header_end
+        for _ in range(count):
+            length = SECTION_LENGTH.unpack_from(data, position)[0]
+            position += SECTION_LENGTH.size
+            sections.append(data[position:position + length])
+            position += length
+        return decode_snapshot(sections)
+
+    def _read_segment(self, segment):
+        """Segmentteki (işlem, veri) kayıtlarını üretir; yarım kalan son kayıtta durur"""
+        with open(self._path('journal', segment), 'rb') as f:
+            data = f.read()
+        view = memoryview(data)
+        position = 0
+        while position + FRAME_HEADER.size <= len(data):
+            length, checksum = FRAME_HEADER.unpack_from(data, position)
+            start = position + FRAME_HEADER.size
+            frame = view[start:start + length]
+            if length == 0 or len(frame) < length or zlib.crc32(frame) != checksum:
+                break
+            yield frame[0], frame[1:]
+            position = start + length
+        if position < len(data):
+            logger.warning("Günlük segmenti %d içinde %d baytlık yarım kayıt atlandı", segment, len(data) - position)
+
+    def recover(self):
+        """Son geçerli anlık görüntünün kayıtlarını ve sonrasındaki günlük kayıtlarını döndürür"""
+        records = []
+        start = None
+        for segment in reversed(self._list('snapshot')):
+            snapshot = self._read_snapshot(segment)
+            if snapshot is not None:
+                records, start = snapshot, segment
+                break
+            logger.warning("Bozuk anlık görüntü atlandı: %s", self._path('snapshot', segment))
+        segments = [segment for segment in self._list('journal') if start is None or segment >= start]
+
+        def entries():
+            for segment in segments:
+                yield from self._read_segment(segment)
+
+        # Yeni yazımlar her zaman yeni bir segmente gider; yarım kalan kayıtlar sonrasına ekleme yapılmaz
+        last = max(segments + [start or 0])
+        self._segment = last + 1
+        return records, entries()
+
+    def _ensure_started(self):
+        # Fork sonrası thread'ler kopyalanmaz: dosya ve yazıcı thread yeni süreçte açılır
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        if self._segment is None:
+            self._segment = max(self._list('journal') + self._list('snapshot') + [0]) + 1
+        self._file = open(self._path('journal', self._segment), 'ab')
+        self._segment_bytes = self._file.tell()
+        self._closing = False
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='journal-writer', daemon=True)
+        self._thread.start()
+
+    def append(self, op, payload):
+        """Kaydı yazma kuyruğuna ekler; bekleme için sıra numarası döndürür"""
+        data = bytes([op]) + payload
+        frame = FRAME_HEADER.pack(len(data), zlib.crc32(data)) + data
+        with self._lock:
+            if self._pid != os.getpid():
+                self._ensure_started()
+            self._buffer.append(frame)
+            self._segment_bytes += len(frame)
+            self._seq += 1
+            if self.fsync == 'always':
+                self._wakeup.notify()
+            return self._seq
+
+    def wait(self, seq):
+        """always politikasında kaydın diske fsync edilmesini bekler"""
+        if self.fsync != 'always':
+            return
+        with self._lock:
+            while self._flushed_seq < seq and self._thread is not None:
+                self._flushed.wait()
+
+    def _write(self, frames):
+        self._file.write(b''.join(frames))
+        self._file.flush()
+        if self.fsync != 'never':
+            os.fsync(self._file.fileno())
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if self.fsync == 'always':
+                    while not self._buffer and not self._closing:
+                        self._wakeup.wait()
+                elif not self._closing:
+                    self._wakeup.wait(self.flush_interval)
+                closing = self._closing
+            with self._io_lock:
+                with self._lock:
+                    frames, self._buffer = self._buffer, []
+                    seq = self._seq
+                if frames:
+                    self._write(frames)
+            with self._lock:
+                self._flushed_seq = max(self._flushed_seq, seq)
+                self._flushed.notify_all()
+                snapshot_due = (self._segment_bytes >= self.snapshot_bytes and not self._snapshotting
+                                and self.snapshot_handler is not None and not closing)
+                if snapshot_due:
+                    self._snapshotting = True
+            if snapshot_due:
+                threading.Thread(target=self._snapshot, name='journal-snapshot', daemon=True).start()
+            if closing:
+                return
+
+    def _snapshot(self):
+        try:
+            self.snapshot_handler()
+        except Exception:
+            logger.exception("Anlık görüntü alınamadı")
+        finally:
+            with self._lock:
+                self._snapshotting = False
+
+    def rotate(self):
+        """Bekleyen kayıtları yazıp yeni segmente geçer; yeni segment numarasını döndürür.
+
+        Depo kilitleri altında çağrılır: döndürülen numara, o ana kadarki durumun
+        anlık görüntüsüne verilir.
+        """
+        with self._io_lock:
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._ensure_started()
+                frames, self._buffer = self._buffer, []
+                if frames:
+                    self._write(frames)
+                else:
+                    self._file.flush()
+                self._file.close()
+                self._segment += 1
+                self._file = open(self._path('journal', self._segment), 'ab')
+                self._segment_bytes = 0
+                self._flushed_seq = self._seq
+                self._flushed.notify_all()
+                return self._segment
+
+    def write_snapshot(self, segment, records):
+        """Kayıtları atomik olarak anlık görüntüye yazar ve artık gereksiz dosyaları siler"""
+        path = self._path('snapshot', segment)
+        temporary = path + '.tmp'
+        sections = encode_snapshot(records)
+        header = SNAPSHOT_HEADER.pack(segment, len(sections))
+        checksum = zlib.crc32(header)
+        with open(temporary, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(header)
+            for section in sections:
+                length = SECTION_LENGTH.pack(len(section))
+                checksum = zlib.crc32(section, zlib.crc32(length, checksum))
+                f.write(length)
+                f.write(section)
+            f.write(LENGTH.pack(checksum))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+        self._fsync_directory()
+        for old in self._list('journal'):
+            if old < segment:
+                os.remove(self._path('journal', old))
+        for old in self._list('snapshot'):
+            if old < segment:
+                os.remove(self._path('snapshot', old))
+        self.snapshots += 1
+        return len(records)
+
+    def _fsync_directory(self):
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def close(self):
+        """Bekleyen kayıtları yazar ve yazıcı thread'i durdurur"""
+        with self._lock:
+            thread = self._thread if self._pid == os.getpid() else None
+            self._closing = True
+            self._wakeup.notify_all()
+        if thread is not None:
+            thread.join()
+            self._file.close()
+        with self._lock:
+            self._thread = None
+            self._pid = None
+            self._flushed.notify_all()
+
+    def stats(self):
+        return {
+            "segment": self._segment,
+            "segment_bytes": self._segment_bytes,
+            "pending": len(self._buffer),
+            "fsync": self.fsync,
+            "snapshots": self.snapshots
+        }
@@ -0,0 +1,63 @@
+"""
+Hızlı JSON kodlama.
+
+orjson kuruluysa yanıtlar onunla, değilse standart kütüphane ile kodlanır
+(JSON_ENCODER=stdlib ile zorlanabilir). Çıktı her iki durumda da sıkıştırılmış
+ve anahtarları sıralıdır. orjson'ın desteklemediği değerler (ör. 64
+biti aşan tam sayılar) kodlanırken standart kütüphaneye düşülür. İstek
+gövdeleri standart kütüphaneyle çözülür: orjson büyük tam sayıları float'a
+çevirir.
+"""
+
+import json
+import os
+
+from flask.json.provider import DefaultJSONProvider
+
+JSON_ENCODER = os.environ.get('JSON_ENCODER', 'auto')
+
+orjson = None
+if JSON_ENCODER != 'stdlib':
+    try:
+        import orjson
+    except ImportError:
+        if JSON_ENCODER == 'orjson':
+            raise
+
+ENCODER_NAME = 'orjson' if orjson is not None else 'stdlib'
+
+_default = DefaultJSONProvider.default
+
+
+def _stdlib_dumps(obj):
+    # ensure_ascii=True standart kütüphanenin C kodlayıcısında daha hızlıdır
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), default=_default).encode()
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_SORT_KEYS
+
+    def dumps(obj):
+        """Nesneyi JSON baytlarına kodlar"""
+        try:
+            return orjson.dumps(obj, default=_default, option=_OPTIONS)
+        except orjson.JSONEncodeError:
+            return _stdlib_dumps(obj)
+else:
+    dumps = _stdlib_dumps
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify ve yanıt kodlaması için hızlı kodlayıcıyı kullanan Flask JSON sağlayıcısı"""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj).decode()
+
+    def response(self, *args, **kwargs):
+        # Debug modunda okunabilir (girintili) çıktı için Flask'ın varsayılanı kullanılır
+        if self.compact is None and self._app.debug:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj) + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,144 @@
+"""
+İmzalı lisans token'ları.
+
+Klasik serial key rastgele 16 karakterdir ve kendi başına bilgi taşımaz; her
+aktivasyon check-serial çağrısı gerektirir. Lisans token'ı serial key'i, son
+kullanma zamanını ve kullanım limitini taşır ve imzalanır; istemci sunucuya
+sormadan doğrulayabilir, sunucu da depoya gitmeden önce imzayı denetler.
+
+Biçim: ``<önek>.<yük>.<imza>`` (base64url). Önek algoritmayı belirtir ve
+imzaya dahildir; doğrulayıcı yalnızca kendi algoritmasının önekini kabul eder.
+
+- ``hs256``: HMAC-SHA256. Doğrulama anahtarı imzalama anahtarıyla aynıdır;
+  anahtarı bilen token üretebilir, yalnızca güvenilen istemcilerde kullanın.
+- ``ed25519``: İstemciler yalnızca açık anahtarı taşır. ``cryptography``
+  paketi gerekir.
+
+Modül yalnızca standart kütüphaneye (ed25519 için cryptography'ye) bağlıdır;
+verify_license_token istemcilere bu dosyayla birlikte dağıtılabilir.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import time
+
+# cryptography (~20 ms) yalnızca ed25519 ilk kullanıldığında yüklenir
+Ed25519PrivateKey = None
+
+PREFIXES = {"hs256": "SKL1H", "ed25519": "SKL1E"}
+
+
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def load_key(text):
+    """base64url anahtar metnini baytlara çevirir"""
+    return _b64decode(text.strip())
+
+
+def generate_signing_key(algorithm):
+    """Yeni imzalama anahtarı üretir; (imzalama anahtarı, açık anahtar veya None) metinlerini döndürür"""
+    if algorithm not in PREFIXES:
+        raise ValueError(f"Desteklenmeyen lisans algoritması: {algorithm}")
+    key = secrets.token_bytes(32)
+    return _b64encode(key), LicenseSigner(algorithm, key).public_key()
+
+
+def _require_ed25519():
+    global InvalidSignature, Ed25519PrivateKey, Ed25519PublicKey, Encoding, PublicFormat
+    if Ed25519PrivateKey is not None:
+        return
+    try:
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+        from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+    except ImportError:
+        raise ImportError("ed25519 lisans token'ları için cryptography paketi gerekli (pip install cryptography)") from None
+
+
+def verify_license_token(token, algorithm, key, now=None):
+    """Token'ı yerel olarak doğrular; (claims, hata) döndürür, hata None, "invalid" veya "expired" olur
+
+    key hs256 için paylaşılan gizli anahtar, ed25519 için 32 baytlık açık anahtardır (bytes;
+    ed25519 için Ed25519PublicKey nesnesi de verilebilir).
+    """
+    try:
+        prefix, payload, signature = token.split('.')
+        if prefix != PREFIXES[algorithm]:
+            return None, "invalid"
+        message = f"{prefix}.{payload}".encode()
+        signature = _b64decode(signature)
+        if algorithm == 'hs256':
+            if not hmac.compare_digest(signature, hmac.new(key, message, hashlib.sha256).digest()):
+                return None, "invalid"
+        else:
+            _require_ed25519()
+            if not isinstance(key, Ed25519PublicKey):
+                key = Ed25519PublicKey.from_public_bytes(key)
+            try:
+                key.verify(signature, message)
+            except InvalidSignature:
+                return None, "invalid"
+        claims = json.loads(_b64decode(payload))
+    except (ValueError, TypeError, AttributeError, KeyError):
+        return None, "invalid"
+    if not isinstance(claims, dict) or not isinstance(claims.get('sk'), str):
+        return None, "invalid"
+    expires_at = claims.get('exp')
+    if expires_at is not None and (not isinstance(expires_at, int) or isinstance(expires_at, bool)):
+        return None, "invalid"
+    if expires_at is not None and expires_at <= (now if now is not None else time.time()):
+        return claims, "expired"
+    return claims, None
+
+
+class LicenseSigner:
+    """Sunucu tarafında lisans token'ı üretir ve doğrular"""
+
+    def __init__(self, algorithm, key):
+        if algorithm not in PREFIXES:
+            raise ValueError(f"Desteklenmeyen lisans algoritması: {algorithm}")
+        self.algorithm = algorithm
+        self._prefix = PREFIXES[algorithm]
+        if algorithm == 'hs256':
+            self._key = key
+            self.verify_key = key
+        else:
+            _require_ed25519()
+            # key 32 baytlık Ed25519 özel anahtar tohumudur
+            self._key = Ed25519PrivateKey.from_private_bytes(key)
+            self.verify_key = self._key.public_key()
+
+    def public_key(self):
+        """İstemcilere dağıtılacak doğrulama anahtarı (base64url); HMAC için None"""
+        if self.algorithm != 'ed25519':
+            return None
+        return _b64encode(self.verify_key.public_bytes(Encoding.Raw, PublicFormat.Raw))
+
+    def issue(self, serial_key, expires_at, max_uses, now=None):
+        """serial_key, son kullanma epoch saniyesi (veya None) ve kullanım limiti için token üretir"""
+        claims = {
+            "sk": serial_key,
+            "exp": expires_at,
+            "max": max_uses,
+            "iat": int(now if now is not None else time.time())
+        }
+        payload = _b64encode(json.dumps(claims, separators=(',', ':')).encode())
+        message = f"{self._prefix}.{payload}".encode()
+        if self.algorithm == 'hs256':
+            signature = hmac.new(self._key, message, hashlib.sha256).digest()
+        else:
+            signature = self._key.sign(message)
+        return f"{self._prefix}.{payload}.{_b64encode(signature)}"
+
+    def verify(self, token, now=None):
+        """verify_license_token ile aynı; sunucunun kendi anahtarıyla"""
+        return verify_license_token(token, self.algorithm, self.verify_key, now)
@@ -0,0 +1,123 @@
+"""
+İstek ve depo metrikleri.
+
+Rota başına sabit kovalı gecikme histogramları, durum kodu sayaçları, depo
+işlem süreleri ve doğrulama sonuçları tutulur; Prometheus metin formatında
+dışa verilir. Sayaçlar kilitsizdir: yoğun eşzamanlılıkta nadir kayıp artışlar
+ölçüm doğruluğu için kabul edilir, sıcak yolda kilit beklenmez.
+"""
+
+from bisect import bisect_left
+
+# Saniye cinsinden gecikme kovaları
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in pairs)
+
+
+class Histogram:
+    """Sabit kovalı gecikme histogramı"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{_labels(labels + [("le", repr(bound))])}}} {cumulative}')
+        lines.append(f'{name}_bucket{{{_labels(labels + [("le", "+Inf")])}}} {self.count}')
+        lines.append(f'{name}_sum{{{_labels(labels)}}} {self.sum}')
+        lines.append(f'{name}_count{{{_labels(labels)}}} {self.count}')
+        return lines
+
+
+class Metrics:
+    """Uygulama metrik kayıt defteri"""
+
+    def __init__(self, prefix='serial_api', buckets=DEFAULT_BUCKETS):
+        self.prefix = prefix
+        self.buckets = buckets
+        self.enabled = True
+        self.request_latency = {}
+        self.responses = {}
+        self.store_latency = {}
+        self.validations = {}
+        self._gauges = []
+
+    def _histogram(self, table, key):
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table.setdefault(key, Histogram(self.buckets))
+        return histogram
+
+    def observe_request(self, route, method, status, seconds):
+        if not self.enabled:
+            return
+        self._histogram(self.request_latency, (route, method)).observe(seconds)
+        key = (route, method, status)
+        self.responses[key] = self.responses.get(key, 0) + 1
+
+    def observe_store(self, operation, seconds):
+        if not self.enabled:
+            return
+        self._histogram(self.store_latency, operation).observe(seconds)
+
+    def count_validation(self, outcome):
+        if not self.enabled:
+            return
+        self.validations[outcome] = self.validations.get(outcome, 0) + 1
+
+    def register(self, name, help_text, read, metric_type='gauge'):
+        """Kazıma anında okunan bir değer kaydeder (read None dönerse atlanır)"""
+        self._gauges.append((f'{self.prefix}_{name}', help_text, read, metric_type))
+
+    def render(self):
+        """Prometheus metin formatı (0.0.4); tablolar kopyalanarak eşzamanlı eklemelerden korunur"""
+        prefix = self.prefix
+        lines = []
+
+        name = f'{prefix}_request_duration_seconds'
+        lines += [f'# HELP {name} Rota başına istek süresi', f'# TYPE {name} histogram']
+        for (route, method), histogram in sorted(self.request_latency.copy().items()):
+            lines += histogram.render(name, [("route", route), ("method", method)])
+
+        name = f'{prefix}_responses_total'
+        lines += [f'# HELP {name} Rota ve durum kodu başına yanıt sayısı', f'# TYPE {name} counter']
+        for (route, method, status), count in sorted(self.responses.copy().items()):
+            lines.append(f'{name}{{{_labels([("route", route), ("method", method), ("status", status)])}}} {count}')
+
+        name = f'{prefix}_store_operation_duration_seconds'
+        lines += [f'# HELP {name} Depo işlem süresi', f'# TYPE {name} histogram']
+        for operation, histogram in sorted(self.store_latency.copy().items()):
+            lines += histogram.render(name, [("operation", operation)])
+
+        name = f'{prefix}_validations_total'
+        lines += [f'# HELP {name} Serial key doğrulama sonuçları', f'# TYPE {name} counter']
+        for outcome, count in sorted(self.validations.copy().items()):
+            lines.append(f'{name}{{{_labels([("outcome", outcome)])}}} {count}')
+
+        for name, help_text, read, metric_type in self._gauges:
+            value = read()
+            if value is None:
+                continue
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}', f'{name} {value}']
+
+        return '\n'.join(lines) + '\n'
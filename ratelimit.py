@@ -0,0 +1,143 @@
+"""
+Token bucket tabanlı istek sınırlama.
+
+Her (rota sınıfı, istemci IP) çifti için bir bucket tutulur. Bellek içi motor
+bucket'ları LRU sırasıyla saklar ve en uzun süre kullanılmayanları atar.
+SQLite motoru bucket'ları paylaşılan dosyada tutar; böylece limitler tüm
+worker'larda birlikte geçerli olur.
+"""
+
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def parse_rule(value):
+    """"rate/burst" biçimindeki kuralı (saniyedeki token, kapasite) olarak okur"""
+    rate, _, burst = value.partition('/')
+    try:
+        rate = float(rate)
+        burst = float(burst) if burst else rate
+    except ValueError:
+        rate = burst = 0
+    if not rate > 0 or not burst >= 1:
+        raise ValueError(f"Geçersiz rate limit kuralı: {value!r} (hız 0'dan büyük, kapasite en az 1 olmalı)")
+    return rate, burst
+
+
+class MemoryBucketBackend:
+    """LRU ile sınırlandırılmış bellek içi bucket tablosu"""
+
+    def __init__(self, max_buckets=100_000):
+        self.max_buckets = max_buckets
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, bucket, rate, burst, now):
+        """Bir token almayı dener; (izin, tekrar deneme süresi) döndürür"""
+        with self._lock:
+            state = self._buckets.get(bucket)
+            if state is None:
+                state = [burst, now]
+                self._buckets[bucket] = state
+                if len(self._buckets) > self.max_buckets:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(bucket)
+                state[0] = min(burst, state[0] + (now - state[1]) * rate)
+                state[1] = now
+            if state[0] >= 1:
+                state[0] -= 1
+                return True, 0.0
+            return False, (1 - state[0]) / rate
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class SQLiteBucketBackend:
+    """Worker'lar arasında paylaşılan SQLite bucket tablosu"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+            bucket TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            updated_at REAL NOT NULL
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_rate_limit_updated ON rate_limit_buckets (updated_at);
+    """
+
+    # Token hesabı ve düşümü tek atomik UPSERT ile yapılır; token yetmezse satır dönmez
+    SQL_TAKE = """
+        INSERT INTO rate_limit_buckets (bucket, tokens, updated_at) VALUES (:bucket, :burst - 1, :now)
+        ON CONFLICT (bucket) DO UPDATE SET
+            tokens = min(:burst, tokens + (:now - updated_at) * :rate) - 1,
+            updated_at = :now
+        WHERE min(:burst, tokens + (:now - updated_at) * :rate) >= 1
+        RETURNING tokens
+    """
+    SQL_STATE = "SELECT tokens, updated_at FROM rate_limit_buckets WHERE bucket = ?"
+    SQL_EVICT = "DELETE FROM rate_limit_buckets WHERE updated_at < ?"
+
+    # Bu kadar istekte bir, boşta kalmış bucket'lar silinir
+    EVICT_EVERY = 10_000
+
+    def __init__(self, path, idle_seconds=3600):
+        self.path = path
+        self.idle_seconds = idle_seconds
+        self._local = threading.local()
+        self._calls = 0
+        self._connection().executescript(self.SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Bu thread'in bağlantısını kapatır"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+        self._local = threading.local()
+
+    def take(self, bucket, rate, burst, now):
+        """Bir token almayı dener; (izin, tekrar deneme süresi) döndürür"""
+        conn = self._connection()
+        self._calls += 1
+        if self._calls % self.EVICT_EVERY == 0:
+            conn.execute(self.SQL_EVICT, (now - self.idle_seconds,))
+        row = conn.execute(self.SQL_TAKE, {"bucket": bucket, "burst": burst, "rate": rate, "now": now}).fetchone()
+        if row is not None:
+            return True, 0.0
+        state = conn.execute(self.SQL_STATE, (bucket,)).fetchone()
+        tokens = min(burst, state[0] + (now - state[1]) * rate) if state else 0.0
+        return False, max(0.0, (1 - tokens) / rate)
+
+
+class RateLimiter:
+    """Rota sınıfı ve istemci bazlı token bucket sınırlayıcısı"""
+
+    def __init__(self, rules, backend):
+        self.rules = rules
+        self.backend = backend
+        self.limited = 0
+
+    def check(self, route_class, client):
+        """İsteğe izin verilip verilmediğini ve gerekirse Retry-After saniyesini döndürür"""
+        rule = self.rules.get(route_class)
+        if rule is None:
+            return True, 0
+        rate, burst = rule
+        allowed, retry_after = self.backend.take(f"{route_class}:{client}", rate, burst, time.time())
+        if allowed:
+            return True, 0
+        self.limited += 1
+        return False, max(1, math.ceil(retry_after))
@@ -0,0 +1,79 @@
+"""
+Serial key kaydı.
+
+Milyonlarca key bellekte tutulduğunda kayıt başına sözlük ve ISO metin
+maliyeti baskın hale gelir. KeyRecord alanları __slots__ ile saklar;
+oluşturma zamanı duvar saati mikrosaniyesi, son kullanma zamanı epoch
+saniyesi olarak tam sayı tutulur. Yanıtlar kayıttan doğrudan üretilir;
+created_at metni yalnızca okunduğunda hesaplanır.
+"""
+
+from datetime import datetime, timedelta
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Sözlük biçimindeki kaydın alanları (to_dict ve eski tarz kayıt['alan'] erişimi için)
+FIELDS = ('serial_key', 'created_at', 'is_active', 'description', 'expiry_date',
+          'max_uses', 'current_uses', 'expires_at')
+
+
+def created_timestamp(created_at):
+    """ISO oluşturma zamanını duvar saati mikrosaniyesine çevirir (saat dilimli zamanlar yerel saate çevrilir)"""
+    moment = datetime.fromisoformat(created_at)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return (moment - _EPOCH) // _MICROSECOND
+
+
+def created_isoformat(created):
+    """created_timestamp değerini ISO metnine geri çevirir"""
+    return (_EPOCH + timedelta(microseconds=created)).isoformat()
+
+
+class KeyRecord:
+    """__slots__ ile saklanan, tam sayı zaman damgalı serial key kaydı"""
+
+    __slots__ = ('serial_key', 'created', 'is_active', 'description', 'expiry_date',
+                 'max_uses', 'current_uses', 'expires_at')
+
+    def __init__(self, serial_key, created, is_active, description, expiry_date, max_uses, current_uses,
+                 expires_at):
+        self.serial_key = serial_key
+        self.created = created
+        self.is_active = is_active
+        self.description = description
+        self.expiry_date = expiry_date
+        self.max_uses = max_uses
+        self.current_uses = current_uses
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_dict(cls, key_info):
+        """expires_at alanı hesaplanmış sözlük kaydından KeyRecord oluşturur"""
+        return cls(key_info['serial_key'], created_timestamp(key_info['created_at']), bool(key_info['is_active']),
+                   key_info['description'], key_info['expiry_date'], key_info['max_uses'],
+                   key_info['current_uses'], key_info['expires_at'])
+
+    @property
+    def created_at(self):
+        return created_isoformat(self.created)
+
+    def __getitem__(self, field):
+        try:
+            return getattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
+
+    def get(self, field, default=None):
+        return getattr(self, field, default)
+
+    def copy(self):
+        return KeyRecord(self.serial_key, self.created, self.is_active, self.description, self.expiry_date,
+                         self.max_uses, self.current_uses, self.expires_at)
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def __repr__(self):
+        return f"KeyRecord({self.to_dict()!r})"
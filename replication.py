@@ -0,0 +1,284 @@
+"""
+Çok düğümlü çalışma için değişiklik akışı ve salt okunur replikalar.
+
+Primary düğümde bellek deposu her değişikliği (ekleme, kullanım, deaktif
+etme, toplu güncelleme) günlüğe yazdığı noktada ChangeFeed'e de ekler. Akış
+sıra numaralıdır ve son ``capacity`` olayı bellekte tutar; aynı key'in
+olayları depoya uygulandıkları sırayla numaralanır.
+
+Replika açılışta primary'den tutarlı bir anlık görüntü ve o anın sıra
+numarasını alır, ardından akışı NDJSON olarak izleyip olayları kendi indeksli
+deposuna uygular. Okumalar replikadan yanıtlanır; kullanım hakkı düşüren
+sorgulamalar limitin tek yerde denetlenmesi için primary'ye iletilir.
+Replika geride kalıp istediği olay akıştan düşerse veya primary yeniden
+başlarsa (farklı feed_id) anlık görüntüden yeniden eşitlenir.
+"""
+
+import json
+import logging
+import secrets
+import threading
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import urlencode
+
+from journal import OP_ADD, OP_DEACTIVATE, OP_REDEEM, OP_UPDATE, decode_record
+from record import KeyRecord
+
+logger = logging.getLogger(__name__)
+
+OP_NAMES = {OP_ADD: 'add', OP_REDEEM: 'redeem', OP_DEACTIVATE: 'deactivate', OP_UPDATE: 'update'}
+
+# update olayında replikaya aktarılan alanlar (store.UPDATABLE_FIELDS)
+UPDATE_FIELDS = ('is_active', 'expiry_date', 'max_uses', 'current_uses')
+
+
+class ReplicationError(ConnectionError):
+    """Primary'ye ulaşılamadı veya primary beklenmeyen yanıt döndü
+
+    ConnectionError alt sınıfıdır: uygulama bu modülü yüklemeden yakalayıp 503 döndürebilir.
+    """
+
+
+class FeedGone(ReplicationError):
+    """İstenen akış konumu primary'de artık tutulmuyor; anlık görüntüden yeniden eşitlenmeli"""
+
+
+class ChangeFeed:
+    """Depo değişikliklerini sıra numarasıyla tutan sınırlı bellek içi halka"""
+
+    def __init__(self, capacity=100_000):
+        # Primary yeniden başlayınca sıra numaraları sıfırlanır; replika bunu farklı kimlikten anlar
+        self.feed_id = secrets.token_hex(8)
+        self.capacity = capacity
+        self.seq = 0
+        self._events = [None] * capacity
+        self._cond = threading.Condition()
+        self.closed = False
+
+    def append(self, op, payload):
+        """Olayı ekler ve bekleyen okuyucuları uyandırır; sıra numarasını döndürür"""
+        with self._cond:
+            self.seq += 1
+            self._events[self.seq % self.capacity] = (self.seq, time.time(), op, payload)
+            self._cond.notify_all()
+            return self.seq
+
+    def available(self, after):
+        """after konumundan sonrası hâlâ okunabiliyorsa True"""
+        return self.seq - self.capacity <= after <= self.seq
+
+    def read(self, after, limit=1000, timeout=None):
+        """after'dan sonraki en fazla limit olayı döndürür; yeni olay yoksa timeout kadar bekler
+
+        Konum halkadan düşmüşse None döner.
+        """
+        with self._cond:
+            if after == self.seq and not self.closed:
+                self._cond.wait(timeout)
+            if not self.available(after):
+                return None
+            end = min(self.seq, after + limit)
+            return [self._events[seq % self.capacity] for seq in range(after + 1, end + 1)]
+
+    def close(self):
+        """Akışı izleyen bağlantıları sonlandırır (sunucu kapanışı)"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def stats(self):
+        return {
+            "feed_id": self.feed_id,
+            "seq": self.seq,
+            "capacity": self.capacity,
+            "oldest_seq": max(0, self.seq - self.capacity) + 1 if self.seq else None
+        }
+
+
+def encode_event(event):
+    """Akış olayını NDJSON satırına dönüşecek sözlüğe çevirir"""
+    seq, timestamp, op, payload = event
+    data = {"seq": seq, "ts": timestamp, "op": OP_NAMES[op]}
+    if op in (OP_ADD, OP_UPDATE):
+        data["record"] = decode_record(payload).to_dict()
+    else:
+        data["serial_key"] = str(payload, 'utf-8')
+    return data
+
+
+class Replica:
+    """Primary'nin akışını izleyip yerel depoya uygulayan, kullanımları primary'ye ileten katman
+
+    Okuma metotları (get, get_many) yerel depoyu, redeem ve redeem_many
+    primary'yi kullanır; böylece app.usage_store() yerine geçebilir.
+    """
+
+    def __init__(self, store, primary_url, token, on_reset=None, on_added=None, on_changed=None,
+                 timeout=10.0, retry_interval=1.0):
+        self.store = store
+        self.primary_url = primary_url.rstrip('/')
+        self.token = token
+        self.on_reset = on_reset
+        self.on_added = on_added
+        self.on_changed = on_changed
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.feed_id = None
+        self.applied_seq = 0
+        self.primary_seq = 0
+        self.lag_seconds = None
+        self.resyncs = 0
+        self.applied = 0
+        self.connected = False
+        self.last_error = None
+        self._ready = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _request(self, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(self.primary_url + path, data=data, headers={
+            "Authorization": f"Bearer {self.token}",
+            "Content-Type": "application/json"
+        })
+        try:
+            return urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 410:
+                raise FeedGone(path) from None
+            raise ReplicationError(f"Primary {e.code} döndürdü: {path}") from None
+        except OSError as e:
+            raise ReplicationError(f"Primary'ye ulaşılamadı: {e}") from None
+
+    # Okumalar yerel depodan
+    def get(self, serial_key):
+        return self.store.get(serial_key)
+
+    def get_many(self, serial_keys):
+        return self.store.get_many(serial_keys)
+
+    # Kullanım hakkı primary'de düşülür
+    def redeem(self, serial_key):
+        """Kullanımı primary'ye iletir; primary'nin döndürdüğü kaydı veya None döndürür"""
+        return self.redeem_many([serial_key])[0]
+
+    def redeem_many(self, serial_keys):
+        """Anahtarları tek istekte primary'de redeem eder; sonuçlar girdiyle aynı sırada döner"""
+        serial_keys = list(serial_keys)
+        if not serial_keys:
+            return []
+        with self._request('/api/replication/redeem', {"serial_keys": serial_keys}) as response:
+            try:
+                results = json.loads(response.read())['results']
+            except (OSError, ValueError, KeyError) as e:
+                raise ReplicationError(f"Primary yanıtı okunamadı: {e}") from None
+        return [KeyRecord.from_dict(record) if record is not None else None for record in results]
+
+    def bootstrap(self):
+        """Primary'nin anlık görüntüsünü yükler ve akış konumunu onun sıra numarasına ayarlar"""
+        with self._request('/api/replication/snapshot') as response:
+            header = json.loads(response.readline())
+            records = [KeyRecord.from_dict(json.loads(line)) for line in response if line.strip()]
+        if len(records) != header['count']:
+            raise ReplicationError("Anlık görüntü eksik alındı")
+        self.store.replace_all(records)
+        self.feed_id = header['feed_id']
+        self.applied_seq = self.primary_seq = header['seq']
+        self.resyncs += 1
+        if self.on_reset is not None:
+            self.on_reset()
+        logger.info("Replika primary'den %d serial key ile eşitlendi (seq %d)", len(records), self.applied_seq)
+
+    def apply(self, event):
+        """Tek akış olayını yerel depoya uygular"""
+        op = event['op']
+        if op == 'add':
+            record = KeyRecord.from_dict(event['record'])
+            self.store.add_many([record])
+            if self.on_added is not None:
+                self.on_added((record.serial_key,))
+            return
+        if op == 'update':
+            record = event['record']
+            serial_key = record['serial_key']
+            self.store.update_many({field: record[field] for field in UPDATE_FIELDS}, [serial_key])
+        else:
+            serial_key = event['serial_key']
+            if op == 'redeem':
+                self.store.add_uses_many({serial_key: 1})
+            else:
+                self.store.deactivate(serial_key)
+        if self.on_changed is not None:
+            self.on_changed((serial_key,))
+
+    def tail(self):
+        """Akışı izler; bağlantı kapanana veya stop çağrılana kadar olayları uygular"""
+        query = urlencode({"feed_id": self.feed_id, "after": self.applied_seq})
+        with self._request(f'/api/replication/feed?{query}') as response:
+            self.connected = True
+            self._ready.set()
+            for line in response:
+                if self._stop_event.is_set():
+                    return
+                event = json.loads(line)
+                seq = event['seq']
+                self.primary_seq = max(self.primary_seq, seq)
+                if event.get('heartbeat'):
+                    if seq <= self.applied_seq:
+                        self.lag_seconds = 0.0
+                    continue
+                if seq != self.applied_seq + 1:
+                    raise FeedGone(f"Beklenen seq {self.applied_seq + 1}, gelen {seq}")
+                self.apply(event)
+                self.applied_seq = seq
+                self.applied += 1
+                self.lag_seconds = max(0.0, time.time() - event['ts'])
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                if self.feed_id is None:
+                    self.bootstrap()
+                self.tail()
+            except FeedGone:
+                logger.warning("Replika akışın gerisinde kaldı; anlık görüntüden yeniden eşitleniyor")
+                self.feed_id = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning("Replikasyon bağlantısı kesildi: %s", e)
+                self._stop_event.wait(self.retry_interval)
+            finally:
+                self.connected = False
+
+    def start(self):
+        """İzleyici thread'i başlatır (fork sonrasında da yeniden çağrılabilir)"""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='replica', daemon=True)
+        self._thread.start()
+
+    def wait_ready(self, timeout):
+        """İlk eşitleme bitip akış izlenmeye başlayana kadar bekler"""
+        return self._ready.wait(timeout)
+
+    def stop(self):
+        """Thread'i durdurur; açık akış en geç bir heartbeat aralığında kapanır"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(self.timeout)
+            self._thread = None
+
+    def stats(self):
+        return {
+            "primary": self.primary_url,
+            "feed_id": self.feed_id,
+            "connected": self.connected,
+            "applied_seq": self.applied_seq,
+            "primary_seq": self.primary_seq,
+            "lag_events": max(0, self.primary_seq - self.applied_seq),
+            "lag_seconds": self.lag_seconds,
+            "applied": self.applied,
+            "resyncs": self.resyncs,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Production başlatıcısı.
+
+Dinleme soketini açar, uygulamayı (depo, indeksler, Bloom filtresi) fork'tan
+önce bir kez yükler ve worker süreçlerini başlatır; worker'lar önyüklenmiş
+sayfaları copy-on-write ile paylaşır. Her worker sınırlı bir thread havuzuyla
+WSGI (veya --asgi ile yerleşik ASGI) sunucusu çalıştırır.
+
+Sinyaller:
+    SIGHUP   yeni worker'ları başlatır, hazır olunca eskileri nazikçe kapatır
+    SIGTERM  süren istekleri bekleyerek kapanır (SIGINT de aynı)
+    SIGUSR1  başlangıç süresi ve worker bellek raporunu yeniden yazdırır
+
+Kullanım:
+    ADMIN_PASSWORD=... SERIAL_STORE_BACKEND=sqlite python server.py --workers 4 --threads 8
+    python -m server --bind 127.0.0.1:8000
+"""
+
+import argparse
+import asyncio
+import errno
+import importlib
+import logging
+import os
+import secrets
+import select
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer
+
+LAUNCH_STARTED = time.perf_counter()
+
+
+def env_flag(name, default='0'):
+    return os.environ.get(name, default).lower() not in ('0', 'false', 'no', '')
+
+
+def parse_bind(value):
+    """"host:port" adresini ayırır ([::]:5000 gibi IPv6 adresleri dahil)"""
+    host, _, port = value.rpartition(':')
+    return (host or '0.0.0.0').strip('[]'), int(port)
+
+
+def memory_usage(pid):
+    """/proc üzerinden RSS, PSS ve paylaşılan/özel bellek (bayt); okunamazsa None"""
+    fields = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                name, _, value = line.partition(':')
+                parts = value.split()
+                if len(parts) == 2 and parts[1] == 'kB':
+                    fields[name] = int(parts[0]) * 1024
+    except OSError:
+        return None
+    return {
+        "rss": fields.get('Rss', 0),
+        "pss": fields.get('Pss', 0),
+        "shared": fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+        "private": fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    }
+
+
+def megabytes(value):
+    return f"{value / 1048576:.1f}MB"
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """İstekleri sabit boyutlu thread havuzunda işleyen WSGI sunucusu"""
+
+    multithread = True
+
+    def __init__(self, host, port, app, threads, fd=None):
+        super().__init__(host, port, app, fd=fd)
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='wsgi')
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def close(self):
+        """Soketi kapatır ve süren isteklerin bitmesini bekler"""
+        self.server_close()
+        self.pool.shutdown(wait=True)
+
+
+class Launcher:
+    """Prefork süreç yöneticisi"""
+
+    def __init__(self, options):
+        self.options = options
+        self.socket = None
+        self.app_module = None
+        self.workers = {}
+        self.retiring = {}
+        self.ready = {}
+        self.generation = 0
+        self.stopping = False
+        self.pending_signals = []
+        self.ready_pipe = None
+
+    def load_app(self):
+        """Uygulama modülünü yükler; (modül, yükleme süresi) döndürür"""
+        started = time.perf_counter()
+        module = importlib.import_module('app')
+        elapsed = time.perf_counter() - started
+        return module, elapsed
+
+    def bind(self):
+        host, port = parse_bind(self.options.bind)
+        family = socket.AF_INET6 if ':' in host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        sock.listen(self.options.backlog)
+        # Worker'lar aynı soketten kabul eder; bağlantıyı başka worker aldıysa accept beklemez
+        sock.setblocking(False)
+        sock.set_inheritable(True)
+        self.socket = sock
+        return sock.getsockname()[:2]
+
+    def prefork(self):
+        """Fork öncesi arka plan thread'lerini durdurur ve bağlantıları kapatır"""
+        module = self.app_module
+        # Isınma thread'i fork'ta kopyalanmaz: worker'lar yarım kalmış indekslerle açılmamalı
+        module.wait_warm()
+        if module.expiry_sweeper is not None:
+            module.expiry_sweeper.stop()
+            module.expiry_sweeper.join()
+            module.expiry_sweeper = None
+        if module.usage_accountant is not None:
+            module.usage_accountant.close()
+        if module.replica is not None:
+            module.replica.stop()
+        close = getattr(module.key_store, 'close', None)
+        if close is not None:
+            close()
+        if module.rate_limiter is not None:
+            close = getattr(module.rate_limiter.backend, 'close', None)
+            if close is not None:
+                close()
+
+    def spawn(self, index, generation=None):
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = (index, self.generation if generation is None else generation)
+            return pid
+        code = 0
+        try:
+            self.worker_main(index)
+        except Exception as e:
+            print(f"❌ Worker {os.getpid()} hata ile kapandı: {e}", file=sys.stderr)
+            code = 1
+        finally:
+            os._exit(code)
+
+    def worker_main(self, index):
+        # Ctrl+C ve reload sinyallerini ana süreç yönetir; yükleme sırasında SIGTERM doğrudan sonlandırır
+        for signum in (signal.SIGINT, signal.SIGHUP, signal.SIGUSR1):
+            signal.signal(signum, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        os.close(self.ready_pipe[0])
+
+        module = self.app_module
+        if module is None:
+            module, _ = self.load_app()
+        from store import ExpirySweeper
+
+        # Süresi dolan key'leri yalnızca ilk worker süpürür
+        if module.expiry_sweeper is not None:
+            module.expiry_sweeper.stop()
+            module.expiry_sweeper = None
+        if index == 0 and module.EXPIRY_SWEEP_INTERVAL > 0 and module.replica is None:
+            module.expiry_sweeper = ExpirySweeper(module.key_store, module.EXPIRY_SWEEP_INTERVAL)
+            module.expiry_sweeper.start()
+        # Replika fork öncesinde durduruldu; depo kopyalandığı için akışı kaldığı sıradan izler
+        if module.replica is not None:
+            module.replica.start()
+
+        pid = os.getpid()
+        startup_seconds = time.perf_counter() - LAUNCH_STARTED
+        module.metrics.register('worker_resident_memory_bytes', "Worker sürecinin RSS değeri",
+                                lambda: (memory_usage(pid) or {}).get('rss'))
+        module.metrics.register('worker_startup_seconds', "Başlatıcının açılışından worker hazır olana kadar geçen süre",
+                                lambda: round(startup_seconds, 3))
+
+        def notify_ready(_port=None):
+            os.write(self.ready_pipe[1], f"{pid} {time.perf_counter() - LAUNCH_STARTED:.3f}\n".encode())
+
+        try:
+            if self.options.asgi:
+                import asgi
+                asyncio.run(self._serve_asgi(asgi, notify_ready))
+                return
+
+            if not self.options.access_log:
+                logging.getLogger('werkzeug').setLevel(logging.WARNING)
+            host, port = self.socket.getsockname()[:2]
+            server = PooledWSGIServer(host, port, module.app, self.options.threads, fd=self.socket.fileno())
+            # serve_forever aynı thread'de döndüğü için kapatma ayrı thread'den istenir
+            signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+            notify_ready()
+            server.serve_forever()
+            # Akışı izleyen replika bağlantıları kapatılır, yoksa close onları beklerdi
+            if module.change_feed is not None:
+                module.change_feed.close()
+            server.close()
+        finally:
+            # os._exit atexit'i çalıştırmaz: günlükte bekleyen kayıtlar ve kullanım artışları burada yazılır
+            if module.usage_accountant is not None:
+                module.usage_accountant.close()
+            close = getattr(module.key_store, 'close', None)
+            if close is not None:
+                close()
+
+    async def _serve_asgi(self, asgi, notify_ready):
+        stop = asyncio.Event()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+        await asgi.serve_builtin(asgi.application, sock=self.socket, ready=notify_ready, stop=stop,
+                                 drain_timeout=self.options.graceful_timeout)
+
+    def on_signal(self, signum, frame):
+        self.pending_signals.append(signum)
+
+    def report(self):
+        """Başlangıç süresi ve worker başına bellek kullanımını yazdırır"""
+        print(f"{'PID':>8} {'hazır':>8} {'RSS':>10} {'PSS':>10} {'paylaşılan':>11} {'özel':>10}")
+        for pid in sorted(self.workers):
+            usage = memory_usage(pid)
+            ready = self.ready.get(pid)
+            ready_text = f"{ready:.2f}s" if ready is not None else "-"
+            if usage is None:
+                print(f"{pid:>8} {ready_text:>8} {'-':>10} {'-':>10} {'-':>11} {'-':>10}")
+                continue
+            print(f"{pid:>8} {ready_text:>8} {megabytes(usage['rss']):>10} {megabytes(usage['pss']):>10} "
+                  f"{megabytes(usage['shared']):>11} {megabytes(usage['private']):>10}")
+        master = memory_usage(os.getpid())
+        if master is not None:
+            print(f"{'ana süreç':>8} {'':>8} {megabytes(master['rss']):>10} {megabytes(master['pss']):>10}")
+        sys.stdout.flush()
+
+    def reload(self):
+        """Yeni nesil worker'ları başlatır; eskiler yeniler hazır olunca kapatılır"""
+        if self.app_module is not None and self.app_module.STORE_BACKEND == 'memory':
+            print("⚠️  Bellek içi depoda reload worker'daki değişiklikleri kaybettirir; yok sayıldı")
+            return
+        if self.app_module is not None and self.app_module.usage_accountant is not None:
+            # Eski ve yeni worker aynı anda sayarsa yazılmamış artışlar birbirine görünmez
+            print("⚠️  USAGE_ACCOUNTING=async ile reload kullanım limitini aşırabilir; yok sayıldı")
+            return
+        print("🔄 Reload: yeni worker'lar başlatılıyor")
+        self.generation += 1
+        for index in range(self.options.workers):
+            self.spawn(index)
+
+    def retire_old_generations(self):
+        current = [pid for pid, (_, generation) in self.workers.items() if generation == self.generation]
+        if not all(pid in self.ready for pid in current):
+            return
+        for pid, (index, generation) in list(self.workers.items()):
+            if generation < self.generation:
+                self.retiring[pid] = time.monotonic() + self.options.graceful_timeout
+                del self.workers[pid]
+                os.kill(pid, signal.SIGTERM)
+
+    def reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            was_ready = self.ready.pop(pid, None) is not None
+            if self.retiring.pop(pid, None) is not None:
+                continue
+            worker = self.workers.pop(pid, None)
+            if worker is not None and not self.stopping:
+                if not was_ready:
+                    # Açılışta çöken worker'ı yeniden başlatmak sonsuz döngüye girer
+                    raise SystemExit(f"❌ Worker {pid} başlatılamadı (durum {status})")
+                if self.app_module is not None and self.app_module.STORE_BACKEND == 'memory':
+                    # Önyüklenmiş durum çöken worker'ın değişikliklerini içermez; yeni worker'ın anlık
+                    # görüntüsü günlükteki bu değişiklikleri silerdi. Süreç yeniden başlatılınca günlükten yüklenir.
+                    raise SystemExit(f"❌ Worker {pid} beklenmedik şekilde kapandı (durum {status}); bellek içi "
+                                     "depoda önyüklenmiş eski durumdan yeniden başlatılamaz, kapatılıyor")
+                index, generation = worker
+                print(f"⚠️  Worker {pid} beklenmedik şekilde kapandı (durum {status}); yeniden başlatılıyor")
+                self.spawn(index, generation)
+
+    def stop(self):
+        """Tüm worker'lara SIGTERM gönderir, süre dolarsa SIGKILL ile sonlandırır"""
+        self.stopping = True
+        deadline = time.monotonic() + self.options.graceful_timeout
+        for pid in list(self.workers):
+            self.retiring[pid] = deadline
+            os.kill(pid, signal.SIGTERM)
+        self.workers.clear()
+        while self.retiring:
+            self.reap()
+            for pid, pid_deadline in list(self.retiring.items()):
+                if time.monotonic() >= pid_deadline:
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+            time.sleep(0.05)
+
+    def run(self):
+        host, port = self.bind()
+        if self.options.preload:
+            self.app_module, elapsed = self.load_app()
+            print(f"📦 Önyükleme: {elapsed * 1000:.0f} ms ({self.app_module.key_store.count()} serial key, "
+                  f"depo: {self.app_module.STORE_BACKEND})")
+            self.prefork()
+
+        self.ready_pipe = os.pipe()
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGUSR1):
+            signal.signal(signum, self.on_signal)
+
+        mode = 'ASGI' if self.options.asgi else 'WSGI'
+        print(f"🌐 {mode} http://{host}:{port} — {self.options.workers} worker × {self.options.threads} thread")
+        for index in range(self.options.workers):
+            self.spawn(index)
+
+        reported = False
+        buffer = b''
+        while True:
+            try:
+                readable, _, _ = select.select([self.ready_pipe[0]], [], [], 0.5)
+            except InterruptedError:
+                readable = []
+            if readable:
+                buffer += os.read(self.ready_pipe[0], 4096)
+                *lines, buffer = buffer.split(b'\n')
+                for line in lines:
+                    pid, seconds = line.split()
+                    self.ready[int(pid)] = float(seconds)
+                self.retire_old_generations()
+                if not reported and all(pid in self.ready for pid in self.workers):
+                    reported = True
+                    print(f"✅ {len(self.workers)} worker hazır: {time.perf_counter() - LAUNCH_STARTED:.2f} s")
+                    self.report()
+            self.reap()
+
+            while self.pending_signals:
+                signum = self.pending_signals.pop(0)
+                if signum in (signal.SIGTERM, signal.SIGINT):
+                    print("🛑 Kapanıyor: süren istekler bekleniyor")
+                    self.stop()
+                    return
+                if signum == signal.SIGHUP:
+                    self.reload()
+                elif signum == signal.SIGUSR1:
+                    self.report()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bind', default=os.environ.get('BIND', '0.0.0.0:5000'), help="host:port (BIND)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker sayısı (WEB_CONCURRENCY; varsayılan: SQLite için CPU sayısı, bellek için 1)")
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('WORKER_THREADS', '8')),
+                        help="worker başına thread (WORKER_THREADS)")
+    parser.add_argument('--no-preload', dest='preload', action='store_false',
+                        default=env_flag('PRELOAD', '1'), help="uygulamayı her worker'da ayrı yükler (PRELOAD=0)")
+    parser.add_argument('--asgi', action='store_true', default=os.environ.get('SERVER_MODE') == 'asgi',
+                        help="worker'larda ASGI sunucusu çalıştırır (SERVER_MODE=asgi)")
+    parser.add_argument('--graceful-timeout', type=float,
+                        default=float(os.environ.get('GRACEFUL_TIMEOUT', '30')),
+                        help="kapanışta süren istekler için beklenecek süre (GRACEFUL_TIMEOUT)")
+    parser.add_argument('--access-log', action='store_true', default=env_flag('ACCESS_LOG'),
+                        help="her isteği stderr'e yazar (ACCESS_LOG)")
+    parser.add_argument('--backlog', type=int, default=2048)
+    parser.add_argument('--debug', action='store_true', default=env_flag('DEBUG'),
+                        help="tek süreçli geliştirme sunucusu (DEBUG)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+
+    if options.debug:
+        import app as serial_app
+        host, port = parse_bind(options.bind)
+        serial_app.app.run(debug=True, host=host, port=port)
+        return
+
+    # Sırlar environment'tan okunur; production'da varsayılan şifreyle açılmaz
+    if not os.environ.get('ADMIN_PASSWORD'):
+        sys.exit("❌ ADMIN_PASSWORD environment variable'ı ayarlanmalı")
+    # Token imza anahtarı tüm worker'larda ve reload sonrasında aynı kalmalı
+    os.environ.setdefault('ADMIN_TOKEN_SECRET', secrets.token_hex(32))
+
+    backend = os.environ.get('SERIAL_STORE_BACKEND', 'memory')
+    if options.workers is None:
+        workers = os.environ.get('WEB_CONCURRENCY')
+        options.workers = int(workers) if workers else (os.cpu_count() or 1) if backend != 'memory' else 1
+    if backend == 'memory' and options.workers > 1:
+        sys.exit("❌ Bellek içi depo worker'lar arasında paylaşılamaz; SERIAL_STORE_BACKEND=sqlite kullanın "
+                 "veya tek worker ile çalıştırın")
+    if backend == 'sqlite' and os.environ.get('USAGE_ACCOUNTING') == 'async' and options.workers > 1:
+        sys.exit("❌ USAGE_ACCOUNTING=async kullanım sayacını worker içinde tutar; limitlerin kesin kalması "
+                 "için tek worker ile çalıştırın")
+
+    launcher = Launcher(options)
+    try:
+        launcher.run()
+    except SystemExit:
+        launcher.stop()
+        raise
+    except OSError as e:
+        if e.errno == errno.EADDRINUSE:
+            sys.exit(f"❌ Adres kullanımda: {options.bind}")
+        raise
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Soğuk açılış profili.
+
+Boşta kapatılan ortamlarda (serverless, ücretsiz katmanlar) kullanıcının
+hissettiği gecikme, sürecin açılıp ilk isteğe yanıt verene kadar geçen
+süredir. StartupProfiler app modülü yüklenmeye başladığı andan itibaren
+açılış aşamalarının (import'lar, depo yükleme, Bloom filtresi...) süresini,
+modül yüklemesinin, ilk yanıtın ve arka plan ısınmasının tamamlandığı anları
+kaydeder. Değerler /health ve /metrics üzerinden yayınlanır.
+
+Modül yalnızca standart kütüphaneye bağlıdır: Flask'tan önce yüklenip onun
+import süresini de ölçebilmelidir.
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+def process_age():
+    """Sürecin başlamasından beri geçen saniye (Linux /proc); okunamazsa None"""
+    try:
+        with open('/proc/self/stat') as f:
+            # İkinci alan (komut adı) boşluk içerebilir: sayılar son parantezden sonra başlar
+            fields = f.read().rpartition(')')[2].split()
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - int(fields[19]) / os.sysconf('SC_CLK_TCK'))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupProfiler:
+    """Açılış aşamalarını ve ilk isteğe kadar geçen süreyi ölçer"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        # Yorumlayıcının açılıp bu modüle gelene kadar harcadığı süre (10 ms çözünürlük)
+        self.interpreter_seconds = process_age()
+        self.phases = {}
+        self.import_seconds = None
+        self.first_request_seconds = None
+        self.first_request_duration = None
+        self.warmup_seconds = None
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @contextmanager
+    def phase(self, name):
+        """Bloğun süresini name aşaması olarak kaydeder (tekrarlanan aşamalar toplanır)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def imported(self):
+        """Modül yüklemesi bitti: bu andan sonra istek kabul edilebilir"""
+        self.import_seconds = self.elapsed()
+        logger.info("Uygulama %.0f ms'de yüklendi (%s)", self.import_seconds * 1000,
+                    ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases.items()))
+
+    def first_request(self, duration=None):
+        """İlk yanıt hazırlandı; yalnızca ilk çağrı kaydedilir"""
+        if self.first_request_seconds is not None:
+            return
+        self.first_request_seconds = self.elapsed()
+        self.first_request_duration = duration
+        logger.info("İlk istek açılıştan %.0f ms sonra yanıtlandı", self.first_request_seconds * 1000)
+
+    def warmed(self):
+        """Arka plan ısınması (indeksler, Bloom filtresi) tamamlandı"""
+        self.warmup_seconds = self.elapsed()
+        logger.info("Isınma açılıştan %.0f ms sonra tamamlandı", self.warmup_seconds * 1000)
+
+    def stats(self):
+        def rounded(value):
+            return round(value, 4) if value is not None else None
+
+        return {
+            "interpreter_seconds": rounded(self.interpreter_seconds),
+            "import_seconds": rounded(self.import_seconds),
+            "phases": {name: rounded(seconds) for name, seconds in self.phases.items()},
+            "first_request_seconds": rounded(self.first_request_seconds),
+            "first_request_duration": rounded(self.first_request_duration),
+            "warmup_seconds": rounded(self.warmup_seconds),
+            "warm": self.warmup_seconds is not None
+        }
@@ -0,0 +1,1027 @@
+"""
+Serial key depoları.
+
+Serial key kayıtlarını normalize edilmiş anahtar üzerinden O(1) erişimle tutar
+ve sık kullanılan sorgular için ikincil indeksler sağlar. İki motor vardır:
+testler ve tek süreçli çalışma için bellek içi depo, kalıcılık ve çoklu süreç
+için SQLite deposu. Bellek içi depo isteğe bağlı olarak bir günlüğe (journal.py)
+bağlanarak yeniden başlatmalarda durumunu korur.
+"""
+
+import gc
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import datetime
+from heapq import heappop, heappush
+
+from journal import OP_ADD, OP_DEACTIVATE, OP_REDEEM, OP_UPDATE, Journal, decode_record, encode_record
+from record import KeyRecord, created_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Açıklama önek indeksinde kullanılan önek uzunluğu
+DESCRIPTION_PREFIX_LENGTH = 4
+
+# Kullanım sayacı güncellemelerinde kullanılan kilit şeridi sayısı
+LOCK_STRIPES = 64
+
+
+def _description_prefix(description):
+    """Açıklamanın indekslenen önekini döndürür"""
+    return (description or '').lower()[:DESCRIPTION_PREFIX_LENGTH]
+
+
+# Sıralı (değer, serial_key) listelerinde bir değerin tüm anahtarlarının üst sınırı
+_KEY_MAX = '\uffff'
+
+
+def expiry_timestamp(expiry_date):
+    """ISO son kullanma tarihini UTC epoch saniyesine çevirir (saat dilimsiz tarihler yerel saattir)"""
+    return int(datetime.fromisoformat(expiry_date.replace('Z', '+00:00')).timestamp())
+
+
+def _normalize(key_info):
+    """Sözlük kayda yazma anında bir kez hesaplanan expires_at alanını ekler; KeyRecord'da zaten vardır"""
+    if isinstance(key_info, KeyRecord):
+        return key_info
+    if 'expires_at' not in key_info:
+        key_info['expires_at'] = expiry_timestamp(key_info['expiry_date']) if key_info['expiry_date'] else None
+    return key_info
+
+
+# Toplu güncellemede değiştirilebilen alanlar
+UPDATABLE_FIELDS = ('is_active', 'expiry_date', 'max_uses', 'current_uses')
+
+
+def _normalize_changes(changes):
+    """Güncellenecek alanları doğrular; son kullanma tarihi değişiyorsa expires_at'i ekler"""
+    unknown = set(changes) - set(UPDATABLE_FIELDS)
+    if unknown or not changes:
+        raise ValueError(f"Güncellenemeyen alanlar: {', '.join(sorted(unknown))}")
+    changes = dict(changes)
+    if 'expiry_date' in changes:
+        expiry_date = changes['expiry_date']
+        changes['expires_at'] = expiry_timestamp(expiry_date) if expiry_date else None
+    return changes
+
+
+def _merge_sorted(ordered, pending):
+    """Sıralanmamış öğeleri sıralı listeyle birleştirip yeni liste döndürür"""
+    # Timsort sıralı iki diziyi tek geçişte birleştirir. Kilitsiz okuyucular yarım sıralanmış
+    # listeyi görmesin diye liste yerinde sıralanmaz, yenisiyle değiştirilir.
+    pending.sort()
+    merged = ordered + pending
+    merged.sort()
+    return merged
+
+
+def _escape_like(value):
+    """LIKE kalıbındaki özel karakterleri kaçışlar"""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+class KeyQuery:
+    """Listeleme ve dışa aktarma için sunucu tarafı filtre kriterleri"""
+
+    def __init__(self, active=None, expired=None, exhausted=None, description_contains=None,
+                 created_from=None, created_to=None, expires_before=None, now=None, description=None):
+        self.active = active
+        self.expired = expired
+        self.exhausted = exhausted
+        self.description_contains = description_contains.lower() if description_contains else None
+        # Tam eşleşme (büyük/küçük harf duyarsız): toplu üretilen partinin ortak açıklaması
+        self.description = description.lower() if description else None
+        self.created_from = created_from
+        self.created_to = created_to
+        self.expires_before = expires_before
+        self.now = int(time.time()) if now is None else now
+
+    def is_empty(self):
+        """Hiç kriter yoksa (her kayıt eşleşirse) True döndürür"""
+        return all(value is None for value in (
+            self.active, self.expired, self.exhausted, self.description_contains, self.description,
+            self.created_from, self.created_to, self.expires_before
+        ))
+
+    def matches(self, record):
+        """Kaydın filtrelere uyup uymadığını döndürür"""
+        if self.active is not None and record.is_active != self.active:
+            return False
+        expires_at = record.expires_at
+        if self.expired is not None:
+            if (expires_at is not None and expires_at <= self.now) != self.expired:
+                return False
+        if self.expires_before is not None:
+            if expires_at is None or not self.now < expires_at <= self.expires_before:
+                return False
+        if self.exhausted is not None:
+            if (record.current_uses >= record.max_uses) != self.exhausted:
+                return False
+        if self.description_contains and self.description_contains not in (record.description or '').lower():
+            return False
+        if self.description and self.description != (record.description or '').lower():
+            return False
+        if self.created_from and record.created_at < self.created_from:
+            return False
+        if self.created_to and record.created_at >= self.created_to:
+            return False
+        return True
+
+    def where_clause(self):
+        """Filtreleri SQL WHERE koşullarına ve parametrelerine çevirir"""
+        conditions = []
+        params = []
+        if self.active is not None:
+            conditions.append("is_active = ?")
+            params.append(int(self.active))
+        if self.expired is True:
+            conditions.append("expires_at IS NOT NULL AND expires_at <= ?")
+            params.append(self.now)
+        elif self.expired is False:
+            conditions.append("(expires_at IS NULL OR expires_at > ?)")
+            params.append(self.now)
+        if self.expires_before is not None:
+            conditions.append("expires_at > ? AND expires_at <= ?")
+            params.extend([self.now, self.expires_before])
+        if self.exhausted is True:
+            conditions.append("current_uses >= max_uses")
+        elif self.exhausted is False:
+            conditions.append("current_uses < max_uses")
+        if self.description_contains:
+            conditions.append("description LIKE ? ESCAPE '\\'")
+            params.append(f"%{_escape_like(self.description_contains)}%")
+        if self.description:
+            conditions.append("description = ?")
+            params.append(self.description)
+        if self.created_from:
+            conditions.append("created_at >= ?")
+            params.append(self.created_from)
+        if self.created_to:
+            conditions.append("created_at < ?")
+            params.append(self.created_to)
+        return conditions, params
+
+
+class MemoryKeyStore:
+    """Hash indeksli bellek içi serial key deposu; kayıtlar KeyRecord olarak tutulur"""
+
+    def __init__(self, journal=None):
+        self._keys = {}
+        self._by_active = {True: set(), False: set()}
+        self._by_description_prefix = defaultdict(set)
+        # (created, serial_key) sıralı listesi: keyset sayfalama için
+        self._order = []
+        # (expires_at, serial_key) sıralı listesi: "şu tarihe kadar dolacaklar" sorguları için
+        self._by_expiry = []
+        # Toplu eklemelerin sıralı listelere henüz birleştirilmemiş öğeleri (ilk okumada birleştirilir)
+        self._order_pending = []
+        self._expiry_pending = []
+        # Süpürücünün sıradaki süresi dolacak aktif anahtarı O(log n) bulması için min-heap
+        self._expiry_heap = []
+        self._lock = threading.Lock()
+        # Sayıları etkileyen her değişiklikte artar; yanıt önbellekleri geçersizlemede kullanır
+        self.version = 0
+        self._stripes = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        # Değişiklikler kilit altında günlüğe eklenir; fsync beklemesi kilit dışında yapılır
+        self._journal = journal
+        # Replikalar için değişiklik akışı (replication.ChangeFeed); günlükle aynı noktada beslenir
+        self.feed = None
+        # Açılışta ikincil indeksler arka planda kurulurken temizdir; onlara dokunan işlemler bekler
+        self._indexed = threading.Event()
+        self._indexed.set()
+        self.index_seconds = None
+
+    def _log(self, op, payload):
+        if self.feed is not None:
+            self.feed.append(op, payload)
+        return self._journal.append(op, payload) if self._journal is not None else 0
+
+    def _sync(self, seq):
+        if seq:
+            self._journal.wait(seq)
+
+    def _stripe(self, serial_key):
+        """Anahtara düşen şerit kilidini döndürür"""
+        return self._stripes[hash(serial_key) % LOCK_STRIPES]
+
+    def _wait_indexed(self):
+        if not self._indexed.is_set():
+            self._indexed.wait()
+
+    def wait_ready(self, timeout=None):
+        """İkincil indeksler kurulana kadar bekler; hazırsa True döner"""
+        return self._indexed.wait(timeout)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, serial_key):
+        return serial_key in self._keys
+
+    def __iter__(self):
+        return iter(list(self._keys.values()))
+
+    def get(self, serial_key):
+        """Serial key kaydını döndürür, yoksa None"""
+        return self._keys.get(serial_key)
+
+    def get_many(self, serial_keys):
+        """Verilen anahtarlardan bulunanları {serial_key: kayıt} olarak döndürür"""
+        keys = self._keys
+        return {serial_key: keys[serial_key] for serial_key in serial_keys if serial_key in keys}
+
+    def add(self, key_info):
+        """Yeni kaydı ekler; anahtar zaten varsa False döner"""
+        record = KeyRecord.from_dict(_normalize(key_info))
+        serial_key = record.serial_key
+        self._wait_indexed()
+        with self._lock:
+            if serial_key in self._keys:
+                return False
+            # Eklemeden önce günlüğe yazılır: kayıt görünür olmadan önce sıradaki redeem'lerin önüne geçer
+            seq = self._log(OP_ADD, encode_record(record))
+            self._keys[serial_key] = record
+            self._index(record)
+            self.version += 1
+        self._sync(seq)
+        return True
+
+    def add_many(self, records):
+        """Sözlük veya KeyRecord kayıtlarını tek kilitle toplu ekler; eklenen kayıtları döndürür"""
+        inserted = []
+        seq = 0
+        logged = self._journal is not None or self.feed is not None
+        self._wait_indexed()
+        with self._lock:
+            for key_info in records:
+                serial_key = key_info['serial_key']
+                if serial_key in self._keys:
+                    continue
+                if isinstance(key_info, KeyRecord):
+                    record = key_info
+                else:
+                    record = KeyRecord.from_dict(_normalize(key_info))
+                # Günlük ve akış yoksa kayıt hiç kodlanmaz
+                if logged:
+                    seq = self._log(OP_ADD, encode_record(record))
+                self._keys[serial_key] = record
+                inserted.append(record)
+            if inserted:
+                self._index_many(inserted)
+                self.version += 1
+        self._sync(seq)
+        return inserted
+
+    def existing_keys(self, serial_keys):
+        """Verilen anahtarlardan depoda bulunanları küme olarak döndürür"""
+        keys = self._keys
+        return {serial_key for serial_key in serial_keys if serial_key in keys}
+
+    def redeem(self, serial_key):
+        """Kullanım sayısını limit dahilinde artırır; limit doluysa None döner"""
+        # Global kilit yerine anahtarın şerit kilidi: farklı anahtarlar paralel ilerler
+        with self._stripe(serial_key):
+            record = self._keys.get(serial_key)
+            if record is None or not record.is_active:
+                return None
+            if record.current_uses >= record.max_uses:
+                return None
+            record.current_uses += 1
+            seq = self._log(OP_REDEEM, serial_key.encode())
+            # Yanıt, sonraki eşzamanlı artışlardan etkilenmeyen bir anlık görüntüden üretilir
+            redeemed = record.copy()
+        self._sync(seq)
+        return redeemed
+
+    def redeem_many(self, serial_keys):
+        """Anahtarları sırayla redeem eder; sonuçları girdiyle aynı sırada döndürür"""
+        return [self.redeem(serial_key) for serial_key in serial_keys]
+
+    def add_uses_many(self, counts):
+        """{serial_key: adet} kullanım artışlarını limit denetimi yapmadan uygular (replikada primary'nin kararları)"""
+        seq = 0
+        for serial_key, count in counts.items():
+            with self._stripe(serial_key):
+                record = self._keys.get(serial_key)
+                if record is None:
+                    continue
+                record.current_uses += count
+                for _ in range(count):
+                    seq = self._log(OP_REDEEM, serial_key.encode())
+        self._sync(seq)
+
+    def deactivate(self, serial_key):
+        """Serial key'i deaktif eder; kayıt yoksa None döner"""
+        self._wait_indexed()
+        with self._lock, self._stripe(serial_key):
+            record = self._keys.get(serial_key)
+            if record is None:
+                return None
+            self._set_inactive(record)
+            seq = self._log(OP_DEACTIVATE, serial_key.encode())
+        self._sync(seq)
+        return record
+
+    def update_many(self, changes, serial_keys=None, query=None):
+        """Anahtar listesindeki veya filtreye uyan kayıtları tek kilitle günceller; (eşleşen sayı, değişen anahtarlar) döndürür"""
+        changes = _normalize_changes(changes)
+        self._wait_indexed()
+        keys = self._keys
+        if serial_keys is not None:
+            candidates = list(dict.fromkeys(serial_keys))
+        elif query.description:
+            # Parti açıklaması verilmişse yalnızca açıklama önek indeksindeki kayıtlar denetlenir
+            candidates = [record.serial_key for record in self.find_by_description_prefix(query.description)]
+        else:
+            candidates = [record.serial_key for record in self.scan(query)]
+        matched = 0
+        updated = []
+        expiry_removed = set()
+        expiry_added = []
+        seq = 0
+        with self._lock:
+            self._merge_pending_locked()
+            for serial_key in candidates:
+                record = keys.get(serial_key)
+                if record is None or (query is not None and not query.matches(record)):
+                    continue
+                matched += 1
+                if all(getattr(record, field) == value for field, value in changes.items()):
+                    continue
+                was_active = record.is_active
+                old_expires_at = record.expires_at
+                with self._stripe(serial_key):
+                    for field, value in changes.items():
+                        setattr(record, field, value)
+                    seq = self._log(OP_UPDATE, encode_record(record))
+                updated.append(serial_key)
+                if record.is_active != was_active:
+                    self._by_active[was_active].discard(serial_key)
+                    self._by_active[record.is_active].add(serial_key)
+                if record.expires_at != old_expires_at:
+                    if old_expires_at is not None:
+                        expiry_removed.add((old_expires_at, serial_key))
+                    if record.expires_at is not None:
+                        expiry_added.append((record.expires_at, serial_key))
+                # Eski heap öğeleri expire_due'da expires_at karşılaştırmasıyla atlanır
+                if record.is_active and record.expires_at is not None and \
+                        (not was_active or record.expires_at != old_expires_at):
+                    heappush(self._expiry_heap, (record.expires_at, serial_key))
+            if expiry_removed or expiry_added:
+                by_expiry = self._by_expiry
+                if expiry_removed:
+                    by_expiry = [item for item in by_expiry if item not in expiry_removed]
+                self._by_expiry = _merge_sorted(by_expiry, expiry_added)
+            if updated:
+                self.version += 1
+        self._sync(seq)
+        return matched, updated
+
+    def expire_due(self, now):
+        """Süresi dolmuş aktif kayıtları toplu olarak deaktif eder; deaktif edilen sayıyı döndürür"""
+        self._wait_indexed()
+        heap = self._expiry_heap
+        expired = 0
+        seq = 0
+        with self._lock:
+            while heap and heap[0][0] <= now:
+                expires_at, serial_key = heappop(heap)
+                record = self._keys.get(serial_key)
+                # Süresi toplu güncellemeyle değişen kaydın eski öğesi atlanır
+                if record is None or not record.is_active or record.expires_at != expires_at:
+                    continue
+                with self._stripe(serial_key):
+                    self._set_inactive(record)
+                    seq = self._log(OP_DEACTIVATE, serial_key.encode())
+                expired += 1
+        self._sync(seq)
+        return expired
+
+    def _set_inactive(self, record):
+        serial_key = record.serial_key
+        self.version += 1
+        self._by_active[record.is_active].discard(serial_key)
+        record.is_active = False
+        self._by_active[False].add(serial_key)
+
+    def count(self):
+        """Toplam serial key sayısı"""
+        return len(self._keys)
+
+    def count_active(self):
+        """Aktif serial key sayısı"""
+        self._wait_indexed()
+        return len(self._by_active[True])
+
+    def find_by_active(self, is_active):
+        """Aktiflik durumuna göre kayıtları döndürür"""
+        self._wait_indexed()
+        return [self._keys[key] for key in list(self._by_active[bool(is_active)])]
+
+    def find_expiring(self, start, end):
+        """Süresi start (hariç) ile end (dahil) epoch saniyeleri arasında dolan kayıtları döndürür"""
+        self._wait_indexed()
+        if self._expiry_pending:
+            self._merge_pending()
+        low = bisect_right(self._by_expiry, (start, _KEY_MAX))
+        high = bisect_right(self._by_expiry, (end, _KEY_MAX))
+        return [self._keys[key] for _, key in self._by_expiry[low:high]]
+
+    def find_by_description_prefix(self, prefix):
+        """Açıklaması verilen önekle başlayan kayıtları döndürür"""
+        self._wait_indexed()
+        prefix = (prefix or '').lower()
+        bucket = prefix[:DESCRIPTION_PREFIX_LENGTH]
+        if len(bucket) == DESCRIPTION_PREFIX_LENGTH:
+            candidates = list(self._by_description_prefix.get(bucket, ()))
+        else:
+            candidates = [
+                key
+                for indexed, keys in list(self._by_description_prefix.items())
+                if indexed.startswith(bucket)
+                for key in list(keys)
+            ]
+        results = []
+        for key in candidates:
+            record = self._keys[key]
+            if (record.description or '').lower().startswith(prefix):
+                results.append(record)
+        return results
+
+    def page(self, query, after=None, limit=100, descending=False):
+        """(created_at, serial_key) sırasında `after` imlecinden sonraki en fazla limit kaydı döndürür"""
+        results = []
+        for record in self.scan(query, after, descending):
+            results.append(record)
+            if len(results) >= limit:
+                break
+        return results
+
+    def scan(self, query, after=None, descending=False):
+        """Filtreye uyan kayıtları sıralı olarak tek tek üretir"""
+        self._wait_indexed()
+        keys = self._keys
+        if query.expires_before is not None:
+            # Süre filtresi verilmişse yalnızca expiry indeksindeki aralık taranır
+            order = sorted((record.created, record.serial_key)
+                           for record in self.find_expiring(query.now, query.expires_before))
+        else:
+            if self._order_pending:
+                self._merge_pending()
+            order = self._order
+        # İmleç ISO metni taşır; sıralı liste tam sayı zaman damgasıyla tutulur
+        cursor = (created_timestamp(after[0]), after[1]) if after else None
+        if descending:
+            index = (bisect_left(order, cursor) if cursor else len(order)) - 1
+            step = -1
+        else:
+            index = bisect_right(order, cursor) if cursor else 0
+            step = 1
+        while 0 <= index < len(order):
+            record = keys[order[index][1]]
+            index += step
+            if query.matches(record):
+                yield record
+
+    def _index(self, record):
+        serial_key = record.serial_key
+        insort(self._order, (record.created, serial_key))
+        self._by_active[record.is_active].add(serial_key)
+        if record.expires_at is not None:
+            insort(self._by_expiry, (record.expires_at, serial_key))
+            if record.is_active:
+                heappush(self._expiry_heap, (record.expires_at, serial_key))
+        self._by_description_prefix[_description_prefix(record.description)].add(serial_key)
+
+    def _index_many(self, records):
+        """Toplu eklemede sıralı indeks öğeleri kayıt başına insort yerine bekleyen listelere eklenir"""
+        by_active = self._by_active
+        by_description_prefix = self._by_description_prefix
+        order_pending = self._order_pending
+        expiry_pending = self._expiry_pending
+        for record in records:
+            serial_key = record.serial_key
+            order_pending.append((record.created, serial_key))
+            by_active[record.is_active].add(serial_key)
+            if record.expires_at is not None:
+                expiry_pending.append((record.expires_at, serial_key))
+                if record.is_active:
+                    heappush(self._expiry_heap, (record.expires_at, serial_key))
+            by_description_prefix[_description_prefix(record.description)].add(serial_key)
+
+    def _merge_pending(self):
+        """Bekleyen toplu ekleme öğelerini sıralı listelere birleştirir"""
+        # Geçmiş tarihli kayıtlar listenin ortasına düşer: her parti için insort veya birleştirme
+        # büyük içe aktarmalarda karesel olurdu, okunana kadar tek sıralamaya ertelenir
+        with self._lock:
+            self._merge_pending_locked()
+
+    def _merge_pending_locked(self):
+        if self._order_pending:
+            self._order = _merge_sorted(self._order, self._order_pending)
+            self._order_pending = []
+        if self._expiry_pending:
+            self._by_expiry = _merge_sorted(self._by_expiry, self._expiry_pending)
+            self._expiry_pending = []
+
+    def _rebuild_indexes(self):
+        """Tüm indeksleri tek geçişte yeniden kurar (kayıt başına insort yerine tek sıralama)"""
+        keys = self._keys
+        by_active = {True: set(), False: set()}
+        by_description_prefix = defaultdict(set)
+        by_expiry = []
+        # Toplu üretilen key'ler aynı açıklamayı paylaşır: önek açıklama başına bir kez hesaplanır
+        prefixes = {}
+        for serial_key, record in keys.items():
+            by_active[record.is_active].add(serial_key)
+            description = record.description
+            prefix = prefixes.get(description)
+            if prefix is None:
+                prefix = prefixes[description] = by_description_prefix[_description_prefix(description)]
+            prefix.add(serial_key)
+            if record.expires_at is not None:
+                by_expiry.append((record.expires_at, serial_key))
+        by_expiry.sort()
+        self._order = sorted((record.created, serial_key) for serial_key, record in keys.items())
+        self._by_active = by_active
+        self._by_description_prefix = by_description_prefix
+        self._by_expiry = by_expiry
+        self._order_pending = []
+        self._expiry_pending = []
+        # Sıralı liste geçerli bir min-heap'tir
+        self._expiry_heap = [item for item in by_expiry if keys[item[1]].is_active]
+
+    def recover(self, defer_indexes=False):
+        """Son anlık görüntüyü ve günlükteki sonraki değişiklikleri yükler; (anlık görüntü, günlük) kayıt sayılarını döndürür
+
+        defer_indexes ile ikincil indeksler arka planda kurulur: get ve redeem hemen yanıt verir,
+        listeleme, sayım ve yazma işlemleri indeksler hazır olana kadar bekler.
+        """
+        # Milyonlarca uzun ömürlü nesne oluşturulurken çöp toplayıcının tekrar tekrar taraması önlenir
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._recover(defer_indexes)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _recover(self, defer_indexes=False):
+        records, entries = self._journal.recover()
+        keys = {record.serial_key: record for record in records}
+        replayed = 0
+        for op, payload in entries:
+            replayed += 1
+            if op == OP_ADD:
+                record = decode_record(payload)
+                keys.setdefault(record.serial_key, record)
+                continue
+            if op == OP_UPDATE:
+                record = decode_record(payload)
+                if record.serial_key in keys:
+                    keys[record.serial_key] = record
+                continue
+            record = keys.get(str(payload, 'utf-8'))
+            if record is None:
+                continue
+            if op == OP_REDEEM:
+                record.current_uses += 1
+            elif op == OP_DEACTIVATE:
+                record.is_active = False
+        self._replace_keys(keys, defer_indexes)
+        self._journal.snapshot_handler = self.snapshot
+        return len(records), replayed
+
+    def _replace_keys(self, keys, defer_indexes=False):
+        self._wait_indexed()
+        with self._lock:
+            self._keys = keys
+            if not defer_indexes:
+                self._rebuild_indexes()
+                self.version += 1
+                return
+            self._indexed.clear()
+        threading.Thread(target=self._build_indexes, name='index-warmup', daemon=True).start()
+
+    def _build_indexes(self):
+        started = time.perf_counter()
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with self._lock:
+                self._rebuild_indexes()
+                self.version += 1
+        finally:
+            if gc_enabled:
+                gc.enable()
+            self.index_seconds = time.perf_counter() - started
+            self._indexed.set()
+        logger.info("İkincil indeksler arka planda %.2f sn'de kuruldu", self.index_seconds)
+
+    def replace_all(self, records):
+        """Tüm kayıtları verilenlerle değiştirir ve indeksleri yeniden kurar (replikanın ilk eşitlemesi)"""
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._replace_keys({record.serial_key: record for record in records})
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    @contextmanager
+    def _frozen(self):
+        """Tüm kilitleri tutar: bu sürede hiçbir değişiklik günlüğe veya akışa eklenmez"""
+        with self._lock:
+            for stripe in self._stripes:
+                stripe.acquire()
+            try:
+                yield
+            finally:
+                for stripe in self._stripes:
+                    stripe.release()
+
+    def snapshot(self):
+        """Durumu anlık görüntüye yazar ve eski günlük segmentlerini siler; yazılan kayıt sayısını döndürür"""
+        # Tüm kilitler yalnızca segment değişimi ve kayıtların kopyalanması süresince tutulur
+        with self._frozen():
+            segment = self._journal.rotate()
+            records = [record.copy() for record in self._keys.values()]
+        return self._journal.write_snapshot(segment, records)
+
+    def feed_snapshot(self):
+        """Kayıtların tutarlı kopyasını ve o ana kadarki son akış sıra numarasını döndürür"""
+        with self._frozen():
+            seq = self.feed.seq
+            records = [record.copy() for record in self._keys.values()]
+        return seq, records
+
+    @property
+    def blocking_writes(self):
+        """Değişiklikler diske fsync edilene kadar bekler mi (günlük fsync=always)"""
+        return self._journal is not None and self._journal.fsync == 'always'
+
+    def close(self):
+        """Günlükte bekleyen kayıtları diske yazar"""
+        if self._journal is not None:
+            self._journal.close()
+
+
+class SQLiteKeyStore:
+    """WAL modunda çalışan kalıcı SQLite serial key deposu"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS serial_keys (
+            serial_key TEXT PRIMARY KEY,
+            created_at TEXT NOT NULL,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            description TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+            expiry_date TEXT,
+            max_uses INTEGER NOT NULL DEFAULT 1,
+            current_uses INTEGER NOT NULL DEFAULT 0,
+            expires_at INTEGER
+        ) WITHOUT ROWID;
+    """
+
+    INDEXES = """
+        DROP INDEX IF EXISTS idx_serial_keys_expiry;
+        CREATE INDEX IF NOT EXISTS idx_serial_keys_active ON serial_keys (is_active);
+        CREATE INDEX IF NOT EXISTS idx_serial_keys_expires_at ON serial_keys (expires_at);
+        CREATE INDEX IF NOT EXISTS idx_serial_keys_description ON serial_keys (description);
+        CREATE INDEX IF NOT EXISTS idx_serial_keys_created ON serial_keys (created_at, serial_key);
+    """
+
+    # IN (...) sorgularında tek seferde gönderilen anahtar sayısı (SQLite parametre limiti altında)
+    IN_CHUNK_SIZE = 500
+
+    COLUMNS = "serial_key, created_at, is_active, description, expiry_date, max_uses, current_uses, expires_at"
+
+    # Sabit SQL metinleri sqlite3'ün bağlantı başına önbelleğinde hazır (prepared) tutulur
+    SQL_GET = f"SELECT {COLUMNS} FROM serial_keys WHERE serial_key = ?"
+    SQL_INSERT = f"INSERT OR IGNORE INTO serial_keys ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    SQL_REDEEM = (
+        "UPDATE serial_keys SET current_uses = current_uses + 1 "
+        "WHERE serial_key = ? AND is_active = 1 AND current_uses < max_uses "
+        f"RETURNING {COLUMNS}"
+    )
+    SQL_ADD_USES = "UPDATE serial_keys SET current_uses = current_uses + ? WHERE serial_key = ?"
+    SQL_DEACTIVATE = "UPDATE serial_keys SET is_active = 0 WHERE serial_key = ?"
+    SQL_COUNT = "SELECT COUNT(*) FROM serial_keys"
+    SQL_COUNT_ACTIVE = "SELECT COUNT(*) FROM serial_keys WHERE is_active = 1"
+    SQL_ALL = f"SELECT {COLUMNS} FROM serial_keys ORDER BY created_at, serial_key"
+    SQL_BY_ACTIVE = f"SELECT {COLUMNS} FROM serial_keys WHERE is_active = ?"
+    SQL_EXPIRE_DUE = "UPDATE serial_keys SET is_active = 0 WHERE is_active = 1 AND expires_at <= ?"
+    SQL_BY_EXPIRY = f"SELECT {COLUMNS} FROM serial_keys WHERE expires_at > ? AND expires_at <= ?"
+    SQL_BY_DESCRIPTION = f"SELECT {COLUMNS} FROM serial_keys WHERE description LIKE ? ESCAPE '\\'"
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._connections = []
+        self._pool_lock = threading.Lock()
+        # Bu süreçteki değişikliklerde artar; diğer süreçlerin değişiklikleri önbellek TTL'i ile yakalanır
+        self.version = 0
+        conn = self._connection()
+        conn.executescript(self.SCHEMA)
+        self._migrate(conn)
+        conn.executescript(self.INDEXES)
+
+    def _migrate(self, conn):
+        """Eski şemaya expires_at sütununu ekler ve mevcut tarihlerden doldurur"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(serial_keys)")}
+        if 'expires_at' in columns:
+            return
+        conn.execute("ALTER TABLE serial_keys ADD COLUMN expires_at INTEGER")
+        updates = []
+        for serial_key, expiry_date in conn.execute(
+                "SELECT serial_key, expiry_date FROM serial_keys WHERE expiry_date IS NOT NULL"):
+            try:
+                updates.append((expiry_timestamp(expiry_date), serial_key))
+            except ValueError:
+                logger.warning("Geçersiz son kullanma tarihi atlandı: %s", serial_key)
+        conn.executemany("UPDATE serial_keys SET expires_at = ? WHERE serial_key = ?", updates)
+
+    def _connection(self):
+        """Thread'e ait bağlantıyı döndürür, yoksa havuza yenisini ekler"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+            with self._pool_lock:
+                self._connections.append(conn)
+        return conn
+
+    # Her yazma bir SQLite işlemidir ve diske iner
+    blocking_writes = True
+
+    def close(self):
+        """Havuzdaki tüm bağlantıları kapatır"""
+        with self._pool_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def wait_ready(self, timeout=None):
+        """Bellek deposuyla aynı arayüz; SQLite indeksleri diskte hazırdır"""
+        return True
+
+    @staticmethod
+    def _row_to_record(row):
+        return KeyRecord(row[0], created_timestamp(row[1]), bool(row[2]), row[3], row[4], row[5], row[6], row[7])
+
+    @staticmethod
+    def _record_params(key_info):
+        _normalize(key_info)
+        return (
+            key_info['serial_key'],
+            key_info['created_at'],
+            int(bool(key_info['is_active'])),
+            key_info['description'] or '',
+            key_info['expiry_date'],
+            key_info['max_uses'],
+            key_info['current_uses'],
+            key_info['expires_at']
+        )
+
+    def _query(self, sql, params=()):
+        return [self._row_to_record(row) for row in self._connection().execute(sql, params)]
+
+    def __len__(self):
+        return self.count()
+
+    def __contains__(self, serial_key):
+        return self.get(serial_key) is not None
+
+    def __iter__(self):
+        for row in self._connection().execute(self.SQL_ALL):
+            yield self._row_to_record(row)
+
+    def get(self, serial_key):
+        """Serial key kaydını döndürür, yoksa None"""
+        row = self._connection().execute(self.SQL_GET, (serial_key,)).fetchone()
+        return self._row_to_record(row) if row else None
+
+    def get_many(self, serial_keys):
+        """Verilen anahtarlardan bulunanları {serial_key: kayıt} olarak döndürür"""
+        serial_keys = list(serial_keys)
+        conn = self._connection()
+        found = {}
+        for start in range(0, len(serial_keys), self.IN_CHUNK_SIZE):
+            chunk = serial_keys[start:start + self.IN_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            sql = f"SELECT {self.COLUMNS} FROM serial_keys WHERE serial_key IN ({placeholders})"
+            for row in conn.execute(sql, chunk):
+                found[row[0]] = self._row_to_record(row)
+        return found
+
+    def add(self, key_info):
+        """Yeni kaydı ekler; anahtar zaten varsa False döner"""
+        cursor = self._connection().execute(self.SQL_INSERT, self._record_params(key_info))
+        if cursor.rowcount == 1:
+            self.version += 1
+            return True
+        return False
+
+    def add_many(self, records):
+        """Sözlük veya KeyRecord kayıtlarını tek transaction içinde toplu ekler; eklenen kayıtları döndürür"""
+        records = list(records)
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            existing = self.existing_keys([key_info['serial_key'] for key_info in records])
+            inserted = []
+            seen = set(existing)
+            for key_info in records:
+                if key_info['serial_key'] not in seen:
+                    seen.add(key_info['serial_key'])
+                    inserted.append(key_info)
+            conn.executemany(self.SQL_INSERT, [self._record_params(key_info) for key_info in inserted])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if inserted:
+            self.version += 1
+        return inserted
+
+    def existing_keys(self, serial_keys):
+        """Verilen anahtarlardan depoda bulunanları küme olarak döndürür"""
+        serial_keys = list(serial_keys)
+        conn = self._connection()
+        found = set()
+        for start in range(0, len(serial_keys), self.IN_CHUNK_SIZE):
+            chunk = serial_keys[start:start + self.IN_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            sql = f"SELECT serial_key FROM serial_keys WHERE serial_key IN ({placeholders})"
+            found.update(row[0] for row in conn.execute(sql, chunk))
+        return found
+
+    def redeem(self, serial_key):
+        """Tek atomik UPDATE ile kullanım sayısını artırır; limit doluysa None döner"""
+        row = self._connection().execute(self.SQL_REDEEM, (serial_key,)).fetchone()
+        return self._row_to_record(row) if row else None
+
+    def redeem_many(self, serial_keys):
+        """Anahtarları tek transaction içinde redeem eder; sonuçlar girdiyle aynı sırada döner"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            results = []
+            for serial_key in serial_keys:
+                row = conn.execute(self.SQL_REDEEM, (serial_key,)).fetchone()
+                results.append(self._row_to_record(row) if row else None)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return results
+
+    def add_uses_many(self, counts):
+        """{serial_key: adet} kullanım artışlarını tek transaction içinde uygular"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(self.SQL_ADD_USES, [(count, serial_key) for serial_key, count in counts.items()])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def update_many(self, changes, serial_keys=None, query=None):
+        """Anahtar listesindeki veya filtreye uyan kayıtları tek transaction içinde günceller; (eşleşen sayı, değişen anahtarlar) döndürür"""
+        changes = _normalize_changes(changes)
+        assignments = ', '.join(f"{field} = ?" for field in changes)
+        # Zaten istenen değerde olan kayıtlar yazılmaz ve değişenlere sayılmaz
+        changed = ' OR '.join(f"{field} IS NOT ?" for field in changes)
+        values = list(changes.values())
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            matched = 0
+            updated = []
+            if serial_keys is not None:
+                serial_keys = list(dict.fromkeys(serial_keys))
+                for start in range(0, len(serial_keys), self.IN_CHUNK_SIZE):
+                    chunk = serial_keys[start:start + self.IN_CHUNK_SIZE]
+                    where = f"serial_key IN ({','.join('?' * len(chunk))})"
+                    matched += conn.execute(f"SELECT COUNT(*) FROM serial_keys WHERE {where}", chunk).fetchone()[0]
+                    sql = f"UPDATE serial_keys SET {assignments} WHERE {where} AND ({changed}) RETURNING serial_key"
+                    updated.extend(row[0] for row in conn.execute(sql, values + chunk + values))
+            else:
+                conditions, params = query.where_clause()
+                where = ' AND '.join(conditions) or '1'
+                matched = conn.execute(f"SELECT COUNT(*) FROM serial_keys WHERE {where}", params).fetchone()[0]
+                sql = f"UPDATE serial_keys SET {assignments} WHERE {where} AND ({changed}) RETURNING serial_key"
+                updated.extend(row[0] for row in conn.execute(sql, values + params + values))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if updated:
+            self.version += 1
+        return matched, updated
+
+    def deactivate(self, serial_key):
+        """Serial key'i deaktif eder; kayıt yoksa None döner"""
+        cursor = self._connection().execute(self.SQL_DEACTIVATE, (serial_key,))
+        if cursor.rowcount == 0:
+            return None
+        self.version += 1
+        return self.get(serial_key)
+
+    def expire_due(self, now):
+        """Süresi dolmuş aktif kayıtları tek UPDATE ile deaktif eder; deaktif edilen sayıyı döndürür"""
+        expired = self._connection().execute(self.SQL_EXPIRE_DUE, (now,)).rowcount
+        if expired:
+            self.version += 1
+        return expired
+
+    def count(self):
+        """Toplam serial key sayısı"""
+        return self._connection().execute(self.SQL_COUNT).fetchone()[0]
+
+    def count_active(self):
+        """Aktif serial key sayısı"""
+        return self._connection().execute(self.SQL_COUNT_ACTIVE).fetchone()[0]
+
+    def find_by_active(self, is_active):
+        """Aktiflik durumuna göre kayıtları döndürür"""
+        return self._query(self.SQL_BY_ACTIVE, (int(bool(is_active)),))
+
+    def find_expiring(self, start, end):
+        """Süresi start (hariç) ile end (dahil) epoch saniyeleri arasında dolan kayıtları döndürür"""
+        return self._query(self.SQL_BY_EXPIRY, (start, end))
+
+    def find_by_description_prefix(self, prefix):
+        """Açıklaması verilen önekle başlayan kayıtları döndürür"""
+        return self._query(self.SQL_BY_DESCRIPTION, (_escape_like(prefix or '') + '%',))
+
+    def page(self, query, after=None, limit=100, descending=False):
+        """(created_at, serial_key) sırasında `after` imlecinden sonraki en fazla limit kaydı döndürür"""
+        sql, params = self._scan_sql(query, after, descending)
+        return self._query(sql + " LIMIT ?", params + [limit])
+
+    def scan(self, query, after=None, descending=False):
+        """Filtreye uyan kayıtları sıralı olarak tek tek üretir"""
+        sql, params = self._scan_sql(query, after, descending)
+        for row in self._connection().execute(sql, params):
+            yield self._row_to_record(row)
+
+    def _scan_sql(self, query, after, descending):
+        conditions, params = query.where_clause()
+        if after:
+            conditions.append("(created_at, serial_key) < (?, ?)" if descending else "(created_at, serial_key) > (?, ?)")
+            params.extend(after)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        direction = "DESC" if descending else "ASC"
+        sql = f"SELECT {self.COLUMNS} FROM serial_keys{where} ORDER BY created_at {direction}, serial_key {direction}"
+        return sql, params
+
+
+class ExpirySweeper(threading.Thread):
+    """Süresi dolan serial key'leri arka planda toplu olarak deaktif eder"""
+
+    def __init__(self, store, interval):
+        super().__init__(name='expiry-sweeper', daemon=True)
+        self.store = store
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.sweep()
+
+    def sweep(self):
+        """Tek bir süpürme turu çalıştırır; deaktif edilen sayıyı döndürür"""
+        try:
+            return self.store.expire_due(int(time.time()))
+        except Exception:
+            logger.exception("Süresi dolan serial key'ler deaktif edilemedi")
+            return 0
+
+    def stop(self):
+        self._stop_event.set()
+
+
+def create_store(backend='memory', path='serial_keys.db', journal_dir=None, defer_indexes=False, **journal_options):
+    """Yapılandırmaya göre depo motorunu oluşturur"""
+    if backend == 'memory':
+        if journal_dir is None:
+            return MemoryKeyStore()
+        store = MemoryKeyStore(Journal(journal_dir, **journal_options))
+        started = time.perf_counter()
+        snapshot_records, replayed = store.recover(defer_indexes)
+        logger.info("Günlükten %d serial key yüklendi (anlık görüntü: %d, günlük kaydı: %d) %.2f sn",
+                    store.count(), snapshot_records, replayed, time.perf_counter() - started)
+        return store
+    if backend == 'sqlite':
+        return SQLiteKeyStore(path)
+    raise ValueError(f"Bilinmeyen depo motoru: {backend}")
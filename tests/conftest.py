@@ -0,0 +1,67 @@
+"""
+Ortak fixture'lar.
+
+app modülü tek bir uygulama tutar; her test create_app(config) ile kendi
+geçici dizinindeki depoyla yeniden kurar. Arka plan süpürücüsü ve istek
+sınırlama kapalıdır, ısınma senkron yapılır.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import app as serial_app
+
+ADMIN_PASSWORD = 'test-password'
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Verilen ayarlarla (environment değişkeni adlarıyla) uygulamayı kurar"""
+    def make(**config):
+        settings = {
+            "SERIAL_STORE_BACKEND": 'memory',
+            "SERIAL_DB_PATH": str(tmp_path / 'serial_keys.db'),
+            "ADMIN_PASSWORD": ADMIN_PASSWORD,
+            "EXPIRY_SWEEP_INTERVAL": '0',
+            "RATE_LIMIT_ENABLED": '0',
+            "STARTUP_WARMUP": 'sync'
+        }
+        settings.update(config)
+        return serial_app.create_app(settings)
+
+    yield make
+    serial_app.shutdown()
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def client(request, make_app):
+    return make_app(SERIAL_STORE_BACKEND=request.param).test_client()
+
+
+@pytest.fixture
+def add_key(client):
+    """add-serial ile key ekler ve serial key'i döndürür"""
+    def add(serial_key=None, **fields):
+        body = dict(fields, password=ADMIN_PASSWORD)
+        if serial_key is not None:
+            body['serial_key'] = serial_key
+        response = client.post('/api/add-serial', json=body)
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()['data']['serial_key']
+
+    return add
+
+
+def hammer(func, attempts, threads=8):
+    """func'ı aynı anda threads thread'den toplam attempts kez çağırır; sonuçları döndürür"""
+    barrier = threading.Barrier(threads)
+
+    def worker(count):
+        barrier.wait()
+        return [func() for _ in range(count)]
+
+    with ThreadPoolExecutor(threads) as executor:
+        chunks = executor.map(worker, [attempts // threads] * threads)
+    return [result for chunk in chunks for result in chunk]
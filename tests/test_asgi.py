@@ -0,0 +1,104 @@
+"""ASGI giriş noktası"""
+
+import asyncio
+import json
+
+import pytest
+
+import app as serial_app
+import asgi
+from conftest import ADMIN_PASSWORD
+
+
+def call(method, path, body=None, query=b''):
+    """ASGI uygulamasına tek istek gönderir; (durum, JSON gövde) döndürür"""
+    messages = []
+    raw = json.dumps(body).encode() if body is not None else b''
+
+    async def receive():
+        return {"type": 'http.request', "body": raw, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": 'http', "method": method, "path": path, "query_string": query,
+             "headers": [(b'content-type', b'application/json')], "client": ('127.0.0.1', 50000)}
+    asyncio.run(asgi.application(scope, receive, send))
+    content = b''.join(message.get('body', b'') for message in messages[1:])
+    return messages[0]['status'], json.loads(content) if content else None
+
+
+def raw_request(data):
+    """Yerleşik sunucuya ham HTTP isteği gönderir; bağlantı kapanana kadar gelen yanıtı döndürür"""
+    async def exchange():
+        server = await asyncio.start_server(lambda r, w: asgi._handle_connection(r, w, asgi.application),
+                                            '127.0.0.1', 0, limit=asgi.MAX_HEADER_BYTES)
+        async with server:
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            writer.write(data)
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return response
+
+    return asyncio.run(exchange())
+
+
+def test_add_check_and_deactivate(client):
+    status, payload = call('POST', '/api/add-serial', {"password": ADMIN_PASSWORD, "max_uses": 1})
+    assert status == 201
+    serial_key = payload['data']['serial_key']
+
+    assert call('GET', f'/api/check-serial/{serial_key}')[0] == 200
+    status, payload = call('GET', f'/api/check-serial/{serial_key}')
+    assert (status, payload['message']) == (400, "Serial key kullanım limiti dolmuş")
+
+    assert call('POST', f'/api/deactivate-serial/{serial_key}', {"password": ADMIN_PASSWORD})[0] == 200
+    # ASGI ve Flask aynı depoyu kullanır
+    assert client.get(f'/api/check-serial/{serial_key}').get_json()['message'] == "Serial key deaktif"
+
+
+def test_admin_routes_require_password(client):
+    assert call('POST', '/api/add-serial', {})[0] == 400
+    assert call('POST', '/api/add-serial', {"password": 'wrong'})[0] == 401
+    status, payload = call('POST', '/api/list-serials', {"password": ADMIN_PASSWORD})
+    assert (status, payload['count']) == (200, 0)
+
+
+def test_unknown_route_and_method(client):
+    assert call('GET', '/api/nothing')[0] == 404
+    assert call('POST', '/health')[0] == 405
+
+
+def test_replica_rejects_writes(make_app):
+    make_app(REPLICA_OF='http://127.0.0.1:9', REPLICATION_TOKEN='replication-token', REPLICA_STARTUP_TIMEOUT='0.1')
+
+    assert call('POST', '/api/add-serial', {"password": ADMIN_PASSWORD})[0] == 403
+    assert call('POST', '/api/deactivate-serial/AAAA-BBBB-CCCC-DDDD', {"password": ADMIN_PASSWORD})[0] == 403
+    assert len(serial_app.key_store) == 0
+
+
+def test_oversized_body_is_rejected_before_reading(client):
+    # Gövde hiç gönderilmez: sunucu onu beklemeden yanıt vermeli
+    response = raw_request(b'POST /api/add-serial HTTP/1.1\r\ncontent-length: %d\r\n\r\n' % (asgi.MAX_BODY_BYTES + 1))
+
+    assert response.startswith(b'HTTP/1.1 413 ')
+
+
+def test_error_after_streaming_started_closes_connection(client, monkeypatch):
+    def rows():
+        yield 'serial_key\n'
+        raise RuntimeError('disk')
+
+    monkeypatch.setattr(serial_app, 'list_serials_result',
+                        lambda data, authorization: (serial_app.ExportStream(rows(), 'text/csv'), 200))
+    body = json.dumps({"password": ADMIN_PASSWORD, "format": 'csv'}).encode()
+
+    with pytest.raises(RuntimeError):
+        call('POST', '/api/list-serials', {"password": ADMIN_PASSWORD, "format": 'csv'})
+    response = raw_request(b'POST /api/list-serials HTTP/1.1\r\ncontent-length: %d\r\n\r\n%s' % (len(body), body))
+
+    # İkinci bir durum satırı yazılmaz, chunked gövde sonlandırılmadan bağlantı kapanır
+    assert response.startswith(b'HTTP/1.1 200 ')
+    assert response.count(b'HTTP/1.1') == 1
+    assert b'serial_key' in response and not response.endswith(b'0\r\n\r\n')
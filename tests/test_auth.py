@@ -0,0 +1,41 @@
+"""Admin girişi ve bearer token'lar"""
+
+from conftest import ADMIN_PASSWORD
+
+
+def login(client, password=ADMIN_PASSWORD):
+    return client.post('/api/admin/login', json={"password": password})
+
+
+def bearer(token):
+    return {"Authorization": f'Bearer {token}'}
+
+
+def test_token_authorizes_admin_routes(client):
+    response = login(client)
+    assert response.status_code == 200
+    token = response.get_json()['data']['token']
+
+    added = client.post('/api/add-serial', json={"max_uses": 2}, headers=bearer(token))
+    assert added.status_code == 201
+    listing = client.post('/api/list-serials', json={}, headers=bearer(token))
+    assert listing.get_json()['count'] == 1
+
+
+def test_wrong_password_and_bad_tokens_are_rejected(client):
+    assert login(client, 'wrong').status_code == 401
+    assert client.post('/api/admin/login', json={}).status_code == 400
+
+    token = login(client).get_json()['data']['token']
+    payload, signature = token.split('.')
+    for bad in (f'{payload}.{signature[::-1]}', 'not-a-token', ''):
+        response = client.post('/api/add-serial', json={}, headers=bearer(bad))
+        assert response.status_code == 401
+        assert response.get_json()['message'] == "Geçersiz veya süresi dolmuş token"
+
+
+def test_expired_token_is_rejected(make_app):
+    client = make_app(ADMIN_TOKEN_TTL='0').test_client()
+    token = login(client).get_json()['data']['token']
+
+    assert client.post('/api/add-serial', json={}, headers=bearer(token)).status_code == 401
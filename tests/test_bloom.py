@@ -0,0 +1,35 @@
+"""Olmayan key'leri depoya gitmeden eleyen Bloom filtresi"""
+
+import pytest
+
+import app as serial_app
+from bloom import BloomFilter
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def client(request, make_app):
+    return make_app(SERIAL_STORE_BACKEND=request.param, BLOOM_FILTER='on').test_client()
+
+
+def test_no_false_negatives_and_bounded_fp_rate():
+    bloom = BloomFilter(1000, 0.01)
+    serial_keys = [f'AAAA-BBBB-CCCC-{number:04d}' for number in range(1000)]
+    for serial_key in serial_keys:
+        bloom.add(serial_key)
+
+    assert all(serial_key in bloom for serial_key in serial_keys)
+    assert sum(f'XXXX-YYYY-{number:04d}-ZZZZ' in bloom for number in range(10_000)) < 300
+
+
+def test_unknown_keys_are_shed(client, add_key):
+    serial_keys = [add_key(max_uses=5) for _ in range(5)]
+
+    for number in range(200):
+        assert client.get(f'/api/check-serial/ZZZZ-ZZZZ-ZZZZ-{number:04d}').status_code == 404
+    assert all(client.get(f'/api/check-serial/{serial_key}').status_code == 200 for serial_key in serial_keys)
+
+    bloom = serial_app.bloom_filter
+    assert bloom.count == 5
+    # Olmayan her sorgu ya filtrede elenir ya da yanlış pozitif olarak sayılır
+    assert bloom.negatives + bloom.false_positives == 200
+    assert bloom.false_positives < 20
@@ -0,0 +1,46 @@
+"""Toplu serial key üretimi"""
+
+import csv
+import io
+import json
+
+import pytest
+
+import app as serial_app
+from conftest import ADMIN_PASSWORD
+
+
+def generate(client, **body):
+    return client.post('/api/add-serials/bulk', json=dict(body, password=ADMIN_PASSWORD))
+
+
+def test_ndjson_stream_adds_every_key(client, monkeypatch):
+    # Küçük partiler: akış birden çok parti boyunca sürer
+    monkeypatch.setattr(serial_app, 'BULK_BATCH_SIZE', 100)
+
+    response = generate(client, count=250, max_uses=2, description='batch')
+
+    assert response.status_code == 201
+    assert response.mimetype == 'application/x-ndjson'
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len({row['serial_key'] for row in rows}) == 250
+    assert len(serial_app.key_store) == 250
+    # Üretilen key'ler hemen sorgulanabilir
+    check = client.get(f"/api/check-serial/{rows[-1]['serial_key']}")
+    assert check.get_json()['data']['remaining_uses'] == 1
+
+
+def test_csv_stream(client):
+    response = generate(client, count=3, format='csv')
+
+    assert response.mimetype == 'text/csv'
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert len(rows) == 3
+    assert all(row['serial_key'] in serial_app.key_store for row in rows)
+
+
+@pytest.mark.parametrize('body', [{"count": 0}, {"count": 'ten'}, {"count": 2, "format": 'xml'},
+                                  {"count": 2, "max_uses": 0}])
+def test_invalid_requests(client, body):
+    assert generate(client, **body).status_code == 400
+    assert len(serial_app.key_store) == 0
@@ -0,0 +1,129 @@
+"""Key listesi veya filtreyle toplu güncelleme"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as serial_app
+from conftest import ADMIN_PASSWORD
+
+
+def bulk_update(client, **body):
+    return client.post('/api/serials/bulk-update', json=dict(body, password=ADMIN_PASSWORD))
+
+
+def check(client, serial_key, consume=False):
+    return client.get(f'/api/check-serial/{serial_key}?consume={str(consume).lower()}')
+
+
+def test_deactivate_and_reactivate_by_list(client, add_key):
+    serial_keys = [add_key() for _ in range(3)]
+
+    response = bulk_update(client, action='deactivate', serial_keys=serial_keys[:2] + ['NONE-XIST-ING0-KEY0'])
+
+    summary = response.get_json()
+    assert (summary['matched'], summary['updated'], summary['not_found']) == (2, 2, 1)
+    assert check(client, serial_keys[0]).status_code == 400
+    assert check(client, serial_keys[2]).status_code == 200
+
+    # Zaten aktif olan key eşleşir ama güncellenmiş sayılmaz
+    summary = bulk_update(client, action='reactivate', serial_keys=serial_keys).get_json()
+    assert (summary['matched'], summary['updated']) == (3, 2)
+    assert check(client, serial_keys[0]).status_code == 200
+
+
+def test_filter_selects_matching_keys(client, add_key):
+    tagged = [add_key(description='campaign') for _ in range(4)]
+    other = add_key(description='other')
+
+    summary = bulk_update(client, action='set-max-uses', value=7, filter={"description": 'campaign'}).get_json()
+
+    assert summary['updated'] == 4
+    assert all(serial_app.key_store.get(serial_key).max_uses == 7 for serial_key in tagged)
+    assert serial_app.key_store.get(other).max_uses == 1
+
+
+def test_set_expiry_and_clear(client, add_key):
+    serial_key = add_key()
+    expiry = (datetime.now() + timedelta(days=30)).replace(microsecond=0).isoformat()
+
+    bulk_update(client, action='set-expiry', value=expiry, serial_keys=[serial_key])
+    assert check(client, serial_key).get_json()['data']['expiry_date'] == expiry
+    expiring = client.post('/api/list-serials', json={"password": ADMIN_PASSWORD, "expiring_within_days": 31})
+    assert [key['serial_key'] for key in expiring.get_json()['data']] == [serial_key]
+
+    bulk_update(client, action='set-expiry', value=None, serial_keys=[serial_key])
+    assert check(client, serial_key).get_json()['data']['expiry_date'] is None
+
+
+def test_set_expiry_reports_swept_keys_as_inactive(client, add_key):
+    serial_key = add_key(expiry_date=(datetime.now() + timedelta(days=1)).isoformat())
+    # Süpürücü turu iki gün sonrasıymış gibi çalıştırılır
+    assert serial_app.key_store.expire_due(int(datetime.now().timestamp()) + 2 * 86400) == 1
+    expiry = (datetime.now() + timedelta(days=30)).isoformat()
+
+    summary = bulk_update(client, action='set-expiry', value=expiry, serial_keys=[serial_key]).get_json()
+
+    assert (summary['updated'], summary['inactive']) == (1, 1)
+    assert check(client, serial_key).get_json()['message'] == "Serial key deaktif"
+    bulk_update(client, action='reactivate', serial_keys=[serial_key])
+    assert check(client, serial_key).status_code == 200
+
+
+def test_reset_uses_reopens_exhausted_keys(client, add_key):
+    serial_key = add_key(max_uses=1)
+    assert check(client, serial_key, consume=True).status_code == 200
+    assert check(client, serial_key).status_code == 400
+
+    summary = bulk_update(client, action='reset-uses', filter={"exhausted": True}).get_json()
+
+    assert summary['updated'] == 1
+    assert check(client, serial_key, consume=True).status_code == 200
+
+
+def test_stream_lists_updated_keys_then_summary(client, add_key):
+    serial_keys = [add_key(description='stream') for _ in range(3)]
+
+    response = bulk_update(client, action='deactivate', filter={"description": 'stream'}, stream=True)
+
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert sorted(line['serial_key'] for line in lines[:-1]) == sorted(serial_keys)
+    assert lines[-1]['updated'] == 3 and lines[-1]['action'] == 'deactivate'
+
+
+def test_unrecognised_filter_changes_nothing(client, add_key):
+    serial_keys = [add_key(description='campaign') for _ in range(3)]
+
+    response = bulk_update(client, action='deactivate', filter={"batch_id": 'X'})
+    assert response.status_code == 400
+    assert response.get_json()['message'].startswith("Bilinmeyen filtre alanı: batch_id")
+    # Yanlış yazılmış veya boşa çıkan filtre tüm depoyu seçmemeli
+    for selector in ({"descripton": 'campaign'}, {"description": ''}, {"created_from": None}):
+        assert bulk_update(client, action='deactivate', filter=selector).status_code == 400, selector
+
+    assert all(check(client, serial_key).status_code == 200 for serial_key in serial_keys)
+
+
+@pytest.mark.parametrize('body', [
+    {"action": 'explode', "serial_keys": ['AAAA-BBBB-CCCC-DDDD']},
+    {"action": 'deactivate'},
+    {"action": 'deactivate', "filter": {}},
+    {"action": 'deactivate', "filter": {"active": None}},
+    {"action": 'deactivate', "serial_keys": []},
+    {"action": 'deactivate', "serial_keys": ['AAAA-BBBB-CCCC-DDDD'], "filter": {"active": True}},
+    {"action": 'set-max-uses', "value": 0, "serial_keys": ['AAAA-BBBB-CCCC-DDDD']},
+    {"action": 'set-expiry', "value": '2000-01-01T00:00:00', "serial_keys": ['AAAA-BBBB-CCCC-DDDD']},
+    {"action": 'deactivate', "serial_keys": ['AAAA-BBBB-CCCC-DDDD'], "stream": 'yes'}
+])
+def test_invalid_requests(client, body):
+    assert bulk_update(client, **body).status_code == 400
+
+
+def test_requires_admin(client, add_key):
+    serial_key = add_key()
+    body = {"action": 'deactivate', "serial_keys": [serial_key]}
+    assert client.post('/api/serials/bulk-update', json=body).status_code == 400
+    assert client.post('/api/serials/bulk-update', json=dict(body, password='wrong')).status_code == 401
+    assert check(client, serial_key).status_code == 200
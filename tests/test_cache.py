@@ -0,0 +1,22 @@
+"""Ön kodlanmış yanıtlar ve ETag ile yeniden doğrulama"""
+
+
+def test_if_none_match_returns_304(client):
+    for path in ('/', '/api/admin-info', '/health'):
+        response = client.get(path)
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+
+        revalidated = client.get(path, headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.data == b''
+
+
+def test_health_changes_after_write(client, add_key):
+    etag = client.get('/health').headers['ETag']
+
+    add_key()
+
+    response = client.get('/health', headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
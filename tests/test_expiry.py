@@ -0,0 +1,24 @@
+"""Son kullanma tarihi indeksi ve süresi dolan key'lerin süpürülmesi"""
+
+import time
+from datetime import datetime, timedelta
+
+import app as serial_app
+
+
+def test_expire_due_deactivates_expired_keys(client, add_key):
+    expiring = add_key(expiry_date=(datetime.now() + timedelta(days=1)).isoformat())
+    later = add_key(expiry_date=(datetime.now() + timedelta(days=10)).isoformat())
+    unlimited = add_key()
+
+    # Süpürme iki gün sonrasının saatiyle çalıştırılır
+    assert serial_app.key_store.expire_due(int(time.time()) + 2 * 86400) == 1
+
+    response = client.get(f'/api/check-serial/{expiring}')
+    assert response.status_code == 400
+    assert response.get_json()['message'] == "Serial key deaktif"
+    assert client.get(f'/api/check-serial/{later}').status_code == 200
+    assert client.get(f'/api/check-serial/{unlimited}').status_code == 200
+    # Deaktif edilen key bir sonraki turda yeniden sayılmaz
+    assert serial_app.key_store.expire_due(int(time.time()) + 2 * 86400) == 0
+
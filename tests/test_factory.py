@@ -0,0 +1,27 @@
+"""create_app fabrikası ve arka planda ısınma"""
+
+import app as serial_app
+from conftest import ADMIN_PASSWORD
+
+
+def test_create_app_without_config_returns_current_app(make_app):
+    built = make_app()
+    assert serial_app.create_app() is built
+    assert serial_app.key_store is not None
+
+
+def test_background_warmup_serves_journal_keys(make_app, tmp_path):
+    journal = {"SERIAL_JOURNAL_DIR": str(tmp_path / 'journal')}
+    client = make_app(**journal).test_client()
+    response = client.post('/api/add-serial', json={"password": ADMIN_PASSWORD, "max_uses": 2})
+    serial_key = response.get_json()['data']['serial_key']
+
+    client = make_app(STARTUP_WARMUP='background', **journal).test_client()
+
+    # Kayıtlar yüklenir yüklenmez sorgulanabilir; indeksler arka planda kurulur
+    assert client.get(f'/api/check-serial/{serial_key}').status_code == 200
+    serial_app.wait_warm()
+    listing = client.post('/api/list-serials', json={"password": ADMIN_PASSWORD})
+    assert listing.get_json()['count'] == 1
+    startup = client.get('/health').get_json()['startup']
+    assert startup['warmup_seconds'] is not None
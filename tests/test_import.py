@@ -0,0 +1,50 @@
+"""CSV/NDJSON içe aktarma"""
+
+import json
+
+import pytest
+
+import app as serial_app
+from conftest import ADMIN_PASSWORD
+
+
+@pytest.fixture
+def headers(client):
+    token = client.post('/api/admin/login', json={"password": ADMIN_PASSWORD}).get_json()['data']['token']
+    return {"Authorization": f'Bearer {token}'}
+
+
+def import_rows(client, headers, body, content_type):
+    response = client.post('/api/import-serials', data=body, headers=dict(headers, **{"Content-Type": content_type}))
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_ndjson_import(client, headers):
+    body = '\n'.join(json.dumps(row) for row in [
+        {"serial_key": 'IMPO-RT00-0000-0001', "max_uses": 3, "current_uses": 1, "description": 'a'},
+        {"serial_key": 'IMPO-RT00-0000-0002', "expiry_date": '2099-01-01T00:00:00'},
+        {"serial_key": 'IMPO-RT00-0000-0001'},
+        {"serial_key": 'not-a-key'}
+    ])
+
+    rows = import_rows(client, headers, body, 'application/x-ndjson')
+
+    assert rows[-1]['summary']['imported'] == 2
+    assert len(rows) == 3
+    record = serial_app.key_store.get('IMPO-RT00-0000-0001')
+    assert (record.max_uses, record.current_uses, record.description) == (3, 1, 'a')
+    assert serial_app.key_store.get('IMPO-RT00-0000-0002').expires_at is not None
+    # İçe aktarılan key'ler sorgulanabilir
+    assert client.get('/api/check-serial/IMPO-RT00-0000-0002').status_code == 200
+
+
+def test_csv_roundtrip_skips_existing_keys(client, headers, add_key):
+    serial_keys = [add_key(max_uses=4, description='export') for _ in range(3)]
+    export = client.post('/api/list-serials', json={"password": ADMIN_PASSWORD, "format": 'csv'})
+
+    rows = import_rows(client, headers, export.get_data(), 'text/csv')
+
+    assert rows[-1]['summary']['imported'] == 0
+    assert len(rows) == 1 + len(serial_keys)
+    assert len(serial_app.key_store) == 3
@@ -0,0 +1,106 @@
+"""Bellek deposunun günlükten ve anlık görüntüden geri yüklenmesi"""
+
+import os
+
+import pytest
+
+import app as serial_app
+from conftest import ADMIN_PASSWORD
+
+
+@pytest.fixture
+def journal_dir(tmp_path):
+    return tmp_path / 'journal'
+
+
+@pytest.fixture
+def open_app(make_app, journal_dir):
+    """Aynı günlük dizinini kullanan uygulamayı (yeniden) kurar ve test istemcisini döndürür"""
+    def open_(**config):
+        return make_app(SERIAL_JOURNAL_DIR=str(journal_dir), JOURNAL_FSYNC='always', **config).test_client()
+
+    return open_
+
+
+def add(client, **fields):
+    response = client.post('/api/add-serial', json=dict(fields, password=ADMIN_PASSWORD))
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['data']['serial_key']
+
+
+def segments(journal_dir):
+    return sorted(journal_dir.glob('journal-*.log'))
+
+
+def test_replay_restores_every_change(open_app):
+    client = open_app()
+    redeemed = add(client, max_uses=3, description='redeemed')
+    deactivated = add(client, description='deactivated')
+    updated = add(client, max_uses=1)
+    assert client.get(f'/api/check-serial/{redeemed}').status_code == 200
+    client.post(f'/api/deactivate-serial/{deactivated}', json={"password": ADMIN_PASSWORD})
+    client.post('/api/serials/bulk-update', json={
+        "password": ADMIN_PASSWORD, "action": 'set-max-uses', "value": 9, "serial_keys": [updated]
+    })
+
+    client = open_app()
+
+    assert len(serial_app.key_store) == 3
+    record = serial_app.key_store.get(redeemed)
+    assert (record.current_uses, record.max_uses, record.description) == (1, 3, 'redeemed')
+    assert not serial_app.key_store.get(deactivated).is_active
+    assert serial_app.key_store.get(updated).max_uses == 9
+    # Geri yüklenen key'ler Bloom filtresinde de bulunur
+    assert client.get(f'/api/check-serial/{redeemed}?consume=false').status_code == 200
+
+
+def test_replay_after_snapshot(open_app, journal_dir):
+    client = open_app()
+    before = add(client)
+    serial_app.key_store.snapshot()
+    after = add(client, max_uses=2)
+    assert client.get(f'/api/check-serial/{after}').status_code == 200
+
+    open_app()
+
+    assert list(journal_dir.glob('snapshot-*.bin'))
+    assert before in serial_app.key_store
+    assert serial_app.key_store.get(after).current_uses == 1
+
+
+def test_torn_tail_is_dropped(open_app, journal_dir):
+    client = open_app()
+    kept = add(client)
+    serial_app.shutdown()
+    # Yazılırken kesilen kayıt: yalnızca çerçeve başlığının bir kısmı diske inmiş
+    with open(segments(journal_dir)[-1], 'ab') as f:
+        f.write(b'\x40\x00')
+
+    client = open_app()
+
+    assert len(serial_app.key_store) == 1 and kept in serial_app.key_store
+    # Yeni kayıtlar yarım kaydın arkasına değil yeni segmente yazılır
+    added = add(client)
+    open_app()
+    assert len(serial_app.key_store) == 2 and added in serial_app.key_store
+
+
+def test_crc_mismatch_truncates_replay(open_app, journal_dir):
+    client = open_app()
+    first = add(client)
+    second = add(client)
+    serial_app.shutdown()
+    # Son kaydın son baytı bozulur: CRC tutmaz, o kayıttan itibaren oynatma durur
+    path = segments(journal_dir)[-1]
+    with open(path, 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+
+    client = open_app()
+
+    assert first in serial_app.key_store
+    assert second not in serial_app.key_store
+    assert client.get(f'/api/check-serial/{first}?consume=false').status_code == 200
+    assert client.get(f'/api/check-serial/{second}?consume=false').status_code == 404
@@ -0,0 +1,26 @@
+"""JSON kodlama ve ön kodlanmış hata yanıtları"""
+
+import json
+
+import json_provider
+
+PAYLOAD = {"message": 'Serial key geçerli', "data": [1, 2 ** 70, None, True, 1.5], "count": {"z": '', "a": False}}
+
+
+def test_dumps_is_compact_sorted_and_lossless():
+    encoded = json_provider.dumps(PAYLOAD)
+
+    # 64 biti aşan tam sayı standart kütüphaneye düşülerek korunur
+    assert json.loads(encoded) == PAYLOAD
+    assert list(json.loads(encoded)) == sorted(PAYLOAD)
+    assert b', ' not in encoded and b': ' not in encoded
+    assert json.loads(json_provider._stdlib_dumps(PAYLOAD)) == PAYLOAD
+
+
+def test_error_templates_match_jsonify(client):
+    for path, message in (('/api/check-serial/ABCD', "Geçersiz serial key formatı"),
+                          ('/api/check-serial/ABCD-EFGH-IJKL-MNOP', "Serial key bulunamadı")):
+        response = client.get(path)
+        assert response.mimetype == 'application/json'
+        payload = response.get_json()
+        assert (payload['success'], payload['message']) == (False, message)
@@ -0,0 +1,77 @@
+"""İmzalı lisans token'larının sunucuda sorgulanması"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as serial_app
+from conftest import ADMIN_PASSWORD
+from license_token import LicenseSigner, generate_signing_key, load_key
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def signing_key(request, make_app):
+    signing_key, _ = generate_signing_key('hs256')
+    make_app(SERIAL_STORE_BACKEND=request.param, LICENSE_SIGNING_KEY=signing_key)
+    return signing_key
+
+
+@pytest.fixture
+def client(signing_key):
+    return serial_app.app.test_client()
+
+
+def issue(add_key, **fields):
+    """Key ekler; (serial key, lisans token'ı) döndürür"""
+    serial_key = add_key(**fields)
+    record = serial_app.key_store.get(serial_key)
+    return serial_key, serial_app.license_signer.issue(serial_key, record.expires_at, record.max_uses)
+
+
+def bulk_update(client, **body):
+    response = client.post('/api/serials/bulk-update', json=dict(body, password=ADMIN_PASSWORD))
+    assert response.status_code == 200, response.get_json()
+
+
+def test_token_redeems_against_store(client, add_key):
+    _, token = issue(add_key, max_uses=1)
+
+    assert client.get(f'/api/check-license/{token}?consume=false').status_code == 200
+    assert client.get(f'/api/check-license/{token}').status_code == 200
+    response = client.get(f'/api/check-license/{token}')
+    assert response.get_json()['message'] == "Serial key kullanım limiti dolmuş"
+
+
+def test_forged_token_is_rejected(client, add_key):
+    _, token = issue(add_key)
+    prefix, payload, _ = token.split('.')
+    forged = LicenseSigner('hs256', load_key(generate_signing_key('hs256')[0])).issue('AAAA-BBBB-CCCC-DDDD', None, 9)
+
+    for bad in (f'{prefix}.{payload}.AAAA', forged, 'not-a-token'):
+        response = client.get(f'/api/check-license/{bad}')
+        assert response.status_code == 400
+        assert response.get_json()['message'] == "Geçersiz lisans token'ı"
+
+
+def test_extended_expiry_overrides_token(client, add_key, signing_key):
+    serial_key, _ = issue(add_key)
+    # Token üretildiğinden beri süresi dolmuş; key'in süresi toplu güncellemeyle uzatıldı
+    token = LicenseSigner('hs256', load_key(signing_key)).issue(serial_key, int(time.time()) - 60, 1)
+    bulk_update(client, action='set-expiry', value=(datetime.now() + timedelta(days=30)).isoformat(),
+                serial_keys=[serial_key])
+
+    assert client.get(f'/api/check-license/{token}').status_code == 200
+
+
+def test_shortened_limits_override_token(client, add_key):
+    serial_key, token = issue(add_key, max_uses=5, expiry_date=(datetime.now() + timedelta(days=30)).isoformat())
+    assert client.get(f'/api/check-license/{token}').status_code == 200
+
+    bulk_update(client, action='set-max-uses', value=1, serial_keys=[serial_key])
+    assert client.get(f'/api/check-license/{token}?consume=false').status_code == 400
+
+    bulk_update(client, action='set-max-uses', value=5, serial_keys=[serial_key])
+    bulk_update(client, action='deactivate', serial_keys=[serial_key])
+    response = client.get(f'/api/check-license/{token}?consume=false')
+    assert response.get_json()['message'] == "Serial key deaktif"
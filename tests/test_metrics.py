@@ -0,0 +1,44 @@
+"""İstek metrikleri"""
+
+import time
+
+import app as serial_app
+from conftest import ADMIN_PASSWORD
+
+
+def latency(route, method='POST'):
+    histogram = serial_app.metrics.request_latency.get((route, method))
+    return (histogram.count, histogram.sum) if histogram is not None else (0, 0.0)
+
+
+def test_request_latency_is_recorded(client, add_key):
+    # Metrikler süreç boyunca birikir: önceki testlerin değerleri fark alınarak ayıklanır
+    added, health = latency('/api/add-serial')[0], latency('/health', 'GET')[0]
+    add_key()
+    client.get('/health')
+    assert latency('/api/add-serial')[0] == added + 1
+    assert latency('/health', 'GET')[0] == health + 1
+    assert b'serial_api_request_duration_seconds_bucket' in client.get('/metrics').data
+
+
+def test_streamed_latency_includes_body(client, add_key, monkeypatch):
+    add_key()
+    export_rows = serial_app._export_rows
+
+    def slow_rows(keys, output_format):
+        for chunk in export_rows(keys, output_format):
+            time.sleep(0.05)
+            yield chunk
+
+    monkeypatch.setattr(serial_app, '_export_rows', slow_rows)
+    before = latency('/api/list-serials')
+
+    response = client.post('/api/list-serials', json={"password": ADMIN_PASSWORD, "format": 'ndjson'})
+    # Gövde üretilmeden ölçülmez
+    assert latency('/api/list-serials') == before
+    response.get_data()
+    response.close()
+
+    count, seconds = latency('/api/list-serials')
+    assert count == before[0] + 1
+    assert seconds - before[1] >= 0.05
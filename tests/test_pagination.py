@@ -0,0 +1,102 @@
+"""Admin listesinin cursor ile sayfalanması ve dışa aktarma"""
+
+import csv
+import io
+import json
+
+import pytest
+
+from conftest import ADMIN_PASSWORD
+
+
+@pytest.fixture
+def keys(add_key):
+    """Farklı açıklamalarla 23 key ekler"""
+    return [add_key(description='even' if number % 2 == 0 else 'odd') for number in range(23)]
+
+
+def list_page(client, **body):
+    response = client.post('/api/list-serials', json=dict(body, password=ADMIN_PASSWORD))
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def walk(client, **body):
+    """next_cursor bitene kadar tüm sayfaları okur; (key'ler, sayfa sayısı) döndürür"""
+    serial_keys, pages, cursor = [], 0, None
+    while True:
+        page = list_page(client, cursor=cursor, **body)
+        serial_keys += [key['serial_key'] for key in page['data']]
+        pages += 1
+        cursor = page['next_cursor']
+        if cursor is None:
+            return serial_keys, pages
+
+
+def test_pages_cover_every_key_once(client, keys):
+    everything = list_page(client, limit=1000)['data']
+    expected = [key['serial_key'] for key in sorted(everything, key=lambda key: (key['created_at'], key['serial_key']))]
+
+    serial_keys, pages = walk(client, limit=5)
+
+    assert serial_keys == expected
+    assert sorted(serial_keys) == sorted(keys)
+    assert pages == 5
+
+
+def test_descending_order(client, keys):
+    ascending, _ = walk(client, limit=4)
+    descending, _ = walk(client, limit=4, order='desc')
+    assert descending == ascending[::-1]
+
+
+def test_cursor_survives_inserts(client, keys, add_key):
+    page = list_page(client, limit=10)
+    # Sonradan eklenen key'ler sıralamada sona düşer: okunan sayfa kaymaz
+    added = add_key()
+
+    rest, _ = walk(client, limit=10)
+
+    assert rest[:10] == [key['serial_key'] for key in page['data']]
+    following = list_page(client, limit=1000, cursor=page['next_cursor'])['data']
+    assert [key['serial_key'] for key in following][-1] == added
+    assert len(following) == 14
+
+
+def test_filters_apply_across_pages(client, keys):
+    serial_keys, _ = walk(client, limit=3, description_contains='even')
+    assert len(serial_keys) == 12
+    assert set(serial_keys) == set(keys[::2])
+
+
+def test_last_full_page_has_cursor_to_empty_page(client, keys):
+    page = list_page(client, limit=23)
+    assert page['count'] == 23 and page['total'] == 23
+    last = list_page(client, limit=23, cursor=page['next_cursor'])
+    assert last['data'] == [] and last['next_cursor'] is None
+
+
+@pytest.mark.parametrize('body', [
+    {"cursor": 'bm90LWpzb24'},
+    {"limit": 0},
+    {"limit": 1001},
+    {"order": 'sideways'},
+    {"active": 'yes'}
+])
+def test_invalid_requests(client, body):
+    response = client.post('/api/list-serials', json=dict(body, password=ADMIN_PASSWORD))
+    assert response.status_code == 400
+
+
+def test_export_streams_every_key(client, keys):
+    response = client.post('/api/list-serials', json={"password": ADMIN_PASSWORD, "format": 'ndjson'})
+    assert response.mimetype == 'application/x-ndjson'
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert sorted(row['serial_key'] for row in rows) == sorted(keys)
+
+    response = client.post('/api/list-serials', json={
+        "password": ADMIN_PASSWORD, "format": 'csv', "description_contains": 'odd'
+    })
+    assert response.mimetype == 'text/csv'
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert sorted(row['serial_key'] for row in rows) == sorted(keys[1::2])
@@ -0,0 +1,27 @@
+"""İstemci başına token bucket sınırlaması"""
+
+import pytest
+
+
+@pytest.fixture
+def client(make_app):
+    # Saniyede bir token, kapasite 3: dördüncü ardışık istek reddedilir
+    return make_app(RATE_LIMIT_ENABLED='1', RATE_LIMIT_CHECK='1/3').test_client()
+
+
+def test_burst_then_429(client):
+    statuses = [client.get('/api/check-serial/ABCD-EFGH-IJKL-MNOP').status_code for _ in range(4)]
+
+    assert statuses == [404, 404, 404, 429]
+    response = client.get('/api/check-serial/ABCD-EFGH-IJKL-MNOP')
+    assert int(response.headers['Retry-After']) >= 1
+
+
+def test_clients_have_separate_buckets(client):
+    for _ in range(3):
+        client.get('/api/check-serial/ABCD-EFGH-IJKL-MNOP')
+
+    other = client.get('/api/check-serial/ABCD-EFGH-IJKL-MNOP', environ_base={"REMOTE_ADDR": '10.0.0.2'})
+    assert other.status_code == 404
+    # Sınırlanmayan rotalar etkilenmez
+    assert client.get('/health').status_code == 200
@@ -0,0 +1,92 @@
+"""Serial key sorgulama ve kullanım hakkı düşme"""
+
+from datetime import datetime, timedelta
+
+import app as serial_app
+from conftest import ADMIN_PASSWORD, hammer
+
+
+def test_redeem_counts_uses(client, add_key):
+    serial_key = add_key(max_uses=2)
+
+    first = client.get(f'/api/check-serial/{serial_key}')
+    assert first.status_code == 200
+    assert first.get_json()['data']['remaining_uses'] == 1
+    assert client.get(f'/api/check-serial/{serial_key}').status_code == 200
+
+    exhausted = client.get(f'/api/check-serial/{serial_key}')
+    assert exhausted.status_code == 400
+    assert exhausted.get_json()['message'] == "Serial key kullanım limiti dolmuş"
+
+
+def test_verify_does_not_consume(client, add_key):
+    serial_key = add_key(max_uses=1)
+
+    for _ in range(3):
+        response = client.get(f'/api/check-serial/{serial_key}?consume=false')
+        assert response.status_code == 200
+        assert response.get_json()['data']['current_uses'] == 0
+    assert client.get(f'/api/check-serial/{serial_key}').status_code == 200
+    # Önbellekteki doğrulama sonucu kullanım sonrası geçersizleşir
+    assert client.get(f'/api/check-serial/{serial_key}?consume=false').status_code == 400
+
+
+def test_deactivate_invalidates_cached_verdict(client, add_key):
+    serial_key = add_key()
+    assert client.get(f'/api/check-serial/{serial_key}?consume=false').status_code == 200
+
+    client.post(f'/api/deactivate-serial/{serial_key}', json={"password": ADMIN_PASSWORD})
+
+    response = client.get(f'/api/check-serial/{serial_key}?consume=false')
+    assert response.get_json()['message'] == "Serial key deaktif"
+
+
+def test_rejections(client, add_key):
+    assert client.get('/api/check-serial/ABCD').status_code == 400
+    assert client.get('/api/check-serial/ABCD-EFGH-IJKL-MNOP').status_code == 404
+    assert client.get('/api/check-serial/ABCD-EFGH-IJKL-MNOP?consume=maybe').status_code == 400
+    for body in ('{"serial_keys": [', '["ABCD-EFGH-IJKL-MNOP"]'):
+        response = client.post('/api/check-serials', data=body, content_type='application/json')
+        assert response.status_code == 400
+        assert response.get_json()['message'] == "JSON verisi gerekli"
+
+    serial_key = add_key()
+    client.post(f'/api/deactivate-serial/{serial_key}', json={"password": ADMIN_PASSWORD})
+    response = client.get(f'/api/check-serial/{serial_key}')
+    assert response.status_code == 400
+    assert response.get_json()['message'] == "Serial key deaktif"
+
+
+def test_expired_key_is_rejected(client, add_key):
+    serial_key = add_key(expiry_date=(datetime.now() + timedelta(days=1)).isoformat())
+    # Son kullanma tarihi geçmiş kayıt doğrudan depoya yazılır (API geçmiş tarihi kabul etmez)
+    serial_app.key_store.update_many({"expiry_date": (datetime.now() - timedelta(days=1)).isoformat()},
+                                     [serial_key])
+    serial_app.forget_verdicts((serial_key,))
+
+    response = client.get(f'/api/check-serial/{serial_key}')
+    assert response.status_code == 400
+    assert response.get_json()['message'] == "Serial key süresi dolmuş"
+
+
+def test_concurrent_redeem_never_exceeds_max_uses(client, add_key):
+    serial_key = add_key(max_uses=25)
+
+    statuses = hammer(lambda: client.get(f'/api/check-serial/{serial_key}').status_code, 200)
+
+    assert statuses.count(200) == 25
+    assert statuses.count(400) == 175
+    assert serial_app.key_store.get(serial_key).current_uses == 25
+
+
+def test_concurrent_batch_redeem_never_exceeds_max_uses(client, add_key):
+    serial_keys = [add_key(max_uses=10) for _ in range(3)]
+
+    def check():
+        response = client.post('/api/check-serials', json={"serial_keys": serial_keys})
+        assert response.status_code == 200
+        return response.get_json()['valid_count']
+
+    assert sum(hammer(check, 40)) == 30
+    for serial_key in serial_keys:
+        assert serial_app.key_store.get(serial_key).current_uses == 10
@@ -0,0 +1,173 @@
+"""Primary değişiklik akışı ve replika eşitlemesi
+
+Primary bu süreçteki uygulamadır ve gerçek bir HTTP sunucusunda çalışır;
+replika kendi bellek deposuyla replication.Replica üzerinden bağlanır.
+"""
+
+import threading
+import time
+
+import pytest
+from werkzeug.serving import make_server
+
+import app as serial_app
+from conftest import ADMIN_PASSWORD
+from replication import Replica, ReplicationError
+from store import create_store
+
+TOKEN = 'replication-token'
+FEED_SIZE = 20
+
+
+def eventually(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "zaman aşımı"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def start_primary(make_app, tmp_path):
+    """Primary'yi kurar (yeniden çağrılınca günlükten yeniden başlatır); test istemcisini döndürür"""
+    def start():
+        return make_app(REPLICATION_TOKEN=TOKEN, REPLICATION_FEED_SIZE=str(FEED_SIZE), REPLICATION_HEARTBEAT='0.05',
+                        SERIAL_JOURNAL_DIR=str(tmp_path / 'journal')).test_client()
+
+    return start
+
+
+@pytest.fixture
+def primary(start_primary):
+    client = start_primary()
+    server = make_server('127.0.0.1', 0, serial_app.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client.url = f'http://127.0.0.1:{server.server_port}'
+    yield client
+    server.shutdown()
+    thread.join()
+
+
+@pytest.fixture
+def replica(primary):
+    replica = Replica(create_store('memory'), primary.url, TOKEN, timeout=5, retry_interval=0.05)
+    yield replica
+    replica.stop()
+
+
+def add(client, **fields):
+    response = client.post('/api/add-serial', json=dict(fields, password=ADMIN_PASSWORD))
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['data']['serial_key']
+
+
+def replicated(replica, serial_key, **fields):
+    """Replikadaki kayıt verilen alan değerlerine ulaştı mı"""
+    record = replica.get(serial_key)
+    return record is not None and all(getattr(record, field) == value for field, value in fields.items())
+
+
+def test_bootstrap_then_follow_feed(primary, replica):
+    existing = add(primary, max_uses=3)
+    replica.start()
+    assert replica.wait_ready(5)
+    assert replica.get(existing) is not None
+
+    added = add(primary, description='after bootstrap')
+    primary.get(f'/api/check-serial/{existing}')
+    primary.post(f'/api/deactivate-serial/{added}', json={"password": ADMIN_PASSWORD})
+    primary.post('/api/serials/bulk-update', json={
+        "password": ADMIN_PASSWORD, "action": 'set-max-uses', "value": 8, "serial_keys": [existing]
+    })
+
+    eventually(lambda: replicated(replica, existing, current_uses=1, max_uses=8))
+    eventually(lambda: replicated(replica, added, is_active=False, description='after bootstrap'))
+    assert replica.stats()['resyncs'] == 1
+    eventually(lambda: replica.stats()['lag_events'] == 0)
+
+
+def test_redeem_is_forwarded_to_primary(primary, replica):
+    serial_key = add(primary, max_uses=2)
+    replica.start()
+    assert replica.wait_ready(5)
+
+    assert replica.redeem(serial_key).current_uses == 1
+    # Limit primary'nin güncel kaydıyla denetlenir
+    second, third = replica.redeem_many([serial_key, serial_key])
+    assert second.current_uses == 2 and third is None
+
+    assert serial_app.key_store.get(serial_key).current_uses == 2
+    eventually(lambda: replicated(replica, serial_key, current_uses=2))
+
+
+def test_resync_after_falling_behind_the_feed(primary, replica):
+    serial_key = add(primary, max_uses=1000)
+    replica.start()
+    assert replica.wait_ready(5)
+    replica.stop()
+
+    # Akış yalnızca son FEED_SIZE olayı tutar: replika kaçırdığı olayları anlık görüntüden alır
+    for _ in range(FEED_SIZE * 2):
+        assert primary.get(f'/api/check-serial/{serial_key}').status_code == 200
+    replica.start()
+
+    eventually(lambda: replica.stats()['resyncs'] == 2)
+    eventually(lambda: replicated(replica, serial_key, current_uses=FEED_SIZE * 2))
+
+
+def test_resync_after_primary_restart(start_primary, primary, replica):
+    serial_key = add(primary, max_uses=5)
+    replica.start()
+    assert replica.wait_ready(5)
+    feed_id = replica.feed_id
+
+    # Yeniden başlayan primary günlükten yüklenir ama yeni bir feed_id ile yayın yapar
+    client = start_primary()
+    client.get(f'/api/check-serial/{serial_key}')
+
+    eventually(lambda: replica.stats()['resyncs'] == 2)
+    assert replica.feed_id != feed_id
+    eventually(lambda: replicated(replica, serial_key, current_uses=1))
+
+
+def test_feed_requires_token_and_known_feed(primary):
+    assert primary.get('/api/replication/feed?after=0&feed_id=x').status_code == 401
+    headers = {"Authorization": f'Bearer {TOKEN}'}
+    assert primary.get('/api/replication/feed?after=0&feed_id=x', headers=headers).status_code == 410
+
+
+def test_unreachable_primary_raises():
+    replica = Replica(create_store('memory'), 'http://127.0.0.1:9', TOKEN, timeout=1)
+    with pytest.raises(ReplicationError):
+        replica.redeem('AAAA-BBBB-CCCC-DDDD')
+
+
+def test_replica_app_returns_503_without_primary(make_app):
+    client = make_app(REPLICA_OF='http://127.0.0.1:9', REPLICATION_TOKEN=TOKEN,
+                      REPLICA_STARTUP_TIMEOUT='0.1').test_client()
+    serial_key = 'AAAA-BBBB-CCCC-DDDD'
+    serial_app.key_store.add_many([{
+        "serial_key": serial_key, "created_at": '2024-01-01T00:00:00', "is_active": True,
+        "description": '', "expiry_date": None, "max_uses": 1, "current_uses": 0
+    }])
+    serial_app.remember_serial_keys([serial_key])
+
+    # Okumalar replikadan yanıtlanır, kullanım primary'ye ulaşamadığı için 503 döner
+    assert client.get(f'/api/check-serial/{serial_key}?consume=false').status_code == 200
+    assert client.get(f'/api/check-serial/{serial_key}').status_code == 503
+    response = client.post('/api/check-serials', json={"serial_keys": [serial_key]})
+    assert response.status_code == 503
+
+
+def test_replica_rejects_writes(make_app):
+    client = make_app(REPLICA_OF='http://127.0.0.1:9', REPLICATION_TOKEN=TOKEN,
+                      REPLICA_STARTUP_TIMEOUT='0.1').test_client()
+    body = {"password": ADMIN_PASSWORD, "count": 1, "action": 'deactivate', "serial_keys": ['AAAA-BBBB-CCCC-DDDD']}
+
+    for path in ('/api/add-serial', '/api/add-serials/bulk', '/api/deactivate-serial/AAAA-BBBB-CCCC-DDDD',
+                 '/api/serials/bulk-update'):
+        assert client.post(path, json=body).status_code == 403, path
+    response = client.post('/api/import-serials?format=ndjson', data='{"serial_key": "AAAA-BBBB-CCCC-DDDD"}',
+                           headers={"Authorization": 'Bearer x'})
+    assert response.status_code == 403
+    assert len(serial_app.key_store) == 0
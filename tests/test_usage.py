@@ -0,0 +1,104 @@
+"""Gecikmeli kullanım sayacı (USAGE_ACCOUNTING=async, SQLite)"""
+
+import time
+
+import pytest
+
+import app as serial_app
+from conftest import ADMIN_PASSWORD, hammer
+
+
+@pytest.fixture
+def client(make_app):
+    # Uzun aralık: testler yazmayı flush ile kendileri tetikler
+    return make_app(SERIAL_STORE_BACKEND='sqlite', USAGE_ACCOUNTING='async', USAGE_FLUSH_INTERVAL='60',
+                    USAGE_FLUSH_SIZE='1000').test_client()
+
+
+def stored_uses(serial_key):
+    """Depoya yazılmış (bellekte bekleyenler hariç) kullanım sayısı"""
+    return serial_app.key_store.get(serial_key).current_uses
+
+
+def eventually(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "zaman aşımı"
+        time.sleep(0.01)
+
+
+def test_uses_are_written_on_flush(client, add_key):
+    serial_key = add_key(max_uses=5)
+    accountant = serial_app.usage_accountant
+
+    for remaining in (4, 3, 2):
+        response = client.get(f'/api/check-serial/{serial_key}')
+        assert response.get_json()['data']['remaining_uses'] == remaining
+    assert stored_uses(serial_key) == 0
+    assert accountant.pending() == 3
+    # Doğrulama bekleyen kullanımları görür
+    assert client.get(f'/api/check-serial/{serial_key}?consume=false').get_json()['data']['current_uses'] == 3
+
+    accountant.flush()
+
+    assert accountant.pending() == 0
+    assert stored_uses(serial_key) == 3
+
+
+def test_flush_size_triggers_write(make_app):
+    client = make_app(SERIAL_STORE_BACKEND='sqlite', USAGE_ACCOUNTING='async', USAGE_FLUSH_INTERVAL='60',
+                      USAGE_FLUSH_SIZE='4').test_client()
+    response = client.post('/api/add-serial', json={"password": ADMIN_PASSWORD, "max_uses": 10})
+    serial_key = response.get_json()['data']['serial_key']
+
+    for _ in range(4):
+        client.get(f'/api/check-serial/{serial_key}')
+
+    # Yazıcı thread USAGE_FLUSH_SIZE kullanımda aralığı beklemeden yazar
+    eventually(lambda: stored_uses(serial_key) == 4)
+    assert serial_app.usage_accountant.flushes == 1
+
+
+def test_concurrent_redeem_never_exceeds_max_uses(client, add_key):
+    serial_key = add_key(max_uses=30)
+
+    statuses = hammer(lambda: client.get(f'/api/check-serial/{serial_key}').status_code, 160)
+
+    assert statuses.count(200) == 30
+    serial_app.usage_accountant.flush()
+    assert stored_uses(serial_key) == 30
+
+
+def test_reset_uses_flushes_pending_first(client, add_key):
+    serial_key = add_key(max_uses=2)
+    client.get(f'/api/check-serial/{serial_key}')
+    client.get(f'/api/check-serial/{serial_key}')
+
+    client.post('/api/serials/bulk-update', json={
+        "password": ADMIN_PASSWORD, "action": 'reset-uses', "serial_keys": [serial_key]
+    })
+    serial_app.usage_accountant.flush()
+
+    # Bekleyen iki kullanım sıfırın üstüne eklenmez
+    assert stored_uses(serial_key) == 0
+    assert client.get(f'/api/check-serial/{serial_key}').status_code == 200
+
+
+def test_deactivate_stops_pending_key(client, add_key):
+    serial_key = add_key(max_uses=5)
+    assert client.get(f'/api/check-serial/{serial_key}').status_code == 200
+
+    client.post(f'/api/deactivate-serial/{serial_key}', json={"password": ADMIN_PASSWORD})
+
+    assert client.get(f'/api/check-serial/{serial_key}').status_code == 400
+    serial_app.usage_accountant.flush()
+    assert stored_uses(serial_key) == 1
+
+
+def test_shutdown_writes_pending_uses(client, add_key):
+    serial_key = add_key(max_uses=3)
+    client.get(f'/api/check-serial/{serial_key}')
+
+    serial_app.usage_accountant.close()
+
+    assert stored_uses(serial_key) == 1
@@ -0,0 +1,201 @@
+"""
+Gecikmeli (write-behind) kullanım sayacı.
+
+Senkron modda her başarılı sorgulama depoda bir UPDATE yapar. Bu modülde
+sorgulamalar bellekteki sayaçtan hak ayırır; artışlar key başına birleştirilip
+bir arka plan thread'i tarafından boyut (USAGE_FLUSH_SIZE) veya süre
+(USAGE_FLUSH_INTERVAL) dolunca tek transaction ile depoya yazılır. Aynı key'in
+bir aralıktaki N kullanımı tek satır güncellemesine iner.
+
+Limit denetimi kesindir: key'in sayacı bellekte "depodaki değer + yazılmamış
+artışlar" olarak tutulur ve her ayırma şerit kilidi altında bu değere göre
+yapılır. Bu yalnızca sayaç tek süreçteyse geçerlidir; aynı depoyu kullanan
+ikinci bir süreç yazılmamış artışları göremez (server.py bu yüzden tek worker
+ister).
+
+Çökme güvenliği: düzgün kapanışta (SIGTERM, atexit, close) bekleyen artışlar
+yazılır. Süreç aniden ölürse en fazla son aralıktaki artışlar kaybolur; bu
+key'lerin kullanım sayısı eksik kalır, yani o kadar kullanım yeniden
+verilebilir. Sayaç hiçbir zaman limitin üstüne yazılmaz.
+"""
+
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Kullanım sayacı güncellemelerinde kullanılan kilit şeridi sayısı
+LOCK_STRIPES = 64
+
+
+class UsageAccountant:
+    """Kullanım artışlarını bellekte ayırıp toplu olarak depoya yazar"""
+
+    def __init__(self, store, flush_interval=1.0, flush_size=10_000):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        # Sayacı bellekte olan key'ler: current_uses depodaki değer + yazılmamış artışlardır
+        self._entries = {}
+        self._stripes = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        # Yazılmayı bekleyen artışlar {serial_key: adet}
+        self._dirty = {}
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._closing = False
+        self.redemptions = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.failed_flushes = 0
+
+    def _stripe(self, serial_key):
+        """Anahtara düşen şerit kilidini döndürür"""
+        return self._stripes[hash(serial_key) % LOCK_STRIPES]
+
+    def _ensure_started(self):
+        # Fork sonrası thread'ler kopyalanmaz: yazıcı thread ilk kullanımda bu süreçte başlatılır
+        with self._cond:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+            self._closing = False
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='usage-flusher', daemon=True)
+            self._thread.start()
+
+    def get(self, serial_key):
+        """Kaydı yazılmamış artışlar dahil döndürür, yoksa None"""
+        record = self._entries.get(serial_key)
+        if record is not None:
+            return record.copy()
+        return self.store.get(serial_key)
+
+    def get_many(self, serial_keys):
+        """get_many'nin yazılmamış artışları da gösteren sürümü"""
+        entries = self._entries
+        found = {}
+        missing = []
+        for serial_key in serial_keys:
+            record = entries.get(serial_key)
+            if record is not None:
+                found[serial_key] = record.copy()
+            else:
+                missing.append(serial_key)
+        if missing:
+            found.update(self.store.get_many(missing))
+        return found
+
+    def redeem(self, serial_key):
+        """Kullanım hakkını bellekte ayırır; limit doluysa veya key yoksa None döner"""
+        if self._pid != os.getpid():
+            self._ensure_started()
+        with self._stripe(serial_key):
+            record = self._entries.get(serial_key)
+            if record is None:
+                record = self.store.get(serial_key)
+                if record is None:
+                    return None
+                self._entries[serial_key] = record
+            if not record.is_active or record.current_uses >= record.max_uses:
+                return None
+            record.current_uses += 1
+            # Artış şerit kilidi altında kuyruğa girer: yazıcı key'i bellekten çıkarırken bunu görür
+            with self._cond:
+                self._dirty[serial_key] = self._dirty.get(serial_key, 0) + 1
+                self._pending += 1
+                self.redemptions += 1
+                if self._pending >= self.flush_size:
+                    self._cond.notify()
+            return record.copy()
+
+    def redeem_many(self, serial_keys):
+        """Anahtarları sırayla redeem eder; sonuçları girdiyle aynı sırada döndürür"""
+        return [self.redeem(serial_key) for serial_key in serial_keys]
+
+    def refresh(self, serial_key):
+        """Depoda değişen key'in (deaktif etme, limit güncelleme) bellekteki kopyasını yeniler"""
+        # Yazılmakta olan artışlar depoya ya tamamen girmiş ya da hiç girmemiş olmalı
+        with self._flush_lock, self._stripe(serial_key):
+            record = self._entries.get(serial_key)
+            if record is None:
+                return
+            stored = self.store.get(serial_key)
+            if stored is None:
+                del self._entries[serial_key]
+                return
+            # Depodaki değer henüz yazılmamış artışları içermez
+            stored.current_uses += self._dirty.get(serial_key, 0)
+            self._entries[serial_key] = stored
+
+    def flush(self):
+        """Bekleyen artışları tek transaction ile yazar; yazılan key sayısını döndürür"""
+        with self._flush_lock:
+            with self._cond:
+                batch, self._dirty = self._dirty, {}
+                self._pending = 0
+            if not batch:
+                return 0
+            try:
+                self.store.add_uses_many(batch)
+            except Exception:
+                # Artışlar kaybolmasın diye kuyruğa geri eklenir; sonraki turda yeniden denenir
+                with self._cond:
+                    for serial_key, count in batch.items():
+                        self._dirty[serial_key] = self._dirty.get(serial_key, 0) + count
+                        self._pending += count
+                    self.failed_flushes += 1
+                raise
+            self.flushes += 1
+            self.rows_written += len(batch)
+            # Yazılan ve bu arada yeniden kullanılmayan key'ler bellekten çıkarılır; sonraki
+            # sorgulama güncel değeri depodan okur. Böylece bellek yalnızca sıcak key'leri tutar.
+            for serial_key in batch:
+                with self._stripe(serial_key):
+                    if serial_key not in self._dirty:
+                        self._entries.pop(serial_key, None)
+            return len(batch)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._closing and self._pending < self.flush_size:
+                    self._cond.wait(self.flush_interval)
+                closing = self._closing
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Kullanım sayaçları depoya yazılamadı")
+            if closing:
+                return
+
+    def close(self):
+        """Bekleyen artışları yazar ve yazıcı thread'i durdurur"""
+        with self._cond:
+            thread = self._thread if self._pid == os.getpid() else None
+            self._closing = True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join()
+        else:
+            self.flush()
+        with self._cond:
+            self._thread = None
+            self._pid = None
+
+    def pending(self):
+        """Depoya yazılmayı bekleyen kullanım sayısı"""
+        return self._pending
+
+    def stats(self):
+        return {
+            "redemptions": self.redemptions,
+            "pending": self._pending,
+            "cached_keys": len(self._entries),
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "writes_saved": self.redemptions - self._pending - self.rows_written,
+            "failed_flushes": self.failed_flushes
+        }